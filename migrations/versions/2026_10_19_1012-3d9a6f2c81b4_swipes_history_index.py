@@ -0,0 +1,27 @@
+"""swipes history index
+
+Revision ID: 3d9a6f2c81b4
+Revises: 7fb9b06446ef
+Create Date: 2026-10-19 10:12:41.215307
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3d9a6f2c81b4"
+down_revision: str | None = "7fb9b06446ef"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_swipes_user_id_created_at_id", "swipes", ["user_id", "created_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_swipes_user_id_created_at_id", table_name="swipes")
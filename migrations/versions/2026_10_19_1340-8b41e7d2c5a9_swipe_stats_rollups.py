@@ -0,0 +1,80 @@
+"""swipe stats rollups
+
+Revision ID: 8b41e7d2c5a9
+Revises: 3d9a6f2c81b4
+Create Date: 2026-10-19 13:40:12.904518
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8b41e7d2c5a9"
+down_revision: str | None = "3d9a6f2c81b4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def _counter_columns() -> list[sa.Column]:
+    return [
+        sa.Column("likes", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("dislikes", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("hides", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("unique_users", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "location_swipe_stats",
+        sa.Column("location_id", sa.UUID(), nullable=False),
+        *_counter_columns(),
+        sa.ForeignKeyConstraint(["location_id"], ["locations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("location_id"),
+    )
+    op.create_table(
+        "daily_swipe_stats",
+        sa.Column("day", sa.Date(), nullable=False),
+        *_counter_columns(),
+        sa.PrimaryKeyConstraint("day"),
+    )
+
+    # Заполняем счётчики по уже накопленным свайпам
+    op.execute(
+        """
+        INSERT INTO location_swipe_stats (location_id, likes, dislikes, hides, unique_users, updated_at)
+        SELECT location_id,
+               SUM(CASE WHEN action = 'LIKE' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN action = 'DISLIKE' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN action = 'HIDE' THEN 1 ELSE 0 END),
+               COUNT(DISTINCT user_id),
+               now()
+        FROM swipes
+        GROUP BY location_id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO daily_swipe_stats (day, likes, dislikes, hides, unique_users, updated_at)
+        SELECT CAST(created_at AS DATE),
+               SUM(CASE WHEN action = 'LIKE' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN action = 'DISLIKE' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN action = 'HIDE' THEN 1 ELSE 0 END),
+               COUNT(DISTINCT user_id),
+               now()
+        FROM swipes
+        WHERE created_at IS NOT NULL
+        GROUP BY CAST(created_at AS DATE)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_swipe_stats")
+    op.drop_table("location_swipe_stats")
@@ -0,0 +1,109 @@
+"""swipes partitioning
+
+Revision ID: c72e0a9d4f13
+Revises: 8b41e7d2c5a9
+Create Date: 2026-10-19 16:15:03.118842
+
+"""
+
+from collections.abc import Sequence
+from datetime import date
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c72e0a9d4f13"
+down_revision: str | None = "8b41e7d2c5a9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Сколько будущих месяцев создаём сразу; дальше партиции досоздаёт SwipePartitionService
+MONTHS_AHEAD = 3
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE swipes RENAME TO swipes_legacy")
+    op.execute("ALTER TABLE swipes_legacy RENAME CONSTRAINT swipes_pkey TO swipes_legacy_pkey")
+    op.execute("ALTER INDEX ix_swipes_user_id_created_at_id RENAME TO ix_swipes_legacy_user_id_created_at_id")
+
+    # Ключ партиционирования должен входить в первичный ключ и быть NOT NULL
+    op.execute(
+        """
+        CREATE TABLE swipes (
+            user_id UUID NOT NULL REFERENCES users (id),
+            location_id UUID NOT NULL REFERENCES locations (id),
+            action swipeaction NOT NULL,
+            id UUID NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT swipes_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE INDEX ix_swipes_user_id_created_at_id ON swipes (user_id, created_at, id)")
+
+    first_swipe = bind.exec_driver_sql("SELECT min(created_at) FROM swipes_legacy").scalar()
+    current_month = date.today().replace(day=1)
+    month = first_swipe.date().replace(day=1) if first_swipe else current_month
+    last_month = _add_months(current_month, MONTHS_AHEAD)
+    while month <= last_month:
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE swipes_p{month.year:04d}_{month.month:02d} PARTITION OF swipes "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+    # Страховка на случай, если партиции не успели досоздать заранее
+    op.execute("CREATE TABLE swipes_default PARTITION OF swipes DEFAULT")
+
+    op.execute(
+        """
+        INSERT INTO swipes (user_id, location_id, action, id, created_at, updated_at)
+        SELECT user_id, location_id, action, id, COALESCE(created_at, updated_at, now()), updated_at
+        FROM swipes_legacy
+        """
+    )
+    op.execute("DROP TABLE swipes_legacy")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+
+    op.execute("ALTER TABLE swipes RENAME TO swipes_partitioned")
+    op.execute("ALTER TABLE swipes_partitioned RENAME CONSTRAINT swipes_pkey TO swipes_partitioned_pkey")
+    op.execute("ALTER INDEX ix_swipes_user_id_created_at_id RENAME TO ix_swipes_partitioned_user_id_created_at_id")
+    op.execute(
+        """
+        CREATE TABLE swipes (
+            user_id UUID NOT NULL REFERENCES users (id),
+            location_id UUID NOT NULL REFERENCES locations (id),
+            action swipeaction NOT NULL,
+            id UUID NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            CONSTRAINT swipes_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute("CREATE INDEX ix_swipes_user_id_created_at_id ON swipes (user_id, created_at, id)")
+    op.execute(
+        """
+        INSERT INTO swipes (user_id, location_id, action, id, created_at, updated_at)
+        SELECT user_id, location_id, action, id, created_at, updated_at FROM swipes_partitioned
+        """
+    )
+    # Партиции удаляются вместе с родительской таблицей
+    op.execute("DROP TABLE swipes_partitioned")
@@ -0,0 +1,27 @@
+"""phone verifications expires_at index
+
+Revision ID: 5e2b9c4d7a16
+Revises: c72e0a9d4f13
+Create Date: 2026-10-19 17:30:12.448021
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e2b9c4d7a16"
+down_revision: str | None = "c72e0a9d4f13"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f("ix_phone_verifications_expires_at"), "phone_verifications", ["expires_at"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_phone_verifications_expires_at"), table_name="phone_verifications")
@@ -0,0 +1,39 @@
+"""secondary indexes
+
+Revision ID: a4f18c6e2d37
+Revises: 5e2b9c4d7a16
+Create Date: 2026-10-19 19:05:33.904117
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a4f18c6e2d37"
+down_revision: str | None = "5e2b9c4d7a16"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# swipes.user_id покрыт составным ix_swipes_user_id_created_at_id (левый префикс)
+INDEXES = [
+    ("ix_photos_location_id", "photos", "location_id"),
+    ("ix_route_locations_route_id", "route_locations", "route_id"),
+    ("ix_phone_verifications_phone_number", "phone_verifications", "phone_number"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в таблицы, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(name, table, [column], unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
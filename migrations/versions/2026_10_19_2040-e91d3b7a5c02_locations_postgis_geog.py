@@ -0,0 +1,48 @@
+"""locations postgis geog
+
+Revision ID: e91d3b7a5c02
+Revises: a4f18c6e2d37
+Create Date: 2026-10-19 20:40:17.512360
+
+"""
+
+import logging
+from collections.abc import Sequence
+
+from alembic import op
+from sqlalchemy import text
+
+# revision identifiers, used by Alembic.
+revision: str = "e91d3b7a5c02"
+down_revision: str | None = "a4f18c6e2d37"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # PostGIS необязателен: без него остаётся поиск по формуле гаверсинусов
+    if bind.dialect.name != "postgresql":
+        return
+    if not bind.execute(text("SELECT 1 FROM pg_available_extensions WHERE name = 'postgis'")).scalar():
+        logger.warning("PostGIS недоступен, колонка locations.geog не создана")
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+    op.execute(
+        "ALTER TABLE locations ADD COLUMN IF NOT EXISTS geog geography(Point, 4326) "
+        "GENERATED ALWAYS AS (ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography) STORED"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_locations_geog ON locations USING gist (geog)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_locations_geog")
+    op.execute("ALTER TABLE locations DROP COLUMN IF EXISTS geog")
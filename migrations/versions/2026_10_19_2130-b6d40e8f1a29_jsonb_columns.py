@@ -0,0 +1,54 @@
+"""jsonb columns
+
+Revision ID: b6d40e8f1a29
+Revises: e91d3b7a5c02
+Create Date: 2026-10-19 21:30:42.118305
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6d40e8f1a29"
+down_revision: str | None = "e91d3b7a5c02"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (таблица, колонка), переводимые из json в jsonb
+JSONB_COLUMNS = (
+    ("locations", "tags"),
+    ("locations", "categories"),
+    ("users", "preferences"),
+    ("routes", "meta"),
+)
+
+# GIN-индексы (jsonb_ops) для фильтров ?| и @>
+GIN_INDEXES = (
+    ("ix_locations_tags", "locations", "tags"),
+    ("ix_locations_categories", "locations", "categories"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # В SQLite тип JSON не меняется
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for table, column in JSONB_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb")
+    for name, table, column in GIN_INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({column})")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for name, _, _ in GIN_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    for table, column in JSONB_COLUMNS:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE json USING {column}::json")
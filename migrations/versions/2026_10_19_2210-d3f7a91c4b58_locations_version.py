@@ -0,0 +1,28 @@
+"""locations version
+
+Revision ID: d3f7a91c4b58
+Revises: b6d40e8f1a29
+Create Date: 2026-10-19 22:10:05.734921
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d3f7a91c4b58"
+down_revision: str | None = "b6d40e8f1a29"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("locations", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("locations", "version")
@@ -0,0 +1,55 @@
+"""swipe seen users
+
+Revision ID: f2c8e4a61b07
+Revises: d3f7a91c4b58
+Create Date: 2026-10-20 09:15:41.270316
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2c8e4a61b07"
+down_revision: str | None = "d3f7a91c4b58"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "location_swipe_users",
+        sa.Column("location_id", sa.UUID(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.ForeignKeyConstraint(["location_id"], ["locations.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("location_id", "user_id"),
+    )
+    op.create_table(
+        "daily_swipe_users",
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.UUID(), nullable=False),
+        sa.PrimaryKeyConstraint("day", "user_id"),
+    )
+
+    # Уже учтённые в unique_users пары, иначе следующий свайп посчитался бы повторно
+    op.execute(
+        "INSERT INTO location_swipe_users (location_id, user_id) SELECT DISTINCT location_id, user_id FROM swipes"
+    )
+    # Из дней нужен только текущий: в прошедшие новые свайпы не попадут
+    op.execute(
+        """
+        INSERT INTO daily_swipe_users (day, user_id)
+        SELECT DISTINCT CAST(created_at AS DATE), user_id
+        FROM swipes
+        WHERE created_at >= CURRENT_DATE
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("daily_swipe_users")
+    op.drop_table("location_swipe_users")
@@ -0,0 +1,42 @@
+"""location swipe users user index
+
+Revision ID: 7c3e5b9a2d14
+Revises: f2c8e4a61b07
+Create Date: 2026-10-20 11:40:12.518304
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3e5b9a2d14"
+down_revision: str | None = "f2c8e4a61b07"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Колода свайпов исключает просмотренное по location_swipe_users, а не по партициям swipes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_location_swipe_users_user_id_location_id",
+            "location_swipe_users",
+            ["user_id", "location_id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_location_swipe_users_user_id_location_id",
+            table_name="location_swipe_users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,28 @@
+"""users version
+
+Revision ID: 9d2f6a4c8e15
+Revises: 7c3e5b9a2d14
+Create Date: 2026-10-20 13:10:47.902615
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d2f6a4c8e15"
+down_revision: str | None = "7c3e5b9a2d14"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("users", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "version")
@@ -0,0 +1,39 @@
+"""locations created_at index
+
+Revision ID: 4a7d1e3f9b62
+Revises: 9d2f6a4c8e15
+Create Date: 2026-10-20 14:25:09.337160
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4a7d1e3f9b62"
+down_revision: str | None = "9d2f6a4c8e15"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Страницы списка локаций упорядочены по (created_at, id): без индекса — полный проход и сортировка
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_locations_created_at_id",
+            "locations",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_locations_created_at_id", table_name="locations", postgresql_concurrently=True, if_exists=True
+        )
@@ -0,0 +1,52 @@
+"""
+Микробенчмарк накладных расходов на проверку JWT в одном запросе
+
+    poetry run python -m scripts.benchmarks.auth_overhead [--iterations 100000]
+
+Сравнивает полную проверку токена (python-jose, если установлен, и PyJWT)
+с попаданием в VerifiedTokenCache, которое обслуживает повторные запросы с тем же токеном.
+"""
+
+import argparse
+import timeit
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from src.core.jwt import PyJWTBackend, VerifiedTokenCache
+
+SECRET_KEY = "benchmark-secret-key-for-hs256-signing"
+ALGORITHM = "HS256"
+
+
+def report(name: str, func: Callable[[], object], iterations: int) -> None:
+    seconds = min(timeit.repeat(func, number=iterations, repeat=3))
+    print(f"{name:<24} {seconds / iterations * 1e6:8.2f} мкс/запрос")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Стоимость проверки JWT на запрос")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    args = parser.parse_args()
+
+    backend = PyJWTBackend(SECRET_KEY, ALGORITHM)
+    token = backend.encode({"sub": str(uuid4()), "exp": datetime.now() + timedelta(days=7)})
+
+    try:
+        from jose import jwt as jose_jwt
+
+        report(
+            "python-jose decode", lambda: jose_jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]), args.iterations
+        )
+    except ImportError:
+        print("python-jose не установлен, пропускаем")
+
+    report("PyJWT decode", lambda: backend.decode(token), args.iterations)
+
+    cache = VerifiedTokenCache()
+    cache.set(token, backend.decode(token))
+    report("VerifiedTokenCache hit", lambda: cache.get(token), args.iterations)
+
+
+if __name__ == "__main__":
+    main()
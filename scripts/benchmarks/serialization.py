@@ -0,0 +1,90 @@
+"""
+Бенчмарк сериализации ответа GET /locations: двойная валидация против ResponseSerializer
+
+    poetry run python -m scripts.benchmarks.serialization [--locations 100] [--photos 3] [--repeat 200]
+
+Прежний путь: LocationResponse.model_validate(loc).model_dump() в эндпоинте, затем FastAPI валидирует
+словари по response_model, прогоняет через jsonable_encoder и рендерит JSONResponse.
+Новый путь: один validate_python + dump_json прекомпилированного TypeAdapter (и то же в MessagePack).
+Замеряется только сериализация уже загруженных ORM-объектов, без БД.
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from uuid import uuid4
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.core.serialization import ResponseSerializer
+from src.models import Location
+from src.models.location import Photo
+from src.schemas.location import LocationResponse
+
+
+def build_locations(count: int, photos: int) -> list[Location]:
+    locations = []
+    for i in range(count):
+        location_id = uuid4()
+        location = Location(
+            id=location_id,
+            name=f"Location {i}",
+            latitude=55.7558,
+            longitude=37.6173,
+            categories=["restaurant", "cafe"],
+            tags=["cozy", "outdoor"],
+            instagram_url="https://instagram.com/location",
+            working_hours="10:00-22:00",
+            address="Москва",
+            description="Описание " * 20,
+            rating=4.5,
+        )
+        location.photos = [
+            Photo(id=uuid4(), location_id=location_id, photo_url=f"{location_id}/{j}.jpg", order=j)
+            for j in range(photos)
+        ]
+        locations.append(location)
+    return locations
+
+
+async def measure(name: str, serialize: Callable[[], Awaitable[bytes]], count: int, repeat: int) -> None:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await serialize()
+    per_call = (time.perf_counter() - started) / repeat
+    print(f"{name:<12} {per_call * 1000:8.2f} мс / {count} локаций")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Сериализация списка локаций")
+    parser.add_argument("--locations", type=int, default=100)
+    parser.add_argument("--photos", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    locations = build_locations(args.locations, args.photos)
+    field = create_model_field(name="Response", type_=list[LocationResponse], mode="serialization")
+    serializer = ResponseSerializer(list[LocationResponse])
+
+    async def double_validation() -> bytes:
+        content = [LocationResponse.model_validate(loc).model_dump() for loc in locations]
+        return JSONResponse(await serialize_response(field=field, response_content=content)).body
+
+    async def single_pass() -> bytes:
+        return serializer.to_json(locations)
+
+    async def single_pass_msgpack() -> bytes:
+        return serializer.to_msgpack(locations)
+
+    print(f"Локаций: {args.locations}, фото у каждой: {args.photos}, повторов: {args.repeat}")
+    await measure("до", double_validation, args.locations, args.repeat)
+    await measure("после", single_pass, args.locations, args.repeat)
+    await measure("msgpack", single_pass_msgpack, args.locations, args.repeat)
+    print(f"Размер: JSON {len(await single_pass())} байт, msgpack {len(await single_pass_msgpack())} байт")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
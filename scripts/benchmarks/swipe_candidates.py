@@ -0,0 +1,106 @@
+"""
+Бенчмарк колоды свайпов: ORM-путь против выборки только полей карточки
+
+    poetry run python -m scripts.benchmarks.swipe_candidates [--locations 5000] [--repeat 20]
+
+Оба пути читают одну и ту же колоду из SQLite в памяти и собирают ответ LocationCandidate.
+ORM-путь — прежняя реализация (удалена из сервисов, воспроизводится здесь): полные объекты Location,
+исключение свайпнутых через NOT IN со списком ID, лимит в Python. Быстрый путь — SwipeService.get_candidate_cards.
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from uuid import uuid4
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.types import SwipeAction
+from src.models import Base, Location
+from src.models.swipe import Swipe
+from src.repositories.location import LocationRepository
+from src.schemas.swipe import LocationCandidate
+from src.services.location import LocationService
+from src.services.swipe import SwipeService
+
+CENTER = (55.7558, 37.6173)
+
+
+async def seed(session: AsyncSession, locations: int, user_id: object) -> None:
+    rows = [
+        {
+            "id": uuid4(),
+            "name": f"Location {i}",
+            "latitude": CENTER[0] + (i % 100) * 0.0004,
+            "longitude": CENTER[1] + (i // 100 % 100) * 0.0004,
+            "tags": ["cozy", "cafe"],
+            "description": "Описание " * 20,
+            "address": "Москва",
+            "rating": 4.5,
+        }
+        for i in range(locations)
+    ]
+    await session.execute(insert(Location), rows)
+    # Пользователь уже свайпнул каждую десятую локацию
+    await session.execute(
+        insert(Swipe),
+        [
+            {"id": uuid4(), "user_id": user_id, "location_id": row["id"], "action": SwipeAction.LIKE}
+            for row in rows[::10]
+        ],
+    )
+    await session.commit()
+
+
+async def measure(name: str, deck: Callable[[], Awaitable[list[LocationCandidate]]], repeat: int) -> None:
+    rows = 0
+    started = time.perf_counter()
+    for _ in range(repeat):
+        rows += len(await deck())
+    seconds = time.perf_counter() - started
+    print(f"{name:<10} {rows / seconds:>12,.0f} строк/с  {seconds / repeat * 1000:8.2f} мс/колода")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="ORM против быстрого пути колоды свайпов")
+    parser.add_argument("--locations", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50, help="размер колоды (как limit у эндпоинта)")
+    args = parser.parse_args()
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    user_id = uuid4()
+
+    async with session_factory() as session:
+        await seed(session, args.locations, user_id)
+
+    async def orm_deck() -> list[LocationCandidate]:
+        async with session_factory() as session:
+            swiped_ids = await session.scalars(select(Swipe.location_id).where(Swipe.user_id == user_id))
+            query = select(Location).where(Location.id.notin_(set(swiped_ids)))
+            query, distance = LocationRepository(session)._nearby(query, CENTER, 5.0)
+            result = await session.execute(query.add_columns(distance))
+            return [
+                LocationCandidate.model_validate({**location.__dict__, "distance_km": distance})
+                for location, distance in result.all()[: args.limit]
+            ]
+
+    async def fast_deck() -> list[LocationCandidate]:
+        async with session_factory() as session:
+            service = SwipeService(session, LocationService(session, ""))
+            cards = await service.get_candidate_cards(user_id, coordinates=CENTER, limit=args.limit)
+            return [LocationCandidate.model_validate(card._asdict()) for card in cards]
+
+    print(f"Локаций: {args.locations}, колода: {args.limit}, повторов: {args.repeat}")
+    await measure("ORM", orm_deck, args.repeat)
+    await measure("Core", fast_deck, args.repeat)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
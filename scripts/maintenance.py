@@ -0,0 +1,35 @@
+"""
+Разовый запуск обслуживания (то же, что периодически делает приложение)
+
+    poetry run python -m scripts.maintenance [--batch-size 1000] [--storage-path data/locations]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from dataclasses import asdict
+
+from src.core.config import get_settings
+from src.core.database import async_session
+from src.services.maintenance import MaintenanceService
+
+
+async def main() -> None:
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Очистка устаревших данных")
+    parser.add_argument("--batch-size", type=int, default=1000, help="размер пачки при удалении кодов верификации")
+    parser.add_argument("--storage-path", default="data/locations", help="папка с фотографиями локаций")
+    args = parser.parse_args()
+
+    async with async_session() as session:
+        report = await MaintenanceService(session, storage_path=args.storage_path).run(
+            verification_batch_size=args.batch_size, partitions_ahead=settings.swipes_partitions_ahead
+        )
+    print(json.dumps(asdict(report), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""
+Обслуживание партиций swipes
+
+    poetry run python -m scripts.swipe_partitions ensure
+    poetry run python -m scripts.swipe_partitions archive [--keep-months 12] [--keep-detached]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from src.core.config import get_settings
+from src.core.database import async_session
+from src.services.swipe_partitions import SwipePartitionService
+
+
+async def main() -> None:
+    settings = get_settings()
+
+    parser = argparse.ArgumentParser(description="Партиции таблицы swipes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    ensure_parser = subparsers.add_parser("ensure", help="создать партиции на ближайшие месяцы")
+    ensure_parser.add_argument("--months-ahead", type=int, default=settings.swipes_partitions_ahead)
+    archive_parser = subparsers.add_parser("archive", help="выгрузить старые партиции в Parquet и отключить их")
+    archive_parser.add_argument("--keep-months", type=int, default=settings.swipes_keep_months)
+    archive_parser.add_argument("--path", default=settings.swipes_archive_path)
+    archive_parser.add_argument("--keep-detached", action="store_true", help="не удалять отключённые партиции")
+    args = parser.parse_args()
+
+    async with async_session() as session:
+        service = SwipePartitionService(session)
+        if not service.is_supported:
+            raise SystemExit("Партиционирование swipes поддерживается только для PostgreSQL")
+
+        if args.command == "ensure":
+            created = await service.ensure_partitions(months_ahead=args.months_ahead)
+            print(f"Создано партиций: {len(created)}")
+        else:
+            archived = await service.archive_partitions(
+                archive_path=args.path, keep_months=args.keep_months, drop=not args.keep_detached
+            )
+            for partition in archived:
+                print(f"{partition.name}: {partition.rows} строк -> {partition.path}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
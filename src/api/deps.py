@@ -1,32 +1,101 @@
-from fastapi import Depends
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+import json
+import secrets
+from collections.abc import AsyncGenerator, Awaitable, Callable
+
+from fastapi import Depends, Request
+from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.config import Settings, get_settings
-from src.core.database import get_session
+from src.core.database import async_session, get_session
+from src.core.exceptions import AdminAccessDeniedError
+from src.core.jwt import VerifiedTokenCache
+from src.core.rate_limit import RateLimiter
+from src.core.read_routing import ReadSessionRouter, client_key
 from src.models import User
 from src.services.auth import AuthService
 from src.services.location import LocationService
+from src.services.location_cache import LocationCache
 from src.services.s3 import S3Service
 from src.services.swipe import SwipeService
+from src.services.swipe_export import SwipeExportService
+from src.services.swipe_stats import SwipeStatsService
 from src.services.user import UserService
+from src.services.user_cache import UserCache
+from src.services.verification_store import VerificationStore
 
 security = HTTPBearer()
+admin_token_header = APIKeyHeader(name="X-Admin-Token", auto_error=False)
+
+
+def get_redis(request: Request) -> Redis | None:
+    """Общий клиент Redis из lifespan; None, если Redis не настроен"""
+    return request.app.state.redis
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Сессия для read-only эндпоинтов: реплика, либо primary, если клиент недавно что-то менял"""
+    router: ReadSessionRouter = request.app.state.read_router
+    client = client_key(request.headers.get("authorization"), request.client.host if request.client else None)
+    session_factory = await router.session_factory(client)
+    async with session_factory() as session:
+        yield session
+
+
+def rate_limit(route: str) -> Callable[[Request], Awaitable[None]]:
+    """Зависимость, ограничивающая частоту запросов к маршруту по IP и номеру телефона из тела"""
+
+    async def check_rate_limit(request: Request) -> None:
+        limiter: RateLimiter = request.app.state.rate_limiter
+        identifiers = {"ip": request.client.host if request.client else "unknown"}
+
+        # Тело к этому моменту уже прочитано FastAPI и закешировано в request
+        try:
+            body = await request.json()
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            body = None
+        if isinstance(body, dict) and isinstance(body.get("phone"), str):
+            identifiers["phone"] = body["phone"]
+
+        await limiter.check(route, identifiers)
 
+    return check_rate_limit
 
-def get_redis(settings: Settings = Depends(get_settings)) -> Redis:
-    return Redis(host=settings.redis_host, port=settings.redis_port, password=settings.redis_pass)
+
+def get_user_cache(request: Request) -> UserCache:
+    return request.app.state.user_cache
+
+
+def get_location_cache(request: Request) -> LocationCache:
+    return request.app.state.location_cache
+
+
+def get_verification_store(request: Request) -> VerificationStore | None:
+    return request.app.state.verification_store
+
+
+def get_token_cache(request: Request) -> VerifiedTokenCache:
+    return request.app.state.token_cache
 
 
 def get_auth_service(
-    session: AsyncSession = Depends(get_session), settings: Settings = Depends(get_settings)
+    session: AsyncSession = Depends(get_session),
+    settings: Settings = Depends(get_settings),
+    user_cache: UserCache = Depends(get_user_cache),
+    verification_store: VerificationStore | None = Depends(get_verification_store),
+    token_cache: VerifiedTokenCache = Depends(get_token_cache),
 ) -> AuthService:
     return AuthService(
         session=session,
         secret_key=settings.secret_key,
         algorithm=settings.algorithm,
         token_expire_days=settings.access_token_expire_days,
+        user_cache=user_cache,
+        verification_store=verification_store,
+        audit_verifications=settings.verification_audit,
+        verification_ttl_seconds=settings.verification_code_ttl_seconds,
+        token_cache=token_cache,
     )
 
 
@@ -37,10 +106,20 @@ async def get_current_user(
     return await auth_service.get_current_user(credentials.credentials)
 
 
+def require_admin(
+    token: str | None = Depends(admin_token_header),
+    settings: Settings = Depends(get_settings),
+) -> None:
+    # Без настроенного ADMIN_TOKEN админские эндпоинты закрыты
+    if not settings.admin_token or not token or not secrets.compare_digest(token, settings.admin_token):
+        raise AdminAccessDeniedError()
+
+
 def get_user_service(
     session: AsyncSession = Depends(get_session),
+    user_cache: UserCache = Depends(get_user_cache),
 ) -> UserService:
-    return UserService(session=session)
+    return UserService(session=session, user_cache=user_cache)
 
 
 # def get_s3_service(
@@ -67,12 +146,50 @@ def get_base_url() -> str:
 def get_location_service(
     session: AsyncSession = Depends(get_session),
     settings: Settings = Depends(get_settings),
+    location_cache: LocationCache = Depends(get_location_cache),
 ) -> LocationService:
-    return LocationService(session=session, base_url=settings.file_storage_path)
+    return LocationService(
+        session=session,
+        base_url=settings.file_storage_path,
+        use_postgis=settings.use_postgis,
+        location_cache=location_cache,
+    )
 
 
 def get_swipe_service(
     session: AsyncSession = Depends(get_session),
+    settings: Settings = Depends(get_settings),
     location_service: LocationService = Depends(get_location_service),
 ) -> SwipeService:
-    return SwipeService(session=session, location_service=location_service)
+    return SwipeService(session=session, location_service=location_service, history_months=settings.swipes_keep_months)
+
+
+def get_read_location_service(
+    session: AsyncSession = Depends(get_read_session),
+    settings: Settings = Depends(get_settings),
+    location_cache: LocationCache = Depends(get_location_cache),
+) -> LocationService:
+    return LocationService(
+        session=session,
+        base_url=settings.file_storage_path,
+        use_postgis=settings.use_postgis,
+        location_cache=location_cache,
+    )
+
+
+def get_read_swipe_service(
+    session: AsyncSession = Depends(get_read_session),
+    settings: Settings = Depends(get_settings),
+    location_service: LocationService = Depends(get_read_location_service),
+) -> SwipeService:
+    return SwipeService(session=session, location_service=location_service, history_months=settings.swipes_keep_months)
+
+
+def get_swipe_stats_service(
+    session: AsyncSession = Depends(get_session),
+) -> SwipeStatsService:
+    return SwipeStatsService(session=session)
+
+
+def get_swipe_export_service() -> SwipeExportService:
+    return SwipeExportService(session_factory=async_session)
@@ -0,0 +1,250 @@
+import logging
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.compression import (
+    CompressedBodyCache,
+    Compressor,
+    available_encoders,
+    is_compressible,
+    negotiate_encoding,
+)
+from src.core.proxies import TrustedProxies
+from src.core.query_stats import QueryStats, track_queries
+from src.core.read_routing import WRITE_METHODS, client_key
+
+logger = logging.getLogger(__name__)
+
+
+class ProxyHeadersMiddleware:
+    """
+    Подставляет в scope["client"] IP клиента из X-Forwarded-For, если соединение от доверенного прокси
+
+    Должен быть самым внешним: rate limit, read-your-writes и логи берут IP из request.client.
+    """
+
+    def __init__(self, app: ASGIApp, trusted_proxies: TrustedProxies) -> None:
+        self.app = app
+        self.trusted_proxies = trusted_proxies
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] in ("http", "websocket") and self.trusted_proxies:
+            client = scope.get("client")
+            peer = client[0] if client else None
+            host = self.trusted_proxies.client_ip(peer, Headers(scope=scope).get("x-forwarded-for"))
+            if host != peer:
+                scope = {**scope, "client": (host, 0)}
+
+        await self.app(scope, receive, send)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Отмечает клиентов, отправивших изменяющий запрос, чтобы их следующие чтения шли в primary
+
+    Отметка ставится до обработки запроса (чтения клиента, идущие параллельно с записью, уже
+    видят primary) и ещё раз при начале ответа: окно отставания реплики должно отсчитываться
+    от коммита, а долгий запрос (загрузка фотографий) может закоммитить позже, чем закончится
+    окно первой отметки.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        router = getattr(scope["app"].state, "read_router", None)
+        if router is None or not router.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        authorization = dict(scope["headers"]).get(b"authorization")
+        client = scope.get("client")
+        key = client_key(authorization.decode("latin-1") if authorization else None, client[0] if client else None)
+
+        async def send_with_mark(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                await router.mark_write(key)
+            await send(message)
+
+        await router.mark_write(key)
+        await self.app(scope, receive, send_with_mark)
+
+
+class QueryStatsMiddleware:
+    """
+    Учёт запросов к БД на каждый HTTP-запрос
+
+    Добавляет заголовок Server-Timing (число и суммарное время запросов к БД на момент начала ответа),
+    пишет структурированную запись в лог и предупреждает о повторяющихся запросах (N+1).
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 5) -> None:
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries", '
+                    f"app;dur={(time.perf_counter() - started) * 1000:.1f}",
+                )
+            await send(message)
+
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                self._log(scope, status_code, stats, time.perf_counter() - started)
+
+    def _log(self, scope: Scope, status_code: int, stats: QueryStats, seconds: float) -> None:
+        extra = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status_code,
+            "duration_ms": round(seconds * 1000, 1),
+            "db_queries": stats.count,
+            "db_ms": round(stats.total_seconds * 1000, 1),
+        }
+        logger.info(f"{scope['method']} {scope['path']} {status_code}", extra=extra)
+
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if repeated:
+            logger.warning(
+                f"Возможный N+1: {scope['method']} {scope['path']}",
+                extra={**extra, "repeated_statements": repeated},
+            )
+
+
+class CompressionMiddleware:
+    """
+    Сжатие ответов (br/zstd/gzip) по Accept-Encoding
+
+    Сжимаются только текстовые форматы (JSON, msgpack, HTML, NDJSON, ...) от minimum_size байт;
+    изображения, ответы с Content-Encoding и Cache-Control: no-transform отдаются как есть.
+    Потоковые ответы сжимаются по частям. Сжатое тело ответа с ETag кэшируется, поэтому
+    одна и та же страница не сжимается повторно; ETag сжатого ответа становится слабым (W/).
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, cache_max_bytes: int = 32 * 1024 * 1024) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = available_encoders()
+        self.cache = CompressedBodyCache(cache_max_bytes) if cache_max_bytes > 0 else None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"), list(self.encoders))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _CompressionResponder(self, scope, encoding, send).send)
+
+
+class _CompressionResponder:
+    def __init__(self, middleware: CompressionMiddleware, scope: Scope, encoding: str, send: Send) -> None:
+        self.middleware = middleware
+        self.scope = scope
+        self.encoding = encoding
+        self._send = send
+        self.start: Message | None = None
+        self.compressor: Compressor | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Заголовки отправляются вместе с первой частью тела, когда решено, сжимать ли ответ
+            self.start = message
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.start is not None:
+            await self._send_first(message)
+        elif self.passthrough:
+            await self._send(message)
+        else:
+            await self._send_chunk(message)
+
+    async def _send_first(self, message: Message) -> None:
+        start, self.start = self.start, None
+        headers = MutableHeaders(scope=start)
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self._should_compress(start["status"], headers) or (
+            not more_body and len(body) < self.middleware.minimum_size
+        ):
+            self.passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+        if more_body:
+            del headers["Content-Length"]
+            self.compressor = self.middleware.encoders[self.encoding]()
+            await self._send(start)
+            await self._send_chunk(message)
+            return
+
+        cache, key = self.middleware.cache, None
+        compressed = None
+        if cache is not None and etag:
+            path = self.scope["path"] + "?" + self.scope.get("query_string", b"").decode("latin-1")
+            key = (path, etag, self.encoding)
+            compressed = cache.get(key)
+        if compressed is None:
+            compressor = self.middleware.encoders[self.encoding]()
+            compressed = compressor.compress(body) + compressor.flush()
+            if key is not None:
+                cache.set(key, compressed)
+
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _send_chunk(self, message: Message) -> None:
+        body = self.compressor.compress(message.get("body", b""))
+        more_body = message.get("more_body", False)
+        if not more_body:
+            body += self.compressor.flush()
+        if body or not more_body:
+            await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    @staticmethod
+    def _should_compress(status_code: int, headers: MutableHeaders) -> bool:
+        return (
+            status_code not in (204, 206, 304)
+            and "content-encoding" not in headers
+            and "no-transform" not in headers.get("cache-control", "")
+            and is_compressible(headers.get("content-type"))
+        )
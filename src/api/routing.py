@@ -0,0 +1,39 @@
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from src.core.serialization import JSON_MEDIA_TYPE, is_msgpack
+
+
+class MsgPackRequest(Request):
+    """Запрос с телом application/msgpack: FastAPI получает его через json() уже разобранным"""
+
+    async def json(self) -> Any:  # noqa: ANN401
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+class MsgPackRoute(APIRoute):
+    """
+    Маршрут, принимающий тело запроса как в JSON, так и в MessagePack
+
+    FastAPI разбирает тело только для JSON-типов, поэтому для msgpack-запроса
+    Content-Type подменяется на JSON, а декодирование выполняет MsgPackRequest.json().
+    Ошибка декодирования превращается FastAPI в 400, как и для некорректного JSON.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if is_msgpack(request.headers.get("content-type")):
+                headers = [(name, value) for name, value in request.scope["headers"] if name != b"content-type"]
+                headers.append((b"content-type", JSON_MEDIA_TYPE.encode()))
+                request = MsgPackRequest({**request.scope, "headers": headers}, request.receive)
+            return await handler(request)
+
+        return route_handler
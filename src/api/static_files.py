@@ -0,0 +1,65 @@
+import mimetypes
+import os
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, PathLike, StaticFiles
+from starlette.types import Scope
+
+from src.core.etag import make_etag
+
+SENDFILE_ACCEL_REDIRECT = "x-accel-redirect"
+SENDFILE_X_SENDFILE = "x-sendfile"
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    Раздача загруженных фотографий с долгим кэшированием
+
+    Файл называется по photo_id и после загрузки не меняется (новое фото — новый photo_id),
+    поэтому URL стабилен по содержимому: ответ помечается immutable, а сильный ETag строится
+    из пути и размера, а не из mtime, и совпадает на всех инстансах с общим хранилищем.
+
+    В режиме sendfile тело отдаёт фронтовой прокси: nginx по X-Accel-Redirect
+    (internal-location с префиксом accel_redirect_prefix) или Apache/lighttpd по X-Sendfile.
+    """
+
+    def __init__(
+        self,
+        *,
+        directory: PathLike,
+        max_age: int = 31_536_000,
+        sendfile: str | None = None,
+        accel_redirect_prefix: str = "/internal/locations/",
+    ) -> None:
+        if sendfile and sendfile not in (SENDFILE_ACCEL_REDIRECT, SENDFILE_X_SENDFILE):
+            raise ValueError(f"Неизвестный режим sendfile: {sendfile}")
+
+        super().__init__(directory=directory)
+        self.cache_control = f"public, max-age={max_age}, immutable"
+        self.sendfile = sendfile
+        self.accel_redirect_prefix = accel_redirect_prefix.rstrip("/") + "/"
+
+    def file_response(
+        self,
+        full_path: PathLike,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        relative_path = Path(full_path).relative_to(Path(self.directory).resolve()).as_posix()
+        headers = {"ETag": make_etag(relative_path, stat_result.st_size), "Cache-Control": self.cache_control}
+
+        if self.is_not_modified(Headers(headers), Headers(scope=scope)):
+            return NotModifiedResponse(Headers(headers))
+
+        if self.sendfile == SENDFILE_ACCEL_REDIRECT:
+            headers["X-Accel-Redirect"] = self.accel_redirect_prefix + relative_path
+        elif self.sendfile == SENDFILE_X_SENDFILE:
+            headers["X-Sendfile"] = str(full_path)
+        else:
+            return FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+
+        media_type, _ = mimetypes.guess_type(str(full_path))
+        return Response(status_code=status_code, headers=headers, media_type=media_type)
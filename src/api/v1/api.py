@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from src.api.v1.endpoints import auth, location, swipe, user, web
+from src.api.v1.endpoints import admin, auth, location, swipe, user, web
 
 api_router = APIRouter()
 
@@ -9,3 +9,4 @@ api_router.include_router(user.router)
 api_router.include_router(location.router)
 api_router.include_router(web.router)
 api_router.include_router(swipe.router)
+api_router.include_router(admin.router)
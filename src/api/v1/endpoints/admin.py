@@ -0,0 +1,78 @@
+from datetime import date, datetime
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from src.api.deps import get_swipe_export_service, get_swipe_stats_service, require_admin
+from src.core.database import engine
+from src.core.db_pool import pool_status
+from src.schemas.admin import DatabasePoolStatusResponse
+from src.schemas.swipe import DailySwipeStatsResponse, LocationSwipeStatsResponse
+from src.services.swipe_export import SwipeExportService
+from src.services.swipe_stats import SwipeStatsService
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/stats/locations", response_model=list[LocationSwipeStatsResponse])
+async def get_top_location_stats(
+    order_by: Literal["likes", "dislikes", "hides", "unique_users"] = "likes",
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    stats_service: SwipeStatsService = Depends(get_swipe_stats_service),
+) -> list[LocationSwipeStatsResponse]:
+    """Локации с наибольшими значениями счётчика свайпов"""
+    stats = await stats_service.get_top_locations(order_by=order_by, limit=limit, offset=offset)
+    return [LocationSwipeStatsResponse.model_validate(item) for item in stats]
+
+
+@router.get("/stats/locations/{location_id}", response_model=LocationSwipeStatsResponse)
+async def get_location_stats(
+    location_id: UUID,
+    stats_service: SwipeStatsService = Depends(get_swipe_stats_service),
+) -> LocationSwipeStatsResponse:
+    """Счётчики свайпов по локации"""
+    stats = await stats_service.get_location_stats(location_id)
+    return LocationSwipeStatsResponse.model_validate(stats)
+
+
+@router.get("/stats/daily", response_model=list[DailySwipeStatsResponse])
+async def get_daily_stats(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    stats_service: SwipeStatsService = Depends(get_swipe_stats_service),
+) -> list[DailySwipeStatsResponse]:
+    """Счётчики свайпов по дням"""
+    stats = await stats_service.get_daily(date_from=date_from, date_to=date_to)
+    return [DailySwipeStatsResponse.model_validate(item) for item in stats]
+
+
+@router.get("/swipes/export", response_class=StreamingResponse)
+async def export_swipes(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: datetime | None = Query(None, description="Выгружать свайпы новее этой отметки created_at"),
+    since_id: UUID | None = Query(None, description="id последнего выгруженного свайпа с created_at == since"),
+    include_tags: bool = False,
+    export_service: SwipeExportService = Depends(get_swipe_export_service),
+) -> StreamingResponse:
+    """Потоковая выгрузка всех свайпов в NDJSON или CSV"""
+    if format == "csv":
+        content = export_service.stream_csv(since=since, since_id=since_id, include_tags=include_tags)
+        media_type = "text/csv"
+    else:
+        content = export_service.stream_ndjson(since=since, since_id=since_id, include_tags=include_tags)
+        media_type = "application/x-ndjson"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="swipes.{format}"'},
+    )
+
+
+@router.get("/db/pool", response_model=DatabasePoolStatusResponse)
+async def get_db_pool_status() -> DatabasePoolStatusResponse:
+    """Загрузка пула соединений с БД этого процесса и время ожидания соединения"""
+    return DatabasePoolStatusResponse.model_validate(pool_status(engine.pool))
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, status
 
-from src.api.deps import get_auth_service
+from src.api.deps import get_auth_service, rate_limit
 from src.schemas.auth import PhoneNumberRequest, TokenResponse, VerificationRequest
 from src.services.auth import AuthService
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/request-code", status_code=status.HTTP_200_OK)
+@router.post("/request-code", status_code=status.HTTP_200_OK, dependencies=[Depends(rate_limit("auth_request_code"))])
 async def request_verification_code(
     phone_data: PhoneNumberRequest, auth_service: AuthService = Depends(get_auth_service)
 ) -> dict[str, str]:
@@ -15,7 +15,7 @@ async def request_verification_code(
     return {"message": "Код верификации отправлен"}
 
 
-@router.post("/verify", response_model=TokenResponse)
+@router.post("/verify", response_model=TokenResponse, dependencies=[Depends(rate_limit("auth_verify"))])
 async def verify_code(
     verification_data: VerificationRequest, auth_service: AuthService = Depends(get_auth_service)
 ) -> TokenResponse:
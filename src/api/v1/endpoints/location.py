@@ -1,8 +1,11 @@
 import logging
+from uuid import UUID
 
-from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Query, Request, Response, UploadFile, status
 
-from src.api.deps import get_location_service
+from src.api.deps import get_location_service, get_read_location_service
+from src.core.etag import REVALIDATE_CACHE_CONTROL, make_etag, not_modified
+from src.core.serialization import MSGPACK_RESPONSES, ResponseSerializer, negotiate_media_type
 from src.schemas.location import (
     LocationCreate,
     LocationCreateResponse,
@@ -16,17 +19,47 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/locations", tags=["locations"])
 
+location_serializer = ResponseSerializer(LocationResponse)
+location_list_serializer = ResponseSerializer(list[LocationResponse])
 
-@router.get("", response_model=list[LocationResponse])
+# Столько же, сколько максимальная страница GET /locations; 100 UUID укладываются в ~4 КБ URL
+MAX_BATCH_IDS = 100
+
+
+def location_etag(media_type: str, version: int) -> str:
+    # ID в ETag не нужен: валидатор сравнивается только для того же URL
+    return make_etag(media_type, version)
+
+
+def locations_page_etag(media_type: str, versions: list[tuple[UUID, int]]) -> str:
+    return make_etag(media_type, *(f"{location_id}:{version}" for location_id, version in versions))
+
+
+@router.get("", response_model=list[LocationResponse], responses=MSGPACK_RESPONSES)
 async def get_locations(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     category: str | None = None,
-    location_service: LocationService = Depends(get_location_service),
-) -> list[LocationResponse]:
-    """Получение списка локаций с пагинацией и фильтрацией по категории"""
+    location_service: LocationService = Depends(get_read_location_service),
+) -> Response:
+    """
+    Получение списка локаций с пагинацией и фильтрацией по категории
+
+    С If-None-Match сначала сверяются только (id, version) страницы: при совпадении — 304
+    без загрузки локаций и фотографий.
+    """
+    media_type = negotiate_media_type(request)
+    if request.headers.get("if-none-match"):
+        versions = await location_service.get_locations_versions(skip=skip, limit=limit, category=category)
+        if response := not_modified(request, locations_page_etag(media_type, versions), vary="Accept"):
+            return response
+
     locations = await location_service.get_locations(skip=skip, limit=limit, category=category)
-    return [LocationResponse.model_validate(loc).model_dump() for loc in locations]
+    etag = locations_page_etag(media_type, [(location.id, location.version) for location in locations])
+    return location_list_serializer.response(
+        request, locations, headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    )
 
 
 @router.post("", response_model=LocationResponse)
@@ -50,13 +83,45 @@ async def create_location(
     return LocationCreateResponse.model_validate(location)
 
 
-@router.get("/{location_id}", response_model=LocationResponse)
+@router.get("/batch", response_model=list[LocationResponse], responses=MSGPACK_RESPONSES)
+async def get_locations_batch(
+    request: Request,
+    ids: list[UUID] = Query(..., min_length=1, max_length=MAX_BATCH_IDS),
+    location_service: LocationService = Depends(get_read_location_service),
+) -> Response:
+    """
+    Несколько локаций с фотографиями по ID (маршрут, список лайков) одним запросом
+
+    Ответ в порядке ids, несуществующие ID пропускаются. GET, а не POST: изменяющие запросы
+    переключают чтения клиента на primary (ReadYourWritesMiddleware), а GET ещё и валидируется по ETag.
+    """
+    media_type = negotiate_media_type(request)
+    locations = await location_service.get_locations_by_ids(ids)
+    etag = locations_page_etag(media_type, [(location.id, location.version) for location in locations])
+    if response := not_modified(request, etag, vary="Accept"):
+        return response
+
+    return location_list_serializer.response(
+        request, locations, headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    )
+
+
+@router.get("/{location_id}", response_model=LocationResponse, responses=MSGPACK_RESPONSES)
 async def get_location(
-    location_id: str, location_service: LocationService = Depends(get_location_service)
-) -> LocationResponse:
-    """Получение информации о локации"""
+    request: Request, location_id: str, location_service: LocationService = Depends(get_read_location_service)
+) -> Response:
+    """Получение информации о локации; 304 по If-None-Match сверяется по версии, без загрузки локации"""
+    media_type = negotiate_media_type(request)
+    if request.headers.get("if-none-match"):
+        version = await location_service.get_location_version(location_id)
+        if response := not_modified(request, location_etag(media_type, version), vary="Accept"):
+            return response
+
     location = await location_service.get_location(location_id)
-    return LocationResponse.model_validate(location)
+    etag = location_etag(media_type, location.version)
+    return location_serializer.response(
+        request, location, headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    )
 
 
 @router.patch("/{location_id}", response_model=LocationResponse)
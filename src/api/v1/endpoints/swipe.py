@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 
-from src.api.deps import get_current_user, get_swipe_service
+from src.api.deps import get_current_user, get_read_swipe_service, get_swipe_service
+from src.api.routing import MsgPackRoute
+from src.core.pagination import decode_cursor, encode_cursor
+from src.core.serialization import MSGPACK_RESPONSES, ResponseSerializer
 from src.core.types import SwipeAction
 from src.models.user import User
 from src.schemas.swipe import (
@@ -10,34 +13,32 @@ from src.schemas.swipe import (
 )
 from src.services.swipe import SwipeService
 
-router = APIRouter(prefix="/swipe", tags=["swipe"])
+router = APIRouter(prefix="/swipe", tags=["swipe"], route_class=MsgPackRoute)
 
+candidates_serializer = ResponseSerializer(list[LocationCandidate])
+history_serializer = ResponseSerializer(list[SwipeHistoryItem])
 
-@router.get("/candidates", response_model=list[LocationCandidate])
+
+@router.get("/candidates", response_model=list[LocationCandidate], responses=MSGPACK_RESPONSES)
 async def get_candidates(
+    request: Request,
     interests: str | None = Query(None, description="Comma-separated list of interests"),
     start_lat: float | None = Query(None, ge=-90, le=90),
     start_lng: float | None = Query(None, ge=-180, le=180),
     limit: int = Query(10, ge=1, le=50),
     current_user: User = Depends(get_current_user),
-    swipe_service: SwipeService = Depends(get_swipe_service),
-) -> list[LocationCandidate]:
+    swipe_service: SwipeService = Depends(get_read_swipe_service),
+) -> Response:
     coordinates = None
     if start_lat is not None and start_lng is not None:
         coordinates = (start_lat, start_lng)
 
     interests_list = interests.split(",") if interests else None
 
-    locations_with_distance = await swipe_service.get_candidates(
+    cards = await swipe_service.get_candidate_cards(
         user_id=current_user.id, interests=interests_list, coordinates=coordinates, limit=limit
     )
-
-    return [
-        LocationCandidate.model_validate(
-            {**location.__dict__, "distance_km": round(distance, 1) if distance is not None else None}
-        )
-        for location, distance in locations_with_distance
-    ]
+    return candidates_serializer.response(request, [card._asdict() for card in cards])
 
 
 @router.post("/action", status_code=status.HTTP_204_NO_CONTENT)
@@ -51,13 +52,28 @@ async def create_swipe_action(
     )
 
 
-@router.get("/history", response_model=list[SwipeHistoryItem])
+@router.get("/history", response_model=list[SwipeHistoryItem], responses=MSGPACK_RESPONSES)
 async def get_swipe_history(
+    request: Request,
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="Курсор следующей страницы из заголовка X-Next-Cursor"),
+    offset: int = Query(0, ge=0, deprecated=True, description="Устарело: используйте cursor"),
     filter: SwipeAction | None = Query(None),
     current_user: User = Depends(get_current_user),
-    swipe_service: SwipeService = Depends(get_swipe_service),
-) -> list[SwipeHistoryItem]:
-    swipes = await swipe_service.get_history(user_id=current_user.id, limit=limit, offset=offset, action_filter=filter)
-    return [SwipeHistoryItem.model_validate(swipe) for swipe in swipes]
+    swipe_service: SwipeService = Depends(get_read_swipe_service),
+) -> Response:
+    swipes = await swipe_service.get_history(
+        user_id=current_user.id,
+        limit=limit,
+        offset=offset,
+        action_filter=filter,
+        cursor=decode_cursor(cursor) if cursor else None,
+    )
+
+    # Полная страница — возможно, есть следующая
+    headers = {}
+    if len(swipes) == limit:
+        last = swipes[-1]
+        headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+
+    return history_serializer.response(request, swipes, headers=headers)
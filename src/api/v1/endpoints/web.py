@@ -1,8 +1,13 @@
-from fastapi import APIRouter, Depends, Request
+import hashlib
+from functools import cache
+from pathlib import Path
+
+from fastapi import APIRouter, Depends, Request, Response
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
 
 from src.api.deps import get_location_service
+from src.core.etag import REVALIDATE_CACHE_CONTROL, make_etag, not_modified
 from src.services.location import LocationService
 
 router = APIRouter(prefix="/web/locations", tags=["web"])
@@ -10,6 +15,12 @@ router = APIRouter(prefix="/web/locations", tags=["web"])
 templates = Jinja2Templates(directory="src/templates")
 
 
+@cache
+def template_digest(name: str) -> str:
+    """Версия шаблона для ETag страницы: после деплоя с новым шаблоном кэш браузера не используется"""
+    return hashlib.blake2b(Path(templates.env.loader.searchpath[0], name).read_bytes(), digest_size=8).hexdigest()
+
+
 @router.get("", response_class=HTMLResponse)
 async def show_locations_list(request: Request) -> HTMLResponse:
     return templates.TemplateResponse("locations_list.html", {"request": request})
@@ -23,6 +34,17 @@ async def show_location_form(request: Request) -> HTMLResponse:
 @router.get("/{location_id}/edit", response_class=HTMLResponse)
 async def show_location_edit(
     request: Request, location_id: str, service: LocationService = Depends(get_location_service)
-) -> HTMLResponse:
+) -> Response:
+    template = "location_edit.html"
+    if request.headers.get("if-none-match"):
+        version = await service.get_location_version(location_id)
+        if response := not_modified(request, make_etag(template_digest(template), version)):
+            return response
+
     location = await service.get_location(location_id)
-    return templates.TemplateResponse("location_edit.html", {"request": request, "location": location})
+    etag = make_etag(template_digest(template), location.version)
+    return templates.TemplateResponse(
+        template,
+        {"request": request, "location": location},
+        headers={"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL},
+    )
@@ -1,10 +1,15 @@
+import math
+
 from fastapi import Request, status
 from fastapi.responses import JSONResponse
 
 from src.core.exceptions import (
+    AdminAccessDeniedError,
+    InvalidCursorError,
     InvalidLocationDataError,
     InvalidVerificationCodeError,
     LocationNotFoundError,
+    RateLimitExceededError,
     UserAlreadyExistsError,
     UserNotFoundError,
 )
@@ -60,10 +65,44 @@ async def invalid_location_data_handler(
     )
 
 
+async def invalid_cursor_handler(
+    _: Request,
+    exc: InvalidCursorError,
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": "Некорректный курсор пагинации"},
+    )
+
+
+async def admin_access_denied_handler(
+    _: Request,
+    exc: AdminAccessDeniedError,
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_403_FORBIDDEN,
+        content={"detail": "Доступ запрещён"},
+    )
+
+
+async def rate_limit_exceeded_handler(
+    _: Request,
+    exc: RateLimitExceededError,
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Слишком много запросов, попробуйте позже"},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
 exception_handlers = {
     UserAlreadyExistsError: user_already_exists_handler,
     InvalidVerificationCodeError: invalid_verification_code_handler,
     UserNotFoundError: user_not_found_handler,
     LocationNotFoundError: location_not_found_handler,
     InvalidLocationDataError: invalid_location_data_handler,
+    InvalidCursorError: invalid_cursor_handler,
+    AdminAccessDeniedError: admin_access_denied_handler,
+    RateLimitExceededError: rate_limit_exceeded_handler,
 }
@@ -0,0 +1,266 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Пауза перед переподпиской на канал инвалидаций после ошибки Redis
+RESUBSCRIBE_DELAY_SECONDS = 5.0
+
+# Условная запись: значение (KEYS[1]) и его версия (KEYS[2]) меняются, только если закешированная
+# версия не больше новой. Возвращает 1, если запись выполнена
+SET_IF_NEWER_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[2]))
+if current and current > tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+# Удаление с «надгробием»: значение (KEYS[1]) удаляется, а версия (KEYS[2]) поднимается до ARGV[1]
+# и живёт ARGV[2] секунд, чтобы запоздавшие заполнения старыми версиями отвергались
+DELETE_WITH_TOMBSTONE_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[2]))
+if not current or current < tonumber(ARGV[1]) then
+    redis.call('SET', KEYS[2], ARGV[1], 'EX', ARGV[2])
+end
+redis.call('DEL', KEYS[1])
+return 1
+"""
+
+
+class LRUCache:
+    """Процессный LRU-кеш с ограничением по размеру и TTL записей"""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:  # noqa: ANN401
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:  # noqa: ANN401
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TwoTierCache:
+    """
+    Двухуровневый кеш: процессный LRU перед Redis
+
+    Значения хранятся в сериализованном виде (bytes). Инвалидация удаляет ключ из обоих уровней
+    и рассылается через Redis pub/sub, чтобы остальные воркеры сбросили свои локальные копии.
+    Записи с версией условные: значение не заменяет закешированное с большей версией.
+    Ошибки Redis не ломают запросы: кеш деградирует до локального уровня.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        redis: Redis | None = None,
+        local_maxsize: int = 10_000,
+        local_ttl: float = 30.0,
+        redis_ttl: int = 300,
+    ) -> None:
+        self.namespace = namespace
+        self.redis = redis
+        self.local = LRUCache(maxsize=local_maxsize, ttl=local_ttl)
+        self.local_versions = LRUCache(maxsize=local_maxsize, ttl=local_ttl)
+        self.redis_ttl = redis_ttl
+        self.channel = f"cache:invalidate:{namespace}"
+        self._set_if_newer = redis.register_script(SET_IF_NEWER_SCRIPT) if redis is not None else None
+        self._delete_with_tombstone = redis.register_script(DELETE_WITH_TOMBSTONE_SCRIPT) if redis is not None else None
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
+
+    def _version_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}:version"
+
+    async def get(self, key: str) -> bytes | None:
+        value = self.local.get(key)
+        if value is not None or self.redis is None:
+            return value
+
+        try:
+            value = await self.redis.get(self._redis_key(key))
+        except RedisError as e:
+            logger.warning(f"Кеш {self.namespace}: Redis недоступен при чтении: {e!s}")
+            return None
+
+        if value is not None:
+            self.local.set(key, value)
+        return value
+
+    async def get_many(self, keys: list[str]) -> dict[str, bytes]:
+        """Найденные значения по ключам: промахи локального уровня добираются из Redis одним MGET"""
+        found: dict[str, bytes] = {}
+        missing: list[str] = []
+        for key in keys:
+            value = self.local.get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+        if not missing or self.redis is None:
+            return found
+
+        try:
+            values = await self.redis.mget([self._redis_key(key) for key in missing])
+        except RedisError as e:
+            logger.warning(f"Кеш {self.namespace}: Redis недоступен при чтении: {e!s}")
+            return found
+
+        for key, value in zip(missing, values, strict=True):
+            if value is not None:
+                self.local.set(key, value)
+                found[key] = value
+        return found
+
+    async def set(self, key: str, value: bytes, version: int | None = None) -> None:
+        """
+        Кладёт значение в оба уровня
+
+        С version запись атомарно сравнивается с версией в Redis: запоздавшее заполнение
+        (например, прочитанное с отстающей реплики) не затрёт более свежую запись.
+        """
+        await self.set_many({key: value}, None if version is None else {key: version})
+
+    async def set_many(self, items: dict[str, bytes], versions: dict[str, int] | None = None) -> None:
+        versions = versions or {}
+        if self.redis is None or not items:
+            for key, value in items.items():
+                self._set_local(key, value, versions.get(key))
+            return
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    version = versions.get(key)
+                    if version is None:
+                        pipe.set(self._redis_key(key), value, ex=self.redis_ttl)
+                    else:
+                        await self._set_if_newer(
+                            keys=[self._redis_key(key), self._version_key(key)],
+                            args=[value, version, self.redis_ttl],
+                            client=pipe,
+                        )
+                stored = await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Кеш {self.namespace}: Redis недоступен при записи: {e!s}")
+            stored = [True] * len(items)
+
+        for (key, value), written in zip(items.items(), stored, strict=True):
+            if written:
+                self._set_local(key, value, versions.get(key))
+            else:
+                # В Redis лежит более новая версия: следующее чтение возьмёт её оттуда
+                self._delete_local(key)
+
+    async def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self._delete_local(key)
+        if self.redis is None or not keys:
+            return
+
+        try:
+            await self.redis.delete(*(self._redis_key(key) for key in keys), *(self._version_key(key) for key in keys))
+        except RedisError as e:
+            logger.warning(f"Кеш {self.namespace}: не удалось разослать инвалидацию: {e!s}")
+            return
+        await self.broadcast_invalidation(*keys)
+
+    async def delete(self, key: str, version: int) -> None:
+        """
+        Удаляет значение насовсем, оставляя версию как «надгробие» на redis_ttl
+
+        В отличие от invalidate, после удаления заполнения с версией меньше version отвергаются:
+        запрос, успевший прочитать объект до удаления (или с отстающей реплики), не вернёт его в кеш.
+        """
+        self.local.delete(key)
+        self.local_versions.set(key, version)
+        if self.redis is None:
+            return
+
+        try:
+            await self._delete_with_tombstone(
+                keys=[self._redis_key(key), self._version_key(key)], args=[version, self.redis_ttl]
+            )
+        except RedisError as e:
+            logger.warning(f"Кеш {self.namespace}: Redis недоступен при удалении: {e!s}")
+            return
+        await self.broadcast_invalidation(key)
+
+    async def broadcast_invalidation(self, *keys: str) -> None:
+        """Сбрасывает локальные копии в остальных воркерах, не трогая значения в Redis"""
+        if self.redis is None:
+            return
+
+        try:
+            for key in keys:
+                await self.redis.publish(self.channel, key)
+        except RedisError as e:
+            logger.warning(f"Кеш {self.namespace}: не удалось разослать инвалидацию: {e!s}")
+
+    def _set_local(self, key: str, value: bytes, version: int | None) -> None:
+        if version is not None:
+            current = self.local_versions.get(key)
+            if current is not None and current > version:
+                return
+            self.local_versions.set(key, version)
+        else:
+            self.local_versions.delete(key)
+        self.local.set(key, value)
+
+    def _delete_local(self, key: str) -> None:
+        self.local.delete(key)
+        self.local_versions.delete(key)
+
+    async def listen_invalidations(self) -> None:
+        """Фоновая задача воркера: сбрасывает локальные копии по сообщениям других воркеров"""
+        if self.redis is None:
+            return
+
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._delete_local(message["data"].decode())
+            except RedisError as e:
+                logger.warning(f"Кеш {self.namespace}: подписка на инвалидации прервана: {e!s}")
+                # Пока подписки не было, инвалидации могли потеряться
+                self.local.clear()
+                self.local_versions.clear()
+                await asyncio.sleep(RESUBSCRIBE_DELAY_SECONDS)
@@ -0,0 +1,149 @@
+import importlib.util
+import zlib
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Protocol
+
+GZIP_LEVEL = 6
+# Качество 5 у brotli и уровень 3 у zstd: сжатие JSON заметно лучше gzip при сравнимом времени
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+# Сжимаем только текстовые форматы: изображения и архивы уже сжаты
+COMPRESSIBLE_MEDIA_TYPES = frozenset(
+    {
+        "application/json",
+        "application/msgpack",
+        "application/x-ndjson",
+        "application/javascript",
+        "application/xml",
+        "image/svg+xml",
+    }
+)
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _GzipCompressor:
+    def __init__(self) -> None:
+        # wbits=31: формат gzip (заголовок и CRC), а не «голый» deflate
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self) -> None:
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self) -> None:
+        import zstandard
+
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_encoders() -> dict[str, Callable[[], Compressor]]:
+    """
+    Доступные кодировки в порядке предпочтения сервера
+
+    gzip есть всегда; br и zstd — если установлены brotli и zstandard (poetry install --extras compression).
+    """
+    encoders: dict[str, Callable[[], Compressor]] = {}
+    for encoding, module, compressor in (("br", "brotli", _BrotliCompressor), ("zstd", "zstandard", _ZstdCompressor)):
+        if importlib.util.find_spec(module) is not None:
+            encoders[encoding] = compressor
+    encoders["gzip"] = _GzipCompressor
+    return encoders
+
+
+def negotiate_encoding(accept_encoding: str | None, encodings: list[str]) -> str | None:
+    """
+    Выбирает кодировку по Accept-Encoding: наибольший q, при равенстве — порядок encodings
+
+    None — клиент не принимает ни одну из кодировок (или заголовка нет).
+    """
+    if not accept_encoding:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = (item.strip() for item in part.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding.lower()] = q
+
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def is_compressible(content_type: str | None) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_MEDIA_TYPES or media_type.endswith("+json")
+
+
+class CompressedBodyCache:
+    """
+    LRU сжатых тел ответов с ETag, ограниченный суммарным размером
+
+    Ключ — (путь с query, ETag, кодировка): один и тот же ETag может быть у разных URL.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._bodies: OrderedDict[tuple[str, str, str], bytes] = OrderedDict()
+
+    def get(self, key: tuple[str, str, str]) -> bytes | None:
+        body = self._bodies.get(key)
+        if body is not None:
+            self._bodies.move_to_end(key)
+        return body
+
+    def set(self, key: tuple[str, str, str], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        previous = self._bodies.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._bodies[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._bodies.popitem(last=False)
+            self.size -= len(evicted)
@@ -1,3 +1,4 @@
+import json
 import os
 from functools import lru_cache
 
@@ -8,6 +9,14 @@ ENV = os.getenv("ENV", "local")
 env_path: str = f"env/.env.{ENV}"
 load_dotenv(env_path)
 
+# "<маршрут>:<тип ключа>" -> "<запросов>/<секунд>"; переопределяются JSON-объектом в RATE_LIMITS
+DEFAULT_RATE_LIMITS = {
+    "auth_request_code:phone": "3/60",
+    "auth_request_code:ip": "20/60",
+    "auth_verify:phone": "5/60",
+    "auth_verify:ip": "30/60",
+}
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="DUGA_")
@@ -23,11 +32,61 @@ class Settings(BaseSettings):
     DB_PORT: str = os.getenv("DB_PORT")
     database_uri: str = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+    # read-only реплика: без DB_REPLICA_HOST все чтения идут в primary
+    DB_REPLICA_HOST: str | None = os.getenv("DB_REPLICA_HOST")
+    DB_REPLICA_PORT: str = os.getenv("DB_REPLICA_PORT", DB_PORT)
+    database_replica_uri: str | None = (
+        f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_REPLICA_HOST}:{DB_REPLICA_PORT}/{DB_NAME}"
+        if DB_REPLICA_HOST
+        else None
+    )
+    # Сколько секунд после записи клиент читает с primary (должно покрывать отставание реплики)
+    db_replica_lag_window_seconds: float = os.getenv("DB_REPLICA_LAG_WINDOW_SECONDS", 5)
+
+    # Поиск рядом через PostGIS (колонка locations.geog из миграции); иначе — формула гаверсинусов
+    use_postgis: bool = os.getenv("USE_POSTGIS", False)
+
+    # учёт запросов к БД: порог медленного запроса и число одинаковых запросов, считающееся N+1
+    slow_query_ms: float = os.getenv("SLOW_QUERY_MS", 200)
+    n_plus_one_threshold: int = os.getenv("N_PLUS_ONE_THRESHOLD", 5)
+
+    # пул соединений с БД (на процесс)
+    db_pool_size: int = os.getenv("DB_POOL_SIZE", 10)
+    db_max_overflow: int = os.getenv("DB_MAX_OVERFLOW", 10)
+    db_pool_timeout: float = os.getenv("DB_POOL_TIMEOUT", 30)
+    db_pool_recycle: int = os.getenv("DB_POOL_RECYCLE", 1800)
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", True)
+    db_prepared_statement_cache_size: int = os.getenv("DB_PREPARED_STATEMENT_CACHE_SIZE", 100)
+    # За PgBouncer в режиме transaction pooling: без пула в приложении и без prepared statements
+    db_pgbouncer: bool = os.getenv("DB_PGBOUNCER", False)
+
     # jwt
     secret_key: str = os.getenv("SECRET_KEY")
     algorithm: str = os.getenv("ALGORITHM")
     access_token_expire_days: int = os.getenv("ACCESS_TOKEN_EXPIRE_DAYS")
 
+    # кеш проверенных JWT (процессный, по sha256 токена)
+    token_cache_size: int = os.getenv("TOKEN_CACHE_SIZE", 10_000)
+
+    # phone verification
+    verification_code_ttl_seconds: int = os.getenv("VERIFICATION_CODE_TTL_SECONDS", 300)
+    verification_max_attempts: int = os.getenv("VERIFICATION_MAX_ATTEMPTS", 5)
+    # Окно, в котором копятся неудачные попытки номера; повторная отправка кода его не сбрасывает
+    verification_attempts_window_seconds: int = os.getenv("VERIFICATION_ATTEMPTS_WINDOW_SECONDS", 3600)
+    # Писать коды в phone_verifications как журнал, когда они хранятся в Redis
+    verification_audit: bool = os.getenv("VERIFICATION_AUDIT", False)
+
+    # rate limiting
+    rate_limits: dict[str, str] = {**DEFAULT_RATE_LIMITS, **json.loads(os.getenv("RATE_LIMITS", "{}"))}
+    # Адреса/подсети балансировщиков через запятую: только от них принимается X-Forwarded-For,
+    # иначе за балансировщиком все клиенты делят один IP-лимит
+    trusted_proxies: list[str] = [
+        proxy.strip() for proxy in os.getenv("TRUSTED_PROXIES", "").split(",") if proxy.strip()
+    ]
+
+    # admin api
+    admin_token: str | None = os.getenv("ADMIN_TOKEN")
+
     # s3
     s3_params: dict = {
         "aws_access_key_id": os.getenv("AWS_ACCESS_KEY_ID"),
@@ -36,13 +95,44 @@ class Settings(BaseSettings):
     }
     s3_bucket: str = os.getenv("AWS_BUCKET_NAME")
 
+    # swipes partitioning (PostgreSQL)
+    swipes_partitions_ahead: int = os.getenv("SWIPES_PARTITIONS_AHEAD", 3)
+    swipes_keep_months: int = os.getenv("SWIPES_KEEP_MONTHS", 12)
+    swipes_archive_path: str = os.getenv("SWIPES_ARCHIVE_PATH", "data/archive/swipes")
+
+    # maintenance: 0 отключает фоновый запуск из lifespan
+    maintenance_interval_seconds: int = os.getenv("MAINTENANCE_INTERVAL_SECONDS", 3600)
+
+    # сжатие ответов: минимальный размер тела и объём кэша сжатых тел (0 — без кэша), байты
+    compression_minimum_size: int = os.getenv("COMPRESSION_MINIMUM_SIZE", 1024)
+    compression_cache_max_bytes: int = os.getenv("COMPRESSION_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+
     # file storage
     file_storage_path: str = os.getenv("FILE_STORAGE_PATH")
 
+    # раздача загруженных фото: immutable-кэш и, опционально, отдача файла прокси
+    # STATIC_SENDFILE: "" (отдаёт приложение), "x-accel-redirect" (nginx) или "x-sendfile" (Apache/lighttpd)
+    static_max_age: int = os.getenv("STATIC_MAX_AGE", 31_536_000)
+    static_sendfile: str = os.getenv("STATIC_SENDFILE", "")
+    static_accel_redirect_prefix: str = os.getenv("STATIC_ACCEL_REDIRECT_PREFIX", "/internal/locations/")
+
     # redis
     redis_host: str = os.getenv("REDIS_HOST")
     redis_port: str = os.getenv("REDIS_PORT")
     redis_pass: str = os.getenv("REDIS_PASS")
+    redis_max_connections: int = os.getenv("REDIS_MAX_CONNECTIONS", 50)
+    redis_pool_timeout: float = os.getenv("REDIS_POOL_TIMEOUT", 2)
+    redis_health_check_interval: int = os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30)
+
+    # user cache
+    user_cache_size: int = os.getenv("USER_CACHE_SIZE", 10_000)
+    user_cache_local_ttl: float = os.getenv("USER_CACHE_LOCAL_TTL", 30)
+    user_cache_ttl: int = os.getenv("USER_CACHE_TTL", 300)
+
+    # location cache
+    location_cache_size: int = os.getenv("LOCATION_CACHE_SIZE", 5_000)
+    location_cache_local_ttl: float = os.getenv("LOCATION_CACHE_LOCAL_TTL", 30)
+    location_cache_ttl: int = os.getenv("LOCATION_CACHE_TTL", 600)
 
 
 @lru_cache
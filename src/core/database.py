@@ -4,10 +4,23 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from src.core.config import get_settings
+from src.core.db_pool import engine_options
+from src.core.query_stats import instrument_engine
 
-engine = create_async_engine(get_settings().database_uri)
+settings = get_settings()
+
+engine = create_async_engine(settings.database_uri, **engine_options(settings))
+instrument_engine(engine, slow_query_ms=settings.slow_query_ms)
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Реплика для чтений; None, если не настроена
+read_engine = None
+async_read_session = None
+if settings.database_replica_uri:
+    read_engine = create_async_engine(settings.database_replica_uri, **engine_options(settings))
+    instrument_engine(read_engine, slow_query_ms=settings.slow_query_ms)
+    async_read_session = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
     async with async_session() as session:
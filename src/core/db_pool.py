@@ -0,0 +1,110 @@
+import bisect
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, PoolProxiedConnection
+
+from src.core.config import Settings
+
+# Верхние границы корзин гистограммы ожидания соединения, мс
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+@dataclass
+class PoolMetrics:
+    """Время получения соединения из пула: от запроса до выдачи, включая pre-ping и открытие нового"""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_total_seconds: float = 0.0
+    wait_max_seconds: float = 0.0
+    wait_buckets: list[int] = field(default_factory=lambda: [0] * (len(WAIT_BUCKETS_MS) + 1))
+
+    def observe(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.wait_total_seconds += seconds
+        self.wait_max_seconds = max(self.wait_max_seconds, seconds)
+        self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS_MS, seconds * 1000)] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["inf"]
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_avg_ms": round(self.wait_total_seconds / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "wait_max_ms": round(self.wait_max_seconds * 1000, 3),
+            "wait_histogram": dict(zip(labels, self.wait_buckets, strict=True)),
+        }
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool, замеряющий время ожидания соединения"""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self) -> PoolProxiedConnection:
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.observe(time.perf_counter() - started)
+        return connection
+
+
+def pool_status(pool: Pool) -> dict[str, Any]:
+    """Текущая загрузка пула и накопленные метрики ожидания"""
+    status: dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        capacity = pool.size() + pool._max_overflow
+        status.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            utilization=round(pool.checkedout() / capacity, 3) if capacity > 0 else None,
+        )
+    if isinstance(pool, InstrumentedAsyncPool):
+        status.update(pool.metrics.snapshot())
+    return status
+
+
+def _unique_statement_name() -> str:
+    # Нумерованные имена asyncpg конфликтуют, когда PgBouncer меняет серверное соединение
+    return f"__asyncpg_{uuid4()}__"
+
+
+def engine_options(settings: Settings) -> dict[str, Any]:
+    """
+    Параметры create_async_engine из настроек
+
+    В режиме PgBouncer (transaction pooling) пулом управляет PgBouncer: на стороне приложения NullPool,
+    а кеши подготовленных выражений asyncpg выключены — соседние транзакции могут попасть
+    на другое серверное соединение, где такого выражения нет.
+    """
+    if settings.db_pgbouncer:
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _unique_statement_name,
+            },
+        }
+
+    return {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": {"prepared_statement_cache_size": settings.db_prepared_statement_cache_size},
+    }
@@ -0,0 +1,31 @@
+import hashlib
+
+from fastapi import Request, Response, status
+
+# Ответ с ETag можно хранить, но перед использованием нужно перепроверить (If-None-Match)
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts: object) -> str:
+    """Сильный ETag из частей валидатора (версии, ID, формат представления)"""
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Слабое сравнение If-None-Match с ETag (RFC 9110, 13.1.2)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+def not_modified(request: Request, etag: str, vary: str | None = None) -> Response | None:
+    """304 без тела, если If-None-Match запроса совпадает с ETag; иначе None"""
+    if not etag_matches(request.headers.get("if-none-match"), etag):
+        return None
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE_CACHE_CONTROL}
+    if vary:
+        headers["Vary"] = vary
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
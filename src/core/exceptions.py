@@ -13,6 +13,20 @@ class UserNotFoundError(Exception):
     pass
 
 
+class InvalidCursorError(Exception):
+    pass
+
+
+class AdminAccessDeniedError(Exception):
+    pass
+
+
+class RateLimitExceededError(Exception):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__()
+        self.retry_after = retry_after
+
+
 class LocationNotFoundError(HTTPException):
     def __init__(self) -> None:
         super().__init__(
@@ -0,0 +1,65 @@
+import hashlib
+import time
+from typing import Any, Protocol
+
+import jwt
+
+from src.core.cache import LRUCache
+
+
+class InvalidTokenError(Exception):
+    """Токен не прошёл проверку подписи, истёк или повреждён"""
+
+
+class JWTBackend(Protocol):
+    def encode(self, claims: dict[str, Any]) -> str: ...
+
+    def decode(self, token: str) -> dict[str, Any]:
+        """Проверяет подпись и exp, возвращает claims; при ошибке — InvalidTokenError"""
+        ...
+
+
+class PyJWTBackend:
+    def __init__(self, secret_key: str, algorithm: str) -> None:
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        return jwt.encode(claims, self.secret_key, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict[str, Any]:
+        try:
+            return jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError() from e
+
+
+class VerifiedTokenCache:
+    """
+    Кеш уже проверенных токенов: sha256(токен) -> claims
+
+    Запись живёт не дольше exp токена, поэтому истёкший токен из кеша не вернётся.
+    В памяти хранится только дайджест, а не сам токен.
+    """
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self._cache = LRUCache(maxsize=maxsize)
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict[str, Any] | None:
+        return self._cache.get(self._key(token))
+
+    def set(self, token: str, claims: dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        if exp is None:
+            return
+
+        ttl = exp - time.time()
+        if ttl > 0:
+            self._cache.set(self._key(token), claims, ttl=ttl)
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -0,0 +1,23 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+
+from src.core.exceptions import InvalidCursorError
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """Кодирует позицию (created_at, id) в непрозрачный токен курсора"""
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(item_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime, UUID]:
+    """Декодирует токен курсора обратно в позицию (created_at, id)"""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["c"]), UUID(payload["i"])
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise InvalidCursorError()
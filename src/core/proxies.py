@@ -0,0 +1,39 @@
+from collections.abc import Iterable
+from ipaddress import IPv4Network, IPv6Network, ip_address, ip_network
+
+
+class TrustedProxies:
+    """
+    Доверенные прокси (балансировщик, ingress) и восстановление IP клиента по X-Forwarded-For
+
+    Заголовок читается, только если соединение пришло от доверенного прокси: иначе любой клиент
+    подставил бы себе чужой IP. Цепочка разбирается справа налево — правые адреса дописаны нашими
+    прокси, первый недоверенный адрес и есть клиент.
+    """
+
+    def __init__(self, proxies: Iterable[str] = ()) -> None:
+        self.networks: list[IPv4Network | IPv6Network] = [ip_network(proxy, strict=False) for proxy in proxies]
+
+    def __bool__(self) -> bool:
+        return bool(self.networks)
+
+    def is_trusted(self, host: str | None) -> bool:
+        if not host:
+            return False
+        try:
+            address = ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self.networks)
+
+    def client_ip(self, peer: str | None, forwarded_for: str | None) -> str | None:
+        """IP клиента: peer, если он не доверенный прокси или X-Forwarded-For пуст"""
+        if not forwarded_for or not self.is_trusted(peer):
+            return peer
+
+        hops = [hop.strip() for hop in forwarded_for.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not self.is_trusted(hop):
+                return hop
+        # Вся цепочка из наших прокси: клиент — самый левый адрес
+        return hops[0] if hops else peer
@@ -0,0 +1,90 @@
+import logging
+import time
+import weakref
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """Запросы к БД в рамках одного HTTP-запроса (или блока track_queries)"""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Одинаковые запросы, выполненные не меньше threshold раз: признак N+1"""
+        return {statement: n for statement, n in self.statements.items() if n >= threshold}
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Собирает запросы к инструментированным движкам, выполненные внутри блока"""
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+class _EngineListener:
+    def __init__(self, slow_query_seconds: float) -> None:
+        self.slow_query_seconds = slow_query_seconds
+
+    def before_cursor_execute(self, conn: Connection, cursor: Any, statement: str, *args: Any) -> None:  # noqa: ANN401
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    def after_cursor_execute(self, conn: Connection, cursor: Any, statement: str, *args: Any) -> None:  # noqa: ANN401
+        seconds = time.perf_counter() - conn.info["query_started_at"].pop()
+
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, seconds)
+
+        if seconds >= self.slow_query_seconds:
+            logger.warning(
+                "Медленный запрос к БД",
+                extra={"db_query_ms": round(seconds * 1000, 1), "statement": statement},
+            )
+
+    def handle_error(self, context: Any) -> None:  # noqa: ANN401
+        # after_cursor_execute для упавшего запроса не вызывается
+        started = context.connection.info.get("query_started_at") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+_instrumented: weakref.WeakSet[Engine] = weakref.WeakSet()
+
+
+def instrument_engine(engine: AsyncEngine | Engine, slow_query_ms: float = 200) -> None:
+    """Подключает учёт запросов к движку; повторный вызов ничего не меняет"""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if sync_engine in _instrumented:
+        return
+
+    listener = _EngineListener(slow_query_ms / 1000)
+    event.listen(sync_engine, "before_cursor_execute", listener.before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", listener.after_cursor_execute)
+    event.listen(sync_engine, "handle_error", listener.handle_error)
+    _instrumented.add(sync_engine)
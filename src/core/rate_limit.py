@@ -0,0 +1,135 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core.exceptions import RateLimitExceededError
+
+logger = logging.getLogger(__name__)
+
+# Token bucket: пополнение пропорционально прошедшему времени (часы Redis), списание одного токена.
+# Возвращает {allowed, retry_after} — retry_after строкой, чтобы Redis не округлил его до целого
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = (1 - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return {allowed, tostring(retry_after)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    capacity: int
+    period_seconds: float
+
+    @property
+    def refill_rate(self) -> float:
+        return self.capacity / self.period_seconds
+
+    @classmethod
+    def parse(cls: type["RateLimit"], value: str) -> "RateLimit":
+        """Формат "<запросов>/<секунд>", например "5/60" """
+        capacity, period = value.split("/")
+        return cls(capacity=int(capacity), period_seconds=float(period))
+
+
+class InMemoryTokenBucket:
+    """Процессные бакеты: фолбэк при недоступном Redis"""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def hit(self, key: str, limit: RateLimit) -> float | None:
+        """Списывает токен; возвращает None, если запрос разрешён, иначе через сколько секунд повторить"""
+        now = time.monotonic()
+        tokens, ts = self._buckets.get(key, (limit.capacity, now))
+        tokens = min(limit.capacity, tokens + (now - ts) * limit.refill_rate)
+
+        retry_after = None
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / limit.refill_rate
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class RedisTokenBucket:
+    """Общие для всех воркеров бакеты в Redis, обновляемые атомарно Lua-скриптом"""
+
+    def __init__(self, redis: Redis) -> None:
+        self._script = redis.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def hit(self, key: str, limit: RateLimit) -> float | None:
+        allowed, retry_after = await self._script(keys=[f"ratelimit:{key}"], args=[limit.capacity, limit.refill_rate])
+        return None if allowed else float(retry_after)
+
+
+class RateLimiter:
+    """
+    Ограничение частоты запросов по маршрутам
+
+    Лимиты задаются ключами "<маршрут>:<тип ключа>", например "auth_verify:phone".
+    Маршрут без настроенного лимита для типа ключа не ограничивается.
+    """
+
+    def __init__(self, limits: dict[str, str], redis: Redis | None = None) -> None:
+        self.limits = {name: RateLimit.parse(value) for name, value in limits.items()}
+        self.redis_bucket = RedisTokenBucket(redis) if redis is not None else None
+        self.local_bucket = InMemoryTokenBucket()
+
+    async def check(self, route: str, identifiers: dict[str, str]) -> None:
+        """
+        Args:
+            route: имя маршрута
+            identifiers: тип ключа -> значение, например {"ip": "1.2.3.4", "phone": "79990000000"}
+
+        Raises:
+            RateLimitExceededError: если исчерпан лимит хотя бы по одному ключу
+        """
+        waits = []
+        for kind, value in identifiers.items():
+            limit = self.limits.get(f"{route}:{kind}")
+            if limit is None:
+                continue
+
+            wait = await self._hit(f"{route}:{kind}:{value}", limit)
+            if wait is not None:
+                waits.append(wait)
+
+        if waits:
+            raise RateLimitExceededError(retry_after=max(waits))
+
+    async def _hit(self, key: str, limit: RateLimit) -> float | None:
+        if self.redis_bucket is not None:
+            try:
+                return await self.redis_bucket.hit(key, limit)
+            except RedisError as e:
+                logger.warning(f"Rate limit: Redis недоступен, используем процессный лимит: {e!s}")
+        return await self.local_bucket.hit(key, limit)
@@ -0,0 +1,89 @@
+import hashlib
+import logging
+from collections.abc import Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Методы, после которых клиент должен видеть свои изменения
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+def client_key(authorization: str | None, host: str | None) -> str:
+    """Идентификатор клиента для read-your-writes: дайджест токена, для анонимных — IP"""
+    if authorization:
+        return "token:" + hashlib.sha256(authorization.encode()).hexdigest()
+    return f"ip:{host}"
+
+
+class RecentWritesTracker:
+    """
+    Клиенты, писавшие в primary за последние window_seconds
+
+    Окно должно покрывать отставание реплики. Отметки общие для воркеров через Redis,
+    без Redis — процессные. Если Redis недоступен при проверке, считаем, что запись была:
+    лишнее чтение с primary безопаснее устаревших данных.
+    """
+
+    def __init__(self, redis: Redis | None = None, window_seconds: float = 5.0) -> None:
+        self.redis = redis
+        self.window_seconds = window_seconds
+        self.local = LRUCache(maxsize=100_000, ttl=window_seconds)
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"recent_write:{key}"
+
+    async def mark(self, key: str) -> None:
+        self.local.set(key, True)
+        if self.redis is None:
+            return
+
+        try:
+            await self.redis.set(self._redis_key(key), 1, px=int(self.window_seconds * 1000))
+        except RedisError as e:
+            logger.warning(f"Read-your-writes: Redis недоступен при отметке записи: {e!s}")
+
+    async def is_recent(self, key: str) -> bool:
+        if self.local.get(key):
+            return True
+        if self.redis is None:
+            return False
+
+        try:
+            return bool(await self.redis.exists(self._redis_key(key)))
+        except RedisError as e:
+            logger.warning(f"Read-your-writes: Redis недоступен, читаем с primary: {e!s}")
+            return True
+
+
+class ReadSessionRouter:
+    """Выбирает фабрику сессий для чтения: реплика, если клиент недавно не писал, иначе primary"""
+
+    def __init__(
+        self,
+        primary: Callable[[], AsyncSession],
+        replica: Callable[[], AsyncSession] | None = None,
+        tracker: RecentWritesTracker | None = None,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.tracker = tracker or RecentWritesTracker()
+
+    @property
+    def enabled(self) -> bool:
+        return self.replica is not None
+
+    async def mark_write(self, client: str) -> None:
+        if self.enabled:
+            await self.tracker.mark(client)
+
+    async def session_factory(self, client: str) -> Callable[[], AsyncSession]:
+        if not self.enabled or await self.tracker.is_recent(client):
+            return self.primary
+        return self.replica
@@ -0,0 +1,26 @@
+from redis.asyncio import BlockingConnectionPool, Redis
+
+from src.core.config import Settings
+
+
+def create_redis(settings: Settings) -> Redis | None:
+    """
+    Общий для приложения клиент Redis поверх одного пула соединений; None, если Redis не настроен
+
+    Создаётся один раз в lifespan. Пул блокирующий: при исчерпании max_connections запрос ждёт
+    свободное соединение до redis_pool_timeout, а затем получает ConnectionError, и функции на Redis
+    деградируют так же, как при недоступном сервере. Клиент владеет пулом: aclose() закрывает соединения.
+    """
+    if not settings.redis_host:
+        return None
+
+    pool = BlockingConnectionPool(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        password=settings.redis_pass,
+        max_connections=settings.redis_max_connections,
+        timeout=settings.redis_pool_timeout,
+        health_check_interval=settings.redis_health_check_interval,
+        socket_connect_timeout=settings.redis_pool_timeout,
+    )
+    return Redis.from_pool(pool)
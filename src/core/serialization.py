@@ -0,0 +1,88 @@
+from typing import Any, Generic, TypeVar
+
+import msgpack
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+JSON_MEDIA_TYPE = ORJSONResponse.media_type
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = frozenset({MSGPACK_MEDIA_TYPE, "application/x-msgpack"})
+
+# Для responses= у маршрутов с согласованием формата: MessagePack в OpenAPI рядом с JSON
+MSGPACK_RESPONSES: dict[int | str, dict[str, Any]] = {200: {"content": {MSGPACK_MEDIA_TYPE: {}}}}
+
+
+def _quality(accept: str, media_types: frozenset[str] | set[str]) -> float:
+    """Наибольший q среди перечисленных в Accept типов из media_types (0, если ни одного нет)"""
+    best = 0.0
+    for part in accept.split(","):
+        media_type, *params = (item.strip() for item in part.split(";"))
+        if media_type.lower() not in media_types:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        best = max(best, q)
+    return best
+
+
+def prefers_msgpack(accept: str | None) -> bool:
+    """Клиент явно запросил MessagePack и не предпочёл ему JSON; по умолчанию ответ в JSON"""
+    if not accept:
+        return False
+    msgpack_q = _quality(accept, MSGPACK_MEDIA_TYPES)
+    return msgpack_q > 0 and msgpack_q >= _quality(accept, {JSON_MEDIA_TYPE, "application/*", "*/*"})
+
+
+def negotiate_media_type(request: Request) -> str:
+    """Формат ответа по заголовку Accept: MessagePack или JSON"""
+    return MSGPACK_MEDIA_TYPE if prefers_msgpack(request.headers.get("accept")) else JSON_MEDIA_TYPE
+
+
+def is_msgpack(content_type: str | None) -> bool:
+    return bool(content_type) and content_type.split(";")[0].strip().lower() in MSGPACK_MEDIA_TYPES
+
+
+class ResponseSerializer(Generic[T]):
+    """
+    Прекомпилированный сериализатор схемы ответа: ORM-объекты/строки -> JSON или MessagePack за один проход
+
+    Эндпоинт возвращает готовый Response, поэтому FastAPI не валидирует результат повторно
+    по response_model и не прогоняет его через jsonable_encoder. response_model у маршрута
+    остаётся только для OpenAPI.
+    """
+
+    def __init__(self, schema: type[T]) -> None:
+        self.adapter = TypeAdapter(schema)
+
+    def validate(self, obj: Any) -> T:  # noqa: ANN401
+        return self.adapter.validate_python(obj, from_attributes=True)
+
+    def to_json(self, obj: Any) -> bytes:  # noqa: ANN401
+        # by_alias — как у FastAPI по умолчанию (например, photo_url у PhotoResponse)
+        return self.adapter.dump_json(self.validate(obj), by_alias=True)
+
+    def to_msgpack(self, obj: Any) -> bytes:  # noqa: ANN401
+        # Та же структура, что и в JSON: UUID и даты строками
+        return msgpack.packb(self.adapter.dump_python(self.validate(obj), mode="json", by_alias=True))
+
+    def response(
+        self,
+        request: Request,
+        obj: Any,  # noqa: ANN401
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+    ) -> Response:
+        """Ответ в формате, выбранном по заголовку Accept"""
+        headers = {**(headers or {}), "Vary": "Accept"}
+        media_type = negotiate_media_type(request)
+        body = self.to_msgpack(obj) if media_type == MSGPACK_MEDIA_TYPE else self.to_json(obj)
+        return Response(body, status_code=status_code, headers=headers, media_type=media_type)
@@ -1,27 +1,118 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from pathlib import Path
 
 from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from src.api.middleware import (
+    CompressionMiddleware,
+    ProxyHeadersMiddleware,
+    QueryStatsMiddleware,
+    ReadYourWritesMiddleware,
+)
+from src.api.static_files import ImmutableStaticFiles
 from src.api.v1.api import api_router
 from src.api.v1.errors import exception_handlers
+from src.core.cache import TwoTierCache
 from src.core.config import get_settings
+from src.core.database import async_read_session, async_session
+from src.core.jwt import VerifiedTokenCache
+from src.core.proxies import TrustedProxies
+from src.core.rate_limit import RateLimiter
+from src.core.read_routing import ReadSessionRouter, RecentWritesTracker
+from src.core.redis import create_redis
+from src.services.location_cache import LocationCache
+from src.services.maintenance import run_periodically
+from src.services.user_cache import UserCache
+from src.services.verification_store import RedisVerificationStore
 
 settings = get_settings()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):  # noqa: ANN201
+    # Один пул соединений на процесс: кеши, rate limit, коды верификации и обслуживание работают через него
+    redis = create_redis(settings)
+    app.state.redis = redis
+    app.state.user_cache = UserCache(
+        TwoTierCache(
+            "users",
+            redis,
+            local_maxsize=settings.user_cache_size,
+            local_ttl=settings.user_cache_local_ttl,
+            redis_ttl=settings.user_cache_ttl,
+        )
+    )
+    app.state.location_cache = LocationCache(
+        TwoTierCache(
+            "locations",
+            redis,
+            local_maxsize=settings.location_cache_size,
+            local_ttl=settings.location_cache_local_ttl,
+            redis_ttl=settings.location_cache_ttl,
+        )
+    )
+    # Без Redis коды верификации остаются в таблице phone_verifications
+    app.state.verification_store = (
+        RedisVerificationStore(
+            redis,
+            max_attempts=settings.verification_max_attempts,
+            attempts_ttl_seconds=settings.verification_attempts_window_seconds,
+        )
+        if redis is not None
+        else None
+    )
+    app.state.token_cache = VerifiedTokenCache(maxsize=settings.token_cache_size)
+    app.state.rate_limiter = RateLimiter(settings.rate_limits, redis)
+    app.state.read_router = ReadSessionRouter(
+        primary=async_session,
+        replica=async_read_session,
+        tracker=RecentWritesTracker(redis, window_seconds=settings.db_replica_lag_window_seconds),
+    )
+    background_tasks = [
+        asyncio.create_task(app.state.user_cache.cache.listen_invalidations()),
+        asyncio.create_task(app.state.location_cache.cache.listen_invalidations()),
+    ]
+    if settings.maintenance_interval_seconds > 0:
+        background_tasks.append(
+            asyncio.create_task(
+                run_periodically(
+                    async_session,
+                    settings.maintenance_interval_seconds,
+                    storage_path=str(static_dir),
+                    redis=redis,
+                    partitions_ahead=settings.swipes_partitions_ahead,
+                )
+            )
+        )
+
     yield
 
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    if redis is not None:
+        await redis.aclose()
+
 
 app = FastAPI(
     title=settings.project_name,
     openapi_url=f"{settings.api_version}/openapi.json",
     lifespan=lifespan,
     exception_handlers=exception_handlers,
+    default_response_class=ORJSONResponse,
+)
+
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryStatsMiddleware, n_plus_one_threshold=settings.n_plus_one_threshold)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    cache_max_bytes=settings.compression_cache_max_bytes,
 )
 
 # Настройка CORS
@@ -31,13 +122,25 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
+# Самый внешний: остальные middleware и зависимости видят реальный IP клиента
+app.add_middleware(ProxyHeadersMiddleware, trusted_proxies=TrustedProxies(settings.trusted_proxies))
 
 # Монтируем статические файлы для загруженных фотографий
 static_dir = Path("data/locations")
 if not static_dir.exists():
     static_dir.mkdir(parents=True)
-app.mount("/static/locations", StaticFiles(directory=static_dir), name="static")
+app.mount(
+    "/static/locations",
+    ImmutableStaticFiles(
+        directory=static_dir,
+        max_age=settings.static_max_age,
+        sendfile=settings.static_sendfile or None,
+        accel_redirect_prefix=settings.static_accel_redirect_prefix,
+    ),
+    name="static",
+)
 
 app.mount("/static", StaticFiles(directory=Path("src/static")), name="static_assets")
 
@@ -1,7 +1,7 @@
 from .base import Base
 from .location import Location, Photo
 from .route import Route, RouteLocation
-from .swipe import Swipe
+from .swipe import DailySwipeStats, DailySwipeUser, LocationSwipeStats, LocationSwipeUser, Swipe
 from .user import PhoneVerification, User
 
 __all__ = [
@@ -11,6 +11,10 @@ __all__ = [
     "Location",
     "Photo",
     "Swipe",
+    "LocationSwipeStats",
+    "DailySwipeStats",
+    "LocationSwipeUser",
+    "DailySwipeUser",
     "Route",
     "RouteLocation",
 ]
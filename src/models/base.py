@@ -1,12 +1,15 @@
 import uuid
 
-from sqlalchemy import Column, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import JSON, Column, DateTime
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 
 Base = declarative_base()
 
+# JSONB в PostgreSQL (бинарное хранение, GIN-индексы, операторы @> и ?|), обычный JSON в SQLite
+JSONBType = JSON().with_variant(JSONB(), "postgresql")
+
 
 class BaseModel(Base):
     __abstract__ = True
@@ -1,25 +1,31 @@
+from typing import Any, ClassVar
+
 from sqlalchemy import (
-    JSON,
     UUID,
     Column,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
 )
 from sqlalchemy.orm import relationship
 
-from .base import BaseModel
+from .base import BaseModel, JSONBType
 
 
 class Location(BaseModel):
     __tablename__ = "locations"
+    __table_args__ = (
+        # Страницы списка (get_many / get_page_versions) идут по индексу в порядке ORDER BY, без сортировки
+        Index("ix_locations_created_at_id", "created_at", "id"),
+    )
 
     name = Column(String(255), nullable=False)
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
-    categories = Column(JSON, nullable=True)
-    tags = Column(JSON, nullable=True)
+    categories = Column(JSONBType, nullable=True)
+    tags = Column(JSONBType, nullable=True)
 
     instagram_url = Column(String(255), nullable=True)
     working_hours = Column(String(255), nullable=True)
@@ -29,15 +35,21 @@ class Location(BaseModel):
     description = Column(String(2048), nullable=True)  # История, детали и т. д.
     rating = Column(Float, default=0.0)
 
+    # Увеличивается при каждом изменении локации и её фотографий; основа ETag
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     swipes = relationship("Swipe", back_populates="location", cascade="all, delete-orphan")
     photos = relationship("Photo", back_populates="location", cascade="all, delete-orphan", order_by="Photo.order")
     route_associations = relationship("RouteLocation", back_populates="location", cascade="all, delete-orphan")
 
+    # UPDATE ... WHERE version = :old: параллельная правка не получит ту же версию
+    __mapper_args__: ClassVar[dict[str, Any]] = {"version_id_col": version}
+
 
 class Photo(BaseModel):
     __tablename__ = "photos"
 
-    location_id = Column(UUID, ForeignKey("locations.id"), nullable=False)
+    location_id = Column(UUID, ForeignKey("locations.id"), nullable=False, index=True)
     photo_url = Column(String(512), nullable=False)
     caption = Column(String(255), nullable=True)
     order = Column(Integer, nullable=False, default=0)
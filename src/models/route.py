@@ -1,14 +1,14 @@
-from sqlalchemy import JSON, UUID, Column, ForeignKey, Integer
+from sqlalchemy import UUID, Column, ForeignKey, Integer
 from sqlalchemy.orm import relationship
 
-from .base import BaseModel
+from .base import BaseModel, JSONBType
 
 
 class Route(BaseModel):
     __tablename__ = "routes"
 
     user_id = Column(UUID, ForeignKey("users.id"), nullable=False)
-    meta = Column(JSON, nullable=True)  # Настроение, ожидания, описание маршрута
+    meta = Column(JSONBType, nullable=True)  # Настроение, ожидания, описание маршрута
 
     user = relationship("User", back_populates="routes")
     locations = relationship("RouteLocation", back_populates="route", cascade="all, delete-orphan")
@@ -17,7 +17,7 @@ class Route(BaseModel):
 class RouteLocation(BaseModel):
     __tablename__ = "route_locations"
 
-    route_id = Column(UUID, ForeignKey("routes.id"), nullable=False)
+    route_id = Column(UUID, ForeignKey("routes.id"), nullable=False, index=True)
     location_id = Column(UUID, ForeignKey("locations.id"), nullable=False)
     order = Column(Integer, nullable=False)  # Порядок следования точки в маршруте
 
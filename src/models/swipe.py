@@ -1,18 +1,79 @@
-from sqlalchemy import UUID, Column, ForeignKey
+from sqlalchemy import UUID, Column, Date, DateTime, ForeignKey, Index, Integer
 from sqlalchemy import Enum as SQLAlchemyEnum
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 
 from src.core.types import SwipeAction
 
-from .base import BaseModel
+from .base import Base, BaseModel
 
 
 class Swipe(BaseModel):
     __tablename__ = "swipes"
+    __table_args__ = (
+        # Покрывает историю свайпов пользователя с keyset-пагинацией по (created_at, id)
+        Index("ix_swipes_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     user_id = Column(UUID, ForeignKey("users.id"), nullable=False)
     location_id = Column(UUID, ForeignKey("locations.id"), nullable=False)
     action = Column(SQLAlchemyEnum(SwipeAction), nullable=False)
+    # В PostgreSQL swipes партиционирована по месяцам created_at (см. миграцию swipes_partitioning)
+    created_at = Column(DateTime, default=func.now(), nullable=False)
 
     user = relationship("User", back_populates="swipes")
-    location = relationship("Location", back_populates="swipes", lazy="selectin")
+    # Стратегия загрузки выбирается в каждом запросе явно (selectinload / проекция карточки)
+    location = relationship("Location", back_populates="swipes", lazy="raise")
+
+
+class LocationSwipeStats(Base):
+    """Накопительные счётчики свайпов по локации, обновляются при каждом свайпе"""
+
+    __tablename__ = "location_swipe_stats"
+
+    location_id = Column(UUID, ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True)
+    likes = Column(Integer, nullable=False, default=0, server_default="0")
+    dislikes = Column(Integer, nullable=False, default=0, server_default="0")
+    hides = Column(Integer, nullable=False, default=0, server_default="0")
+    unique_users = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class DailySwipeStats(Base):
+    """Накопительные счётчики свайпов за день, обновляются при каждом свайпе"""
+
+    __tablename__ = "daily_swipe_stats"
+
+    day = Column(Date, primary_key=True)
+    likes = Column(Integer, nullable=False, default=0, server_default="0")
+    dislikes = Column(Integer, nullable=False, default=0, server_default="0")
+    hides = Column(Integer, nullable=False, default=0, server_default="0")
+    unique_users = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class LocationSwipeUser(Base):
+    """
+    Пользователи, уже свайпавшие локацию: вставка с ON CONFLICT решает, считать ли unique_users
+
+    Заодно это множество просмотренных локаций для колоды свайпов: в отличие от swipes,
+    оно не теряет пары при архивации старых партиций.
+    """
+
+    __tablename__ = "location_swipe_users"
+    __table_args__ = (
+        # Подзапрос просмотренных локаций колоды: index-only scan по пользователю
+        Index("ix_location_swipe_users_user_id_location_id", "user_id", "location_id"),
+    )
+
+    location_id = Column(UUID, ForeignKey("locations.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(UUID, primary_key=True)
+
+
+class DailySwipeUser(Base):
+    """Пользователи, свайпавшие в этот день; прошедшие дни подчищает обслуживание"""
+
+    __tablename__ = "daily_swipe_users"
+
+    day = Column(Date, primary_key=True)
+    user_id = Column(UUID, primary_key=True)
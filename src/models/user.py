@@ -1,15 +1,15 @@
 from sqlalchemy import (
-    JSON,
     UUID,
     Boolean,
     Column,
     DateTime,
     ForeignKey,
+    Integer,
     String,
 )
 from sqlalchemy.orm import relationship
 
-from .base import BaseModel
+from .base import BaseModel, JSONBType
 
 
 class User(BaseModel):
@@ -20,7 +20,10 @@ class User(BaseModel):
     city = Column(String(255), nullable=True)
     is_phone_verified = Column(Boolean, default=False)
     full_name = Column(String(255), nullable=True)
-    preferences = Column(JSON, nullable=True)
+    preferences = Column(JSONBType, nullable=True)
+
+    # Увеличивается при каждом изменении (UserRepository.update); по ней кеш отвергает устаревшие заполнения
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     swipes = relationship("Swipe", back_populates="user", cascade="all, delete-orphan")
     routes = relationship("Route", back_populates="user", cascade="all, delete-orphan")
@@ -29,9 +32,9 @@ class User(BaseModel):
 class PhoneVerification(BaseModel):
     __tablename__ = "phone_verifications"
 
-    phone_number = Column(String(20), nullable=False)
+    phone_number = Column(String(20), nullable=False, index=True)
     code = Column(String(10), nullable=False)
-    expires_at = Column(DateTime, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
     user_id = Column(UUID, ForeignKey("users.id"), nullable=True)
 
     user = relationship("User", backref="verifications")
@@ -1,17 +1,51 @@
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import String, and_, func, or_, select
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Row,
+    Select,
+    String,
+    func,
+    literal,
+    literal_column,
+    null,
+    or_,
+    select,
+    type_coerce,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from sqlalchemy.sql.expression import cast
 from sqlalchemy.types import Float
 
 from src.models.location import Location, Photo
+from src.models.swipe import LocationSwipeUser
+
+# Генерируемая колонка geography(Point, 4326) с GiST-индексом; есть только в PostgreSQL с PostGIS
+# и не объявлена в модели, чтобы схема оставалась переносимой
+LOCATION_GEOG = literal_column("locations.geog")
+
+# Поля карточки свайпа (LocationCandidate)
+CANDIDATE_COLUMNS = (
+    Location.id,
+    Location.name,
+    Location.description,
+    Location.tags,
+    Location.address,
+    Location.rating,
+    Location.working_hours,
+    Location.latitude,
+    Location.longitude,
+)
 
 
 class LocationRepository:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, use_postgis: bool = False) -> None:
         self.session = session
+        self.use_postgis = use_postgis
 
     async def save(self, location: Location) -> Location:
         """Сохраняет локацию в БД"""
@@ -30,65 +64,63 @@ class LocationRepository:
         return result.scalar_one_or_none()
 
     async def get_by_ids(self, location_ids: list[UUID]) -> list[Location]:
-        """Получает список локаций по их ID"""
+        """Получает список локаций с фотографиями по их ID (порядок не гарантирован)"""
         if not location_ids:
             return []
 
-        query = select(Location).where(Location.id.in_(location_ids))
+        query = select(Location).options(selectinload(Location.photos)).where(Location.id.in_(location_ids))
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
-    async def get_filtered(
+    async def get_photo_ids(self, location_id: UUID) -> set[UUID]:
+        """Получает ID всех фотографий локации"""
+        result = await self.session.execute(select(Photo.id).where(Photo.location_id == location_id))
+        return set(result.scalars().all())
+
+    async def get_candidates(
         self,
-        exclude_ids: list[UUID] | None = None,
+        user_id: UUID,
         tags: list[str] | None = None,
         coordinates: tuple[float, float] | None = None,
         radius_km: float = 5.0,
-    ) -> list[tuple[Location, float | None]]:
+        limit: int = 10,
+    ) -> list[Row]:
         """
-        Получает отфильтрованный список локаций с расстояниями
-
-        Args:
-            exclude_ids: ID локаций для исключения
-            tags: список тегов для фильтрации
-            coordinates: (lat, lng) координаты центра поиска
-            radius_km: радиус поиска в километрах
+        Колода свайпов: только поля карточки (LocationCandidate) и distance_km, без ORM-объектов
 
-        Returns:
-            list[tuple[Location, float | None]]: Список кортежей (локация, расстояние в км)
+        Уже просмотренные пользователем локации отсекаются подзапросом к location_swipe_users
+        в той же SQL-команде (не к swipes: архивированные месяцы не возвращаются в колоду),
+        лимит применяется в БД. Без координат порядок не задаётся: сортировка (в том числе
+        случайная) заставила бы БД перебрать все непросмотренные локации ради первых limit.
         """
-        # Начинаем с базового запроса
-        query = select(Location)
-
-        # Применяем базовые фильтры
-        conditions = []
+        swiped = select(LocationSwipeUser.location_id).where(LocationSwipeUser.user_id == user_id)
+        conditions = [*self._filter_conditions(tags), Location.id.notin_(swiped)]
+        query = select(*CANDIDATE_COLUMNS).where(*conditions).limit(limit)
 
-        # Исключаем локации по ID
-        if exclude_ids:
-            conditions.append(Location.id.notin_(exclude_ids))
-
-        # Фильтруем по тегам
-        if tags:
-            # Для поиска локаций с хотя бы одним из тегов
-            # В SQLite используем проверку наличия строки в JSON через cast в String
-            tag_conditions = []
-            for tag in tags:
-                # Проверяем наличие тега в JSON массиве
-                tag_conditions.append(cast(Location.tags, String).contains(f'"{tag}"'))
-            conditions.append(or_(*tag_conditions))
-
-        # Применяем базовые условия
-        if conditions:
-            query = query.where(and_(*conditions))
-
-        # Если нет координат, просто возвращаем отфильтрованные локации
         if not coordinates:
-            query = query.order_by(func.random())
-            result = await self.session.execute(query)
-            return [(row, None) for row in result.scalars().all()]
+            query = query.add_columns(null().label("distance_km"))
+        else:
+            query, distance = self._nearby(query, coordinates, radius_km)
+            query = query.add_columns(distance.label("distance_km"))
 
-        # Если есть координаты, добавляем расчет расстояния
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    def _nearby(
+        self, query: Select, coordinates: tuple[float, float], radius_km: float
+    ) -> tuple[Select, ColumnElement[float]]:
+        """Ограничивает запрос радиусом и сортирует по расстоянию; возвращает запрос и расстояние в км"""
         lat, lng = coordinates
+
+        if self.use_postgis and self._is_postgresql:
+            # ST_DWithin и KNN-оператор <-> используют GiST-индекс по locations.geog
+            point = func.geography(func.ST_SetSRID(func.ST_MakePoint(lng, lat), 4326))
+            distance = (func.ST_Distance(LOCATION_GEOG, point) / 1000).label("distance")
+            query = query.where(func.ST_DWithin(LOCATION_GEOG, point, radius_km * 1000)).order_by(
+                LOCATION_GEOG.op("<->")(point)
+            )
+            return query, distance
+
         radius_earth_km = 6371.0  # Радиус Земли в км
 
         # Конвертируем координаты в радианы
@@ -107,29 +139,56 @@ class LocationRepository:
         c = 2 * func.asin(func.sqrt(a))
         distance = (radius_earth_km * c).label("distance")
 
-        # Добавляем расчет расстояния к основному запросу
-        query = (
-            select(Location, distance)
-            .where(and_(*conditions) if conditions else True)
-            .where(distance <= radius_km)
-            .order_by(distance)
-        )
+        return query.where(distance <= radius_km).order_by(distance), distance
 
-        result = await self.session.execute(query)
-        locations = result.all()
-        return [(location[0], location[1]) for location in locations]
+    @property
+    def _is_postgresql(self) -> bool:
+        return self.session.bind.dialect.name == "postgresql"
+
+    def _filter_conditions(self, tags: list[str] | None) -> list:
+        conditions = []
+
+        # Фильтруем по тегам: локации с хотя бы одним из тегов
+        if tags:
+            if self._is_postgresql:
+                # tags ?| array[...] использует GIN-индекс ix_locations_tags
+                conditions.append(type_coerce(Location.tags, JSONB).has_any(literal(tags, ARRAY(String))))
+            else:
+                # В SQLite используем проверку наличия строки в JSON через cast в String
+                conditions.append(or_(*(cast(Location.tags, String).contains(f'"{tag}"') for tag in tags)))
+
+        return conditions
 
     async def get_many(self, skip: int = 0, limit: int = 100, category: str | None = None) -> list[Location]:
         """Получает список локаций с пагинацией и фильтрацией по категории"""
-        query = select(Location).options(selectinload(Location.photos))
+        query = self._page_query(select(Location), skip, limit, category).options(selectinload(Location.photos))
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def get_page_versions(
+        self, skip: int = 0, limit: int = 100, category: str | None = None
+    ) -> list[tuple[UUID, int]]:
+        """(id, version) локаций той же страницы, что и get_many, без загрузки объектов и фотографий"""
+        query = self._page_query(select(Location.id, Location.version), skip, limit, category)
+        result = await self.session.execute(query)
+        return [(row.id, row.version) for row in result.all()]
+
+    async def get_version(self, location_id: UUID) -> int | None:
+        """Текущая версия локации (None, если локации нет)"""
+        result = await self.session.execute(select(Location.version).where(Location.id == location_id))
+        return result.scalar_one_or_none()
 
+    def _page_query(self, query: Select, skip: int, limit: int, category: str | None) -> Select:
         if category:
-            # В SQLite используем проверку наличия строки в JSON через cast в String
-            query = query.where(cast(Location.categories, String).contains(f'"{category}"'))
+            if self._is_postgresql:
+                # categories @> '["..."]' использует GIN-индекс ix_locations_categories
+                query = query.where(type_coerce(Location.categories, JSONB).contains([category]))
+            else:
+                # В SQLite используем проверку наличия строки в JSON через cast в String
+                query = query.where(cast(Location.categories, String).contains(f'"{category}"'))
 
-        query = query.offset(skip).limit(limit)
-        result = await self.session.execute(query)
-        return list(result.scalars().all())
+        # Стабильный порядок: страница и её валидатор (get_page_versions) должны совпадать по составу
+        return query.order_by(Location.created_at, Location.id).offset(skip).limit(limit)
 
     async def update(self, location: Location, update_data: dict) -> Location:
         """Обновляет данные локации"""
@@ -138,6 +197,10 @@ class LocationRepository:
                 setattr(location, key, value)
         return location
 
+    async def touch(self, location: Location) -> None:
+        """Помечает локацию изменённой (например, при правке фотографий), чтобы увеличилась её версия"""
+        location.updated_at = datetime.now()
+
     async def update_photo(self, photo: Photo) -> Photo:
         """Обновляет данные фотографии"""
         self.session.add(photo)
@@ -1,13 +1,44 @@
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import Bundle, selectinload
 
 from src.core.types import SwipeAction
+from src.models.location import Location
 from src.models.swipe import Swipe
 
 
+class LocationCardBundle(Bundle):
+    """Проекция карточки локации; для свайпов без локации возвращает None вместо пустой строки"""
+
+    def create_row_processor(self, query: Select, procs: list, labels: list[str]) -> Any:  # noqa: ANN401
+        make_row = super().create_row_processor(query, procs, labels)
+
+        def proc(row: Row) -> Row | None:
+            card = make_row(row)
+            return card if card.id is not None else None
+
+        return proc
+
+
+location_card = LocationCardBundle(
+    "location",
+    Location.id,
+    Location.name,
+    Location.description,
+    Location.tags,
+    Location.address,
+    Location.rating,
+    Location.working_hours,
+    Location.latitude,
+    Location.longitude,
+)
+
+
 class SwipeRepository:
     def __init__(self, session: AsyncSession) -> None:
         self.session = session
@@ -19,18 +50,107 @@ class SwipeRepository:
         return swipe
 
     async def get_user_swipes(
-        self, user_id: UUID, limit: int = 20, offset: int = 0, action_filter: SwipeAction | None = None
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        offset: int = 0,
+        action_filter: SwipeAction | None = None,
+        cursor: tuple[datetime, UUID] | None = None,
+        window: tuple[datetime, datetime] | None = None,
     ) -> list[Swipe]:
-        query = select(Swipe).where(Swipe.user_id == user_id).options(selectinload(Swipe.location))
+        """
+        Получает историю свайпов пользователя в виде ORM-объектов с полными локациями
 
-        if action_filter:
-            query = query.where(Swipe.action == action_filter)
-
-        query = query.order_by(Swipe.created_at.desc()).offset(offset).limit(limit)
+        Args:
+            cursor: позиция (created_at, id) последнего свайпа предыдущей страницы.
+                Если передан, offset игнорируется (keyset-пагинация по индексу)
+            window: границы created_at [since, until); в PostgreSQL отсекают лишние партиции
+        """
+        query = select(Swipe).options(selectinload(Swipe.location))
+        query = self._paginate_history(query, user_id, limit, offset, action_filter, cursor, window)
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
-    async def get_swiped_location_ids(self, user_id: UUID) -> list[UUID]:
-        query = select(Swipe.location_id).where(Swipe.user_id == user_id)
+    async def get_user_history(
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        offset: int = 0,
+        action_filter: SwipeAction | None = None,
+        cursor: tuple[datetime, UUID] | None = None,
+        window: tuple[datetime, datetime] | None = None,
+    ) -> list[Row]:
+        """
+        Получает историю свайпов одним запросом: поля свайпа и карточку локации (row.location)
+        без загрузки полных ORM-объектов; cursor и window — как у get_user_swipes
+        """
+        query = select(
+            Swipe.id,
+            Swipe.user_id,
+            Swipe.location_id,
+            Swipe.action,
+            Swipe.created_at,
+            location_card,
+        ).outerjoin(Location, Location.id == Swipe.location_id)
+        query = self._paginate_history(query, user_id, limit, offset, action_filter, cursor, window)
         result = await self.session.execute(query)
-        return [row[0] for row in result]
+        return list(result.all())
+
+    async def stream_all(
+        self,
+        since: datetime | None = None,
+        since_id: UUID | None = None,
+        include_tags: bool = False,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Потоково отдаёт все свайпы по возрастанию (created_at, id) пачками через серверный курсор
+
+        Args:
+            since: отдавать свайпы новее этой отметки (не включительно)
+            since_id: id последнего выгруженного свайпа с created_at == since, для точного продолжения
+            include_tags: добавить теги локации (row.tags)
+        """
+        columns = [Swipe.id, Swipe.user_id, Swipe.location_id, Swipe.action, Swipe.created_at]
+        if include_tags:
+            columns.append(Location.tags)
+
+        query = select(*columns)
+        if include_tags:
+            query = query.outerjoin(Location, Location.id == Swipe.location_id)
+
+        if since and since_id:
+            query = query.where(tuple_(Swipe.created_at, Swipe.id) > tuple_(since, since_id))
+        elif since:
+            query = query.where(Swipe.created_at > since)
+
+        query = query.order_by(Swipe.created_at, Swipe.id).execution_options(yield_per=batch_size)
+        result = await self.session.stream(query)
+        async for batch in result.partitions():
+            yield batch
+
+    @staticmethod
+    def _paginate_history(
+        query: Select,
+        user_id: UUID,
+        limit: int,
+        offset: int,
+        action_filter: SwipeAction | None,
+        cursor: tuple[datetime, UUID] | None,
+        window: tuple[datetime, datetime] | None = None,
+    ) -> Select:
+        query = query.where(Swipe.user_id == user_id)
+
+        if window:
+            since, until = window
+            query = query.where(Swipe.created_at >= since, Swipe.created_at < until)
+
+        if action_filter:
+            query = query.where(Swipe.action == action_filter)
+
+        if cursor:
+            query = query.where(tuple_(Swipe.created_at, Swipe.id) < tuple_(*cursor))
+        elif offset:
+            query = query.offset(offset)
+
+        return query.order_by(Swipe.created_at.desc(), Swipe.id.desc()).limit(limit)
@@ -0,0 +1,114 @@
+from datetime import date
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import Insert, Table, delete, func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.types import SwipeAction
+from src.models.swipe import DailySwipeStats, DailySwipeUser, LocationSwipeStats, LocationSwipeUser
+
+ACTION_COUNTERS: dict[SwipeAction, str] = {
+    SwipeAction.LIKE: "likes",
+    SwipeAction.DISLIKE: "dislikes",
+    SwipeAction.HIDE: "hides",
+}
+
+
+class SwipeStatsRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def record_swipe(
+        self,
+        location_id: UUID,
+        user_id: UUID,
+        action: SwipeAction,
+        day: date | None = None,
+    ) -> None:
+        """
+        Инкрементирует счётчики локации и дня в текущей транзакции (без commit)
+
+        Уникальность пользователя решает вставка в location_swipe_users / daily_swipe_users
+        с ON CONFLICT DO NOTHING: из параллельных первых свайпов строку вставит только один,
+        остальные дождутся его коммита на уникальном ключе и увидят конфликт.
+
+        Args:
+            day: день для дневных счётчиков; по умолчанию CURRENT_DATE базы — те же часы,
+                что у swipes.created_at (now()), а не часы приложения
+        """
+        day = day if day is not None else func.current_date()
+        counter = ACTION_COUNTERS[action]
+        is_new_location_user = await self._mark_seen(
+            LocationSwipeUser, {"location_id": location_id, "user_id": user_id}
+        )
+        is_new_day_user = await self._mark_seen(DailySwipeUser, {"day": day, "user_id": user_id})
+        await self._increment(
+            LocationSwipeStats,
+            {"location_id": location_id},
+            {counter: 1, "unique_users": int(is_new_location_user)},
+        )
+        await self._increment(
+            DailySwipeStats,
+            {"day": day},
+            {counter: 1, "unique_users": int(is_new_day_user)},
+        )
+
+    async def get_location_stats(self, location_id: UUID) -> LocationSwipeStats | None:
+        result = await self.session.execute(
+            select(LocationSwipeStats).where(LocationSwipeStats.location_id == location_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_top_locations(
+        self, order_by: str = "likes", limit: int = 50, offset: int = 0
+    ) -> list[LocationSwipeStats]:
+        query = (
+            select(LocationSwipeStats)
+            .order_by(getattr(LocationSwipeStats, order_by).desc(), LocationSwipeStats.location_id)
+            .offset(offset)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def get_daily(self, date_from: date | None = None, date_to: date | None = None) -> list[DailySwipeStats]:
+        query = select(DailySwipeStats)
+        if date_from:
+            query = query.where(DailySwipeStats.day >= date_from)
+        if date_to:
+            query = query.where(DailySwipeStats.day <= date_to)
+
+        result = await self.session.execute(query.order_by(DailySwipeStats.day))
+        return list(result.scalars().all())
+
+    async def prune_daily_users(self, before: date) -> int:
+        """Удаляет отметки daily_swipe_users за дни раньше before: новые свайпы туда уже не попадут"""
+        result = await self.session.execute(delete(DailySwipeUser).where(DailySwipeUser.day < before))
+        await self.session.commit()
+        return result.rowcount
+
+    async def _mark_seen(self, model: type, key: dict[str, Any]) -> bool:
+        """INSERT ... ON CONFLICT DO NOTHING RETURNING: True, если строка вставлена этим вызовом"""
+        table = model.__table__
+        statement = self._insert(table).values(**key).on_conflict_do_nothing().returning(table.c.user_id)
+        result = await self.session.execute(statement)
+        return result.first() is not None
+
+    def _insert(self, table: Table) -> Insert:
+        return (postgresql_insert if self.session.bind.dialect.name == "postgresql" else sqlite_insert)(table)
+
+    async def _increment(self, model: type, key: dict, increments: dict[str, int]) -> None:
+        """Атомарный upsert: вставляет строку счётчиков или прибавляет значения к существующей"""
+        table = model.__table__
+        statement = self._insert(table).values(**key, **increments)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(key),
+            set_={
+                **{column: table.c[column] + statement.excluded[column] for column in increments},
+                "updated_at": func.now(),
+            },
+        )
+        await self.session.execute(statement)
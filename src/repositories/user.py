@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import PhoneVerification, User
@@ -26,7 +26,10 @@ class UserRepository:
         return user
 
     async def update(self, user: User) -> User:
-        self.session.add(user)
+        # merge, а не add: пользователь может прийти из кеша отсоединённым от сессии
+        user = await self.session.merge(user)
+        # Инкремент в самом UPDATE: версии растут в порядке коммитов даже у параллельных правок
+        user.version = User.version + 1
         await self.session.commit()
         await self.session.refresh(user)
         return user
@@ -48,3 +51,12 @@ class UserRepository:
     async def delete_verification(self, verification: PhoneVerification) -> None:
         await self.session.delete(verification)
         await self.session.commit()
+
+    async def delete_expired_verifications(self, before: datetime, limit: int) -> int:
+        """Удаляет не более limit кодов, истёкших до before; возвращает число удалённых"""
+        expired_ids = (
+            select(PhoneVerification.id).where(PhoneVerification.expires_at < before).limit(limit).scalar_subquery()
+        )
+        result = await self.session.execute(delete(PhoneVerification).where(PhoneVerification.id.in_(expired_ids)))
+        await self.session.commit()
+        return result.rowcount
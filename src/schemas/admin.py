@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class DatabasePoolStatusResponse(BaseModel):
+    pool_class: str
+    size: int | None = None
+    max_overflow: int | None = None
+    checked_out: int | None = None
+    checked_in: int | None = None
+    overflow: int | None = None
+    utilization: float | None = None
+    checkouts: int | None = None
+    timeouts: int | None = None
+    wait_avg_ms: float | None = None
+    wait_max_ms: float | None = None
+    wait_histogram: dict[str, int] | None = None
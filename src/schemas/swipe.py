@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field, computed_field
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
 
 from src.core.types import SwipeAction
 
@@ -30,6 +30,11 @@ class LocationCandidate(BaseModel):
     def coordinates(self) -> Coordinates:
         return Coordinates(lat=self.latitude, lng=self.longitude)
 
+    @field_validator("distance_km")
+    @classmethod
+    def round_distance(cls, value: float | None) -> float | None:
+        return round(value, 1) if value is not None else None
+
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -51,3 +56,23 @@ class SwipeHistoryItem(BaseModel):
     location: LocationCandidate | None = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class LocationSwipeStatsResponse(BaseModel):
+    location_id: UUID
+    likes: int
+    dislikes: int
+    hides: int
+    unique_users: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DailySwipeStatsResponse(BaseModel):
+    day: date
+    likes: int
+    dislikes: int
+    hides: int
+    unique_users: int
+
+    model_config = ConfigDict(from_attributes=True)
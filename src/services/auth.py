@@ -1,13 +1,20 @@
+import logging
 import random
 from datetime import datetime, timedelta
+from typing import Any
 from uuid import UUID
 
-from jose import JWTError, jwt
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.exceptions import InvalidVerificationCodeError, UserNotFoundError
+from src.core.jwt import InvalidTokenError, JWTBackend, PyJWTBackend, VerifiedTokenCache
 from src.models import PhoneVerification, User
 from src.repositories.user import UserRepository
+from src.services.user_cache import UserCache
+from src.services.verification_store import VerificationStore
+
+logger = logging.getLogger(__name__)
 
 
 class AuthService:
@@ -17,34 +24,41 @@ class AuthService:
         secret_key: str,
         algorithm: str,
         token_expire_days: int,
+        user_cache: UserCache | None = None,
+        verification_store: VerificationStore | None = None,
+        audit_verifications: bool = False,
+        verification_ttl_seconds: int = 300,
+        token_cache: VerifiedTokenCache | None = None,
+        jwt_backend: JWTBackend | None = None,
     ) -> None:
         self.user_repo = UserRepository(session)
         self.secret_key = secret_key
         self.algorithm = algorithm
         self.token_expire_days = token_expire_days
+        self.user_cache = user_cache
+        # Без хранилища коды живут в таблице phone_verifications, с ним таблица — только журнал
+        self.verification_store = verification_store
+        self.audit_verifications = audit_verifications
+        self.verification_ttl_seconds = verification_ttl_seconds
+        self.token_cache = token_cache
+        self.jwt_backend = jwt_backend or PyJWTBackend(secret_key, algorithm)
 
     async def send_verification_code(self, phone_number: str) -> None:
         # В реальном приложении здесь будет интеграция с сервисом отправки SMS
         code = "".join([str(random.randint(0, 9)) for _ in range(4)])
-        verification = PhoneVerification(
-            phone_number=phone_number,
-            code=code,
-            expires_at=datetime.now() + timedelta(minutes=5),
-        )
-        await self.user_repo.create_verification(verification)
+        stored = await self._save_code(phone_number, code)
+
+        if not stored or self.audit_verifications:
+            verification = PhoneVerification(
+                phone_number=phone_number,
+                code=code,
+                expires_at=datetime.now() + timedelta(seconds=self.verification_ttl_seconds),
+            )
+            await self.user_repo.create_verification(verification)
         print(f"Verification code for {phone_number}: {code}")  # Для тестирования
 
     async def verify_code(self, phone_number: str, code: str) -> str:
-        verifications = await self.user_repo.get_verifications(phone_number)
-
-        # Проверяем все активные коды
-        verification = None
-        for v in verifications:
-            if v.code == code:
-                verification = v
-                break
-
-        if not verification:
+        if not await self._check_code(phone_number, code):
             raise InvalidVerificationCodeError()
 
         user = await self.user_repo.get_by_phone(phone_number)
@@ -61,23 +75,77 @@ class AuthService:
 
         return self.create_access_token({"sub": str(user.id)})
 
+    async def _save_code(self, phone_number: str, code: str) -> bool:
+        """Кладёт код в хранилище; False — хранилища нет или Redis недоступен, и код нужно записать в таблицу"""
+        if self.verification_store is None:
+            return False
+
+        try:
+            await self.verification_store.save(phone_number, code, self.verification_ttl_seconds)
+        except RedisError as e:
+            logger.warning(f"Коды верификации: Redis недоступен, код записан в phone_verifications: {e!s}")
+            return False
+        return True
+
+    async def _check_code(self, phone_number: str, code: str) -> bool:
+        if self.verification_store is not None:
+            try:
+                return await self.verification_store.check_and_consume(phone_number, code)
+            except RedisError as e:
+                logger.warning(f"Коды верификации: Redis недоступен, проверяем по phone_verifications: {e!s}")
+                # Таблица может быть и журналом уже погашенных в Redis кодов: совпавший код удаляем,
+                # чтобы его нельзя было предъявить повторно
+                verification = await self._find_verification(phone_number, code)
+                if verification is None:
+                    return False
+                await self.user_repo.delete_verification(verification)
+                return True
+
+        # Проверяем все активные коды
+        return await self._find_verification(phone_number, code) is not None
+
+    async def _find_verification(self, phone_number: str, code: str) -> PhoneVerification | None:
+        verifications = await self.user_repo.get_verifications(phone_number)
+        return next((v for v in verifications if v.code == code), None)
+
     def create_access_token(self, data: dict) -> str:
         to_encode = data.copy()
         expire = datetime.now() + timedelta(days=self.token_expire_days)
         to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
+        return self.jwt_backend.encode(to_encode)
 
     async def get_current_user(self, token: str) -> User:
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = self._decode_token(token)
             user_id = payload.get("sub")
             if user_id is None:
                 raise UserNotFoundError()
-        except JWTError:
+        except InvalidTokenError:
             raise UserNotFoundError()
 
-        user = await self.user_repo.get_by_id(UUID(user_id))
+        user = await self._get_user(UUID(user_id))
         if user is None:
             raise UserNotFoundError()
 
         return user
+
+    def _decode_token(self, token: str) -> dict[str, Any]:
+        if self.token_cache is None:
+            return self.jwt_backend.decode(token)
+
+        payload = self.token_cache.get(token)
+        if payload is None:
+            payload = self.jwt_backend.decode(token)
+            self.token_cache.set(token, payload)
+        return payload
+
+    async def _get_user(self, user_id: UUID) -> User | None:
+        if self.user_cache is None:
+            return await self.user_repo.get_by_id(user_id)
+
+        user = await self.user_cache.get(user_id)
+        if user is None:
+            user = await self.user_repo.get_by_id(user_id)
+            if user is not None:
+                await self.user_cache.set(user)
+        return user
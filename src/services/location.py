@@ -3,20 +3,29 @@ from uuid import UUID, uuid4
 
 from fastapi import UploadFile, status
 from pydantic import HttpUrl
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.exceptions import InvalidLocationDataError, LocationNotFoundError, PhotoNotFoundError
 from src.models.location import Location, Photo
 from src.repositories.location import LocationRepository
 from src.services.file_storage import LocalFileStorage
+from src.services.location_cache import LocationCache
 
 logger = logging.getLogger(__name__)
 
 
 class LocationService:
-    def __init__(self, session: AsyncSession, base_url: str) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        base_url: str,
+        use_postgis: bool = False,
+        location_cache: LocationCache | None = None,
+    ) -> None:
         self.session = session
-        self.repository = LocationRepository(session)
+        self.repository = LocationRepository(session, use_postgis=use_postgis)
+        self.location_cache = location_cache
         self.file_storage = LocalFileStorage()
         self.base_url = base_url.rstrip("")  # Убираем trailing slash если есть
 
@@ -60,15 +69,34 @@ class LocationService:
             raise InvalidLocationDataError(detail=str(e))
 
     async def get_location(self, location_id: str) -> Location | None:
-        location = await self.repository.get_by_id(UUID(location_id))
+        """Локация с фотографиями для чтения: из кеша, если он подключён (объект отсоединён от сессии)"""
+        location = await self.get_location_by_id(UUID(location_id))
         if not location:
             raise LocationNotFoundError()
         return location
 
+    async def get_location_version(self, location_id: str) -> int:
+        """Версия локации для условных запросов, без загрузки самой локации"""
+        if self.location_cache is not None:
+            cached = await self.location_cache.get(UUID(location_id))
+            if cached is not None:
+                return cached.version
+
+        version = await self.repository.get_version(UUID(location_id))
+        if version is None:
+            raise LocationNotFoundError()
+        return version
+
     async def get_locations(self, skip: int = 0, limit: int = 100, category: str | None = None) -> list[Location]:
         """Получает список локаций"""
         return await self.repository.get_many(skip, limit, category)
 
+    async def get_locations_versions(
+        self, skip: int = 0, limit: int = 100, category: str | None = None
+    ) -> list[tuple[UUID, int]]:
+        """(id, version) локаций страницы get_locations с теми же параметрами"""
+        return await self.repository.get_page_versions(skip, limit, category)
+
     async def update_location(
         self,
         location_id: str,
@@ -107,6 +135,7 @@ class LocationService:
             location = await self.repository.update(location, update_data)
             await self.repository.commit()
             # await self.repository.refresh(location)
+            await self._replace_cached(location)
             return location
 
         except LocationNotFoundError:
@@ -119,7 +148,7 @@ class LocationService:
     async def delete_location(self, location_id: str) -> None:
         """Удаляет локацию и все её фотографии"""
         try:
-            location = await self.get_location(location_id)
+            location = await self._get_for_update(location_id)
 
             # Удаляем все фото
             for photo in location.photos:
@@ -128,8 +157,11 @@ class LocationService:
                 except Exception as e:
                     logger.error(f"Ошибка при удалении файла {photo.id}: {e!s}")
 
+            version = location.version
             await self.repository.delete(location)
             await self.session.commit()
+            if self.location_cache is not None:
+                await self.location_cache.delete(location.id, version)
 
         except LocationNotFoundError:
             raise
@@ -144,7 +176,7 @@ class LocationService:
             raise InvalidLocationDataError("Список файлов пуст")
 
         try:
-            location = await self.get_location(location_id)
+            location = await self._get_for_update(location_id)
 
             # Получаем максимальный order существующих фото
             max_order = max((photo.order for photo in location.photos), default=0)
@@ -163,8 +195,10 @@ class LocationService:
                     saved_files.append((location_id, str(photo_id)))
 
                 location.photos.extend(new_photos)
+                await self.repository.touch(location)
                 await self.session.commit()
                 # await self.session.refresh(location)
+                await self._replace_cached(location)
                 return location
 
             except Exception as e:
@@ -185,7 +219,7 @@ class LocationService:
     async def delete_location_photo(self, location_id: str, photo_id: str) -> Location:
         """Удаляет фотографию из локации"""
         try:
-            location = await self.get_location(location_id)
+            location = await self._get_for_update(location_id)
 
             # Находим фото для удаления
             photo_to_delete = None
@@ -209,8 +243,10 @@ class LocationService:
                 if photo.order > deleted_order:
                     photo.order -= 1
 
+            await self.repository.touch(location)
             await self.session.commit()
             # await self.session.refresh(location)
+            await self._replace_cached(location)
             return location
 
         except (LocationNotFoundError, PhotoNotFoundError):
@@ -228,7 +264,7 @@ class LocationService:
     ) -> Location:
         """Обновляет подпись к фотографии"""
         try:
-            location = await self.get_location(location_id)
+            location = await self._get_for_update(location_id)
 
             photo = next((p for p in location.photos if str(p.id) == photo_id), None)
             if not photo:
@@ -241,8 +277,10 @@ class LocationService:
             photo.caption = caption
             photo.order = current_order  # Явно устанавливаем порядок обратно
 
+            await self.repository.touch(location)
             await self.session.commit()
             # await self.session.refresh(location)
+            await self._replace_cached(location)
             return location
 
         except (LocationNotFoundError, PhotoNotFoundError):
@@ -259,7 +297,7 @@ class LocationService:
     ) -> Location:
         """Изменяет порядок фотографий"""
         try:
-            location = await self.get_location(location_id)
+            location = await self._get_for_update(location_id)
 
             if not photo_order:
                 raise InvalidLocationDataError("Список photo_order не может быть пустым")
@@ -282,8 +320,10 @@ class LocationService:
                 photo.order = new_order
                 await self.repository.update_photo(photo)
 
+            await self.repository.touch(location)
             await self.repository.commit()
             # await self.repository.refresh(location)
+            await self._replace_cached(location)
             return location
 
         except (LocationNotFoundError, PhotoNotFoundError, InvalidLocationDataError):
@@ -295,35 +335,66 @@ class LocationService:
             raise InvalidLocationDataError(detail="Ошибка при изменении порядка фотографий")
 
     async def get_location_by_id(self, location_id: UUID) -> Location | None:
-        """Получает локацию по ID"""
-        return await self.repository.get_by_id(location_id)
+        """Получает локацию по ID (read-through через кеш локаций)"""
+        if self.location_cache is None:
+            return await self.repository.get_by_id(location_id)
+
+        location = await self.location_cache.get(location_id)
+        if location is None:
+            location = await self.repository.get_by_id(location_id)
+            if location is not None:
+                await self.location_cache.set(location)
+        return location
+
+    async def location_exists(self, location_id: UUID) -> bool:
+        """
+        Проверка существования без загрузки фотографий
+
+        Всегда по БД своей сессии, а не по кешу: перед записью (свайпом) проверка должна идти
+        в primary, кеш и реплика могут ещё помнить только что удалённую локацию.
+        """
+        return await self.repository.get_version(location_id) is not None
 
     async def get_locations_by_ids(self, location_ids: list[UUID]) -> list[Location]:
-        """Получает информацию о нескольких локациях по их ID"""
+        """
+        Локации с фотографиями в порядке location_ids; несуществующие ID пропускаются
+
+        Закешированные локации берутся из кеша, остальные загружаются двумя запросами
+        (локации и фотографии) независимо от их количества.
+        """
         if not location_ids:
             return []
 
-        return await self.repository.get_by_ids(location_ids)
+        found = await self.location_cache.get_many(location_ids) if self.location_cache is not None else {}
+        missing = [location_id for location_id in dict.fromkeys(location_ids) if location_id not in found]
+        if missing:
+            loaded = await self.repository.get_by_ids(missing)
+            if self.location_cache is not None:
+                await self.location_cache.set_many(loaded)
+            found.update((location.id, location) for location in loaded)
+
+        return [found[location_id] for location_id in location_ids if location_id in found]
+
+    async def _get_for_update(self, location_id: str) -> Location:
+        """Локация из текущей сессии: закешированные объекты отсоединены и для изменений не годятся"""
+        location = await self.repository.get_by_id(UUID(location_id))
+        if not location:
+            raise LocationNotFoundError()
+        return location
+
+    async def _replace_cached(self, location: Location) -> None:
+        if self.location_cache is not None:
+            await self.location_cache.replace(location)
 
-    async def get_filtered_locations(
+    async def get_candidate_cards(
         self,
-        exclude_ids: list[UUID] | None = None,
+        user_id: UUID,
         tags: list[str] | None = None,
         coordinates: tuple[float, float] | None = None,
         radius_km: float = 5.0,
-    ) -> list[tuple[Location, float | None]]:
-        """
-        Получает отфильтрованный список локаций
-
-        Args:
-            exclude_ids: ID локаций, которые нужно исключить
-            tags: список тегов для фильтрации
-            coordinates: (lat, lng) координаты центра поиска
-            radius_km: радиус поиска в километрах
-
-        Returns:
-            list[tuple[Location, float | None]]: Список кортежей (локация, расстояние в км)
-        """
-        return await self.repository.get_filtered(
-            exclude_ids=exclude_ids, tags=tags, coordinates=coordinates, radius_km=radius_km
-        )
\ No newline at end of file
+        limit: int = 10,
+    ) -> list[Row]:
+        """Карточки локаций, которые пользователь ещё не свайпал (только поля LocationCandidate)"""
+        return await self.repository.get_candidates(
+            user_id=user_id, tags=tags, coordinates=coordinates, radius_km=radius_km, limit=limit
+        )
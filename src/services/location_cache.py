@@ -0,0 +1,97 @@
+import json
+from uuid import UUID
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.core.cache import TwoTierCache
+from src.models.location import Location, Photo
+
+# Поля LocationResponse (и version для ETag); created_at/updated_at в ответы не попадают
+LOCATION_FIELDS = (
+    "name",
+    "latitude",
+    "longitude",
+    "categories",
+    "tags",
+    "instagram_url",
+    "working_hours",
+    "address",
+    "maps_url",
+    "description",
+    "rating",
+    "version",
+)
+PHOTO_FIELDS = ("photo_url", "caption", "order")
+
+
+class LocationCache:
+    """
+    Кеш локаций с фотографиями по id поверх двухуровневого кеша
+
+    Хранит то, из чего строится LocationResponse, поэтому карточка, страница редактирования
+    и проверка локации при свайпе не ходят в БД. Возвращаемые объекты отсоединены от сессии:
+    их можно только читать, для изменений локацию нужно загрузить из БД.
+    """
+
+    def __init__(self, cache: TwoTierCache) -> None:
+        self.cache = cache
+
+    async def get(self, location_id: UUID) -> Location | None:
+        payload = await self.cache.get(str(location_id))
+        if payload is None:
+            return None
+        return self._load(location_id, json.loads(payload))
+
+    async def get_many(self, location_ids: list[UUID]) -> dict[UUID, Location]:
+        payloads = await self.cache.get_many([str(location_id) for location_id in location_ids])
+        return {UUID(key): self._load(UUID(key), json.loads(payload)) for key, payload in payloads.items()}
+
+    async def set(self, location: Location) -> None:
+        await self.cache.set(str(location.id), self._dump(location), version=location.version)
+
+    async def set_many(self, locations: list[Location]) -> None:
+        await self.cache.set_many(
+            {str(location.id): self._dump(location) for location in locations},
+            versions={str(location.id): location.version for location in locations},
+        )
+
+    async def invalidate(self, location_id: UUID) -> None:
+        await self.cache.invalidate(str(location_id))
+
+    async def delete(self, location_id: UUID, version: int) -> None:
+        """Удалённая локация: version — последняя версия, все заполнения с ней и старше отвергаются"""
+        await self.cache.delete(str(location_id), version + 1)
+
+    async def replace(self, location: Location) -> None:
+        """
+        Кладёт новое состояние после записи и сбрасывает локальные копии в остальных воркерах
+
+        Все заполнения кеша условные по version, поэтому старая версия, прочитанная с отстающей
+        реплики до или после этой записи, не заменит новую. Ключ в Redis не удаляется: иначе
+        в промежутке до записи старое заполнение успело бы попасть в локальные копии воркеров.
+        """
+        await self.set(location)
+        await self.cache.broadcast_invalidation(str(location.id))
+
+    @staticmethod
+    def _dump(location: Location) -> bytes:
+        data = {field: getattr(location, field) for field in LOCATION_FIELDS}
+        # После reorder_photos список в памяти ещё в старом порядке, из БД он читается по order
+        data["photos"] = [
+            {"id": str(photo.id), **{field: getattr(photo, field) for field in PHOTO_FIELDS}}
+            for photo in sorted(location.photos, key=lambda photo: photo.order)
+        ]
+        return json.dumps(data).encode()
+
+    @staticmethod
+    def _load(location_id: UUID, data: dict) -> Location:
+        photos = [
+            Photo(id=UUID(item["id"]), location_id=location_id, **{field: item[field] for field in PHOTO_FIELDS})
+            for item in data["photos"]
+        ]
+        location = Location(id=location_id, photos=photos, **{field: data[field] for field in LOCATION_FIELDS})
+        # Как у UserCache: объекты считаются загруженными из БД, а не новыми
+        for photo in photos:
+            make_transient_to_detached(photo)
+        make_transient_to_detached(location)
+        return location
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.location import LocationRepository
+from src.repositories.swipe_stats import SwipeStatsRepository
+from src.repositories.user import UserRepository
+from src.services.swipe_partitions import SwipePartitionService
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_LOCK_KEY = "maintenance:lock"
+
+
+@dataclass
+class MaintenanceReport:
+    expired_verifications_deleted: int = 0
+    orphaned_files_deleted: int = 0
+    orphaned_bytes_reclaimed: int = 0
+    swipe_partitions_created: int = 0
+    daily_swipe_users_deleted: int = 0
+    duration_seconds: float = 0.0
+
+
+class MaintenanceService:
+    """Периодическая очистка: истёкшие коды верификации, осиротевшие файлы фото, партиции swipes, отметки дней"""
+
+    def __init__(self, session: AsyncSession, storage_path: str = "data/locations") -> None:
+        self.session = session
+        self.user_repo = UserRepository(session)
+        self.location_repo = LocationRepository(session)
+        self.storage_path = Path(storage_path)
+
+    async def purge_expired_verifications(self, batch_size: int = 1000) -> int:
+        """Удаляет истёкшие коды пачками по batch_size, чтобы не держать долгих блокировок"""
+        now = datetime.now()
+        total = 0
+        while True:
+            deleted = await self.user_repo.delete_expired_verifications(before=now, limit=batch_size)
+            total += deleted
+            if deleted < batch_size:
+                return total
+
+    async def sweep_orphaned_photos(self, min_age_seconds: float = 3600) -> tuple[int, int]:
+        """
+        Удаляет файлы фото, которых нет в таблице photos
+
+        Файлы моложе min_age_seconds не трогаем: при загрузке файл пишется до коммита строки в photos.
+        Файлы и папки с именами не в формате UUID пропускаются.
+
+        Returns:
+            tuple[int, int]: (число удалённых файлов, освобождено байт)
+        """
+        if not self.storage_path.exists():
+            return 0, 0
+
+        files_deleted = 0
+        bytes_reclaimed = 0
+        cutoff = time.time() - min_age_seconds
+
+        for location_dir in await asyncio.to_thread(self._list_dirs):
+            location_id = _parse_uuid(location_dir.name)
+            if location_id is None:
+                continue
+
+            known_ids = await self.location_repo.get_photo_ids(location_id)
+            deleted, reclaimed = await asyncio.to_thread(self._delete_orphans, location_dir, known_ids, cutoff)
+            files_deleted += deleted
+            bytes_reclaimed += reclaimed
+
+        return files_deleted, bytes_reclaimed
+
+    async def run(self, verification_batch_size: int = 1000, partitions_ahead: int = 3) -> MaintenanceReport:
+        started = time.monotonic()
+        report = MaintenanceReport()
+
+        report.expired_verifications_deleted = await self.purge_expired_verifications(verification_batch_size)
+        report.orphaned_files_deleted, report.orphaned_bytes_reclaimed = await self.sweep_orphaned_photos()
+        created = await SwipePartitionService(self.session).ensure_partitions(months_ahead=partitions_ahead)
+        report.swipe_partitions_created = len(created)
+        # Запас в день: «сегодня» считается по часам БД, а они могут расходиться с часами приложения
+        report.daily_swipe_users_deleted = await SwipeStatsRepository(self.session).prune_daily_users(
+            before=date.today() - timedelta(days=2)
+        )
+
+        report.duration_seconds = round(time.monotonic() - started, 3)
+        logger.info("Обслуживание завершено", extra={"maintenance": asdict(report)})
+        return report
+
+    def _list_dirs(self) -> list[Path]:
+        return [path for path in self.storage_path.iterdir() if path.is_dir()]
+
+    @staticmethod
+    def _delete_orphans(location_dir: Path, known_ids: set[UUID], cutoff: float) -> tuple[int, int]:
+        deleted = 0
+        reclaimed = 0
+        for file_path in location_dir.iterdir():
+            photo_id = _parse_uuid(file_path.stem)
+            if not file_path.is_file() or photo_id is None or photo_id in known_ids:
+                continue
+
+            stat = file_path.stat()
+            if stat.st_mtime > cutoff:
+                continue
+
+            file_path.unlink()
+            deleted += 1
+            reclaimed += stat.st_size
+            logger.info(f"Удалён осиротевший файл {file_path}")
+
+        if not any(location_dir.iterdir()):
+            location_dir.rmdir()
+        return deleted, reclaimed
+
+
+def _parse_uuid(value: str) -> UUID | None:
+    try:
+        return UUID(value)
+    except ValueError:
+        return None
+
+
+async def run_periodically(
+    session_factory: Callable[[], AsyncSession],
+    interval_seconds: float,
+    storage_path: str,
+    redis: Redis | None = None,
+    partitions_ahead: int = 3,
+) -> None:
+    """
+    Фоновая задача из lifespan: запускает обслуживание раз в interval_seconds
+
+    При нескольких воркерах в одном интервале обслуживание выполняет только взявший блокировку в Redis.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            if redis is not None and not await redis.set(
+                MAINTENANCE_LOCK_KEY, os.getpid(), nx=True, ex=max(1, int(interval_seconds))
+            ):
+                continue
+
+            async with session_factory() as session:
+                await MaintenanceService(session, storage_path=storage_path).run(partitions_ahead=partitions_ahead)
+        except RedisError as e:
+            logger.warning(f"Обслуживание пропущено: Redis недоступен: {e!s}")
+        except Exception as e:
+            logger.error(f"Ошибка при обслуживании: {e!s}", exc_info=True)
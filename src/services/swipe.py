@@ -1,13 +1,15 @@
+from datetime import datetime
 from uuid import UUID
 
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.exceptions import LocationNotFoundError
 from src.core.types import SwipeAction
-from src.models.location import Location
-from src.models.swipe import Swipe
 from src.repositories.swipe import SwipeRepository
+from src.repositories.swipe_stats import SwipeStatsRepository
 from src.services.location import LocationService
+from src.services.swipe_partitions import retention_window
 
 
 class SwipeService:
@@ -15,39 +17,45 @@ class SwipeService:
         self,
         session: AsyncSession,
         location_service: LocationService,
+        history_months: int | None = None,
     ) -> None:
         self.swipe_repo = SwipeRepository(session)
+        self.stats_repo = SwipeStatsRepository(session)
         self.location_service = location_service
+        # Глубина истории: столько же месяцев, сколько партиций swipes не архивируется
+        self.history_months = history_months
 
-    async def get_candidates(
+    async def get_candidate_cards(
         self,
         user_id: UUID,
         interests: list[str] | None = None,
         coordinates: tuple[float, float] | None = None,
         limit: int = 10,
-    ) -> list[tuple[Location, float | None]]:
-        # Получаем ID локаций, которые пользователь уже видел
-        swiped_ids = await self.swipe_repo.get_swiped_location_ids(user_id)
-        exclude_ids = list(set(swiped_ids))
-
-        # Получаем новых кандидатов
-        candidates = await self.location_service.get_filtered_locations(
-            exclude_ids=exclude_ids, tags=interests, coordinates=coordinates
+    ) -> list[Row]:
+        """Колода свайпов одним запросом: просмотренные локации и лимит отсекаются в БД"""
+        return await self.location_service.get_candidate_cards(
+            user_id=user_id, tags=interests, coordinates=coordinates, limit=limit
         )
 
-        return candidates[:limit]
-
     async def create_swipe(self, user_id: UUID, location_id: UUID, action: SwipeAction) -> None:
         # Проверяем существование локации
-        location = await self.location_service.get_location_by_id(location_id)
-        if not location:
+        if not await self.location_service.location_exists(location_id):
             raise LocationNotFoundError()
 
+        # Счётчики обновляются в той же транзакции, что и сам свайп
+        await self.stats_repo.record_swipe(location_id, user_id, action)
+
         await self.swipe_repo.create_swipe(user_id, location_id, action)
 
     async def get_history(
-        self, user_id: UUID, limit: int = 20, offset: int = 0, action_filter: SwipeAction | None = None
-    ) -> list[Swipe]:
-        return await self.swipe_repo.get_user_swipes(
-            user_id=user_id, limit=limit, offset=offset, action_filter=action_filter
+        self,
+        user_id: UUID,
+        limit: int = 20,
+        offset: int = 0,
+        action_filter: SwipeAction | None = None,
+        cursor: tuple[datetime, UUID] | None = None,
+    ) -> list[Row]:
+        window = retention_window(self.history_months) if self.history_months else None
+        return await self.swipe_repo.get_user_history(
+            user_id=user_id, limit=limit, offset=offset, action_filter=action_filter, cursor=cursor, window=window
         )
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.repositories.swipe import SwipeRepository
+
+EXPORT_BATCH_SIZE = 1000
+
+
+class SwipeExportService:
+    """
+    Выгрузка полного журнала свайпов для аналитики
+
+    Сессия открывается внутри генератора: ответ стримится уже после выхода из зависимостей запроса.
+    Для инкрементальной выгрузки передавайте created_at и id последней полученной строки в since/since_id.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession]) -> None:
+        self.session_factory = session_factory
+
+    async def stream_ndjson(
+        self, since: datetime | None = None, since_id: UUID | None = None, include_tags: bool = False
+    ) -> AsyncIterator[bytes]:
+        async for batch in self._stream(since, since_id, include_tags):
+            lines = (json.dumps(self._to_record(row, include_tags), ensure_ascii=False) for row in batch)
+            yield ("\n".join(lines) + "\n").encode()
+
+    async def stream_csv(
+        self, since: datetime | None = None, since_id: UUID | None = None, include_tags: bool = False
+    ) -> AsyncIterator[bytes]:
+        fields = ["id", "user_id", "location_id", "action", "created_at"]
+        if include_tags:
+            fields.append("tags")
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fields)
+        writer.writeheader()
+
+        async for batch in self._stream(since, since_id, include_tags):
+            for row in batch:
+                record = self._to_record(row, include_tags)
+                if include_tags:
+                    record["tags"] = json.dumps(record["tags"], ensure_ascii=False)
+                writer.writerow(record)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+        # Заголовок для пустой выгрузки
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+
+    async def _stream(self, since: datetime | None, since_id: UUID | None, include_tags: bool) -> AsyncIterator:
+        async with self.session_factory() as session:
+            repo = SwipeRepository(session)
+            async for batch in repo.stream_all(
+                since=since, since_id=since_id, include_tags=include_tags, batch_size=EXPORT_BATCH_SIZE
+            ):
+                yield batch
+
+    @staticmethod
+    def _to_record(row: Row, include_tags: bool) -> dict:
+        record = {
+            "id": str(row.id),
+            "user_id": str(row.user_id),
+            "location_id": str(row.location_id),
+            "action": row.action.value,
+            "created_at": row.created_at.isoformat(),
+        }
+        if include_tags:
+            record["tags"] = row.tags or []
+        return record
@@ -0,0 +1,234 @@
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+PARTITION_NAME_RE = re.compile(r"^swipes_p(\d{4})_(\d{2})$")
+SWIPES_COLUMNS = "user_id, location_id, action, id, created_at, updated_at"
+ARCHIVE_BATCH_SIZE = 10_000
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def retention_window(keep_months: int, today: date | None = None) -> tuple[datetime, datetime]:
+    """
+    Границы created_at горячих свайпов [since, until) для истории
+
+    since совпадает с границей archive_partitions, поэтому история не зависит от того, успела ли
+    пройти архивация: старше keep_months месяцев свайпы не показываются никогда. until — начало
+    месяца после следующего (запас на расхождение часов приложения и БД). Когда у всех месяцев
+    окна есть партиции, PostgreSQL отсекает и архивные месяцы, и DEFAULT-партицию.
+    """
+    current = month_start(today or date.today())
+    since, until = add_months(current, -keep_months), add_months(current, 2)
+    return datetime.combine(since, time.min), datetime.combine(until, time.min)
+
+
+def partition_name(month: date) -> str:
+    return f"swipes_p{month.year:04d}_{month.month:02d}"
+
+
+def partition_month(name: str) -> date | None:
+    match = PARTITION_NAME_RE.match(name)
+    if not match:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+@dataclass
+class ArchivedPartition:
+    name: str
+    path: Path
+    rows: int
+
+
+class SwipePartitionService:
+    """
+    Обслуживание помесячных партиций таблицы swipes (только PostgreSQL)
+
+    Горячие запросы (история с keyset-пагинацией, выборка по created_at) упорядочены по
+    created_at, поэтому планировщик читает партиции по порядку и останавливается на свежих.
+    История ограничена retention_window, а колода свайпов исключает просмотренное по
+    location_swipe_users, поэтому архивация старых партиций не меняет видимое пользователю.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    @property
+    def is_supported(self) -> bool:
+        return self.session.bind.dialect.name == "postgresql"
+
+    async def ensure_partitions(self, months_ahead: int = 3, today: date | None = None) -> list[str]:
+        """
+        Создаёт партиции на текущий и months_ahead следующих месяцев, возвращает созданные
+
+        Если обслуживание долго не запускалось, досоздаются и пропущенные месяцы после последней
+        партиции: их свайпы успели лечь в DEFAULT-партицию и переносятся в новую (см. _create_partition).
+        """
+        if not self.is_supported:
+            return []
+
+        existing = await self.list_partitions()
+        current = month_start(today or date.today())
+        first = min(current, add_months(partition_month(existing[-1]), 1)) if existing else current
+        default = await self.default_partition()
+        created = []
+
+        month = first
+        while month <= add_months(current, months_ahead):
+            name = partition_name(month)
+            if name not in existing:
+                await self._create_partition(name, month, default)
+                created.append(name)
+            month = add_months(month, 1)
+
+        await self.session.commit()
+        if created:
+            logger.info(f"Созданы партиции swipes: {', '.join(created)}")
+        return created
+
+    async def _create_partition(self, name: str, month: date, default: str | None) -> None:
+        """
+        Создаёт партицию месяца, перенося его строки из DEFAULT-партиции
+
+        PostgreSQL не даёт создать партицию, пока в DEFAULT есть строки из её диапазона,
+        поэтому DEFAULT отключается, строки переносятся и она подключается обратно — всё
+        в одной транзакции. На это время swipes заблокирована (ACCESS EXCLUSIVE).
+        """
+        bounds = f"FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        in_range = f"created_at >= '{month.isoformat()}' AND created_at < '{add_months(month, 1).isoformat()}'"
+
+        has_default_rows = default is not None and bool(
+            await self.session.scalar(text(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})"))
+        )
+        if not has_default_rows:
+            await self.session.execute(
+                text(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF swipes FOR VALUES {bounds}")
+            )
+            return
+
+        await self.session.execute(text(f"ALTER TABLE swipes DETACH PARTITION {default}"))
+        await self.session.execute(text(f"CREATE TABLE {name} PARTITION OF swipes FOR VALUES {bounds}"))
+        moved = await self.session.execute(
+            text(f"INSERT INTO {name} ({SWIPES_COLUMNS}) SELECT {SWIPES_COLUMNS} FROM {default} WHERE {in_range}")
+        )
+        await self.session.execute(text(f"DELETE FROM {default} WHERE {in_range}"))
+        await self.session.execute(text(f"ALTER TABLE swipes ATTACH PARTITION {default} DEFAULT"))
+        logger.warning(f"В {name} перенесено {moved.rowcount} строк из {default}")
+
+    async def list_partitions(self) -> list[str]:
+        """Помесячные партиции, подключённые к swipes, от старых к новым"""
+        result = await self.session.execute(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = 'swipes'::regclass"
+            )
+        )
+        return sorted(name for (name,) in result if partition_month(name))
+
+    async def default_partition(self) -> str | None:
+        """DEFAULT-партиция swipes (swipes_default из миграции), если подключена"""
+        return await self.session.scalar(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = 'swipes'::regclass "
+                "AND pg_get_expr(child.relpartbound, child.oid) = 'DEFAULT'"
+            )
+        )
+
+    async def archive_partitions(
+        self,
+        archive_path: str,
+        keep_months: int = 12,
+        drop: bool = True,
+        today: date | None = None,
+    ) -> list[ArchivedPartition]:
+        """
+        Выгружает партиции старше keep_months месяцев в Parquet и отключает их от swipes
+
+        Свайпы этих месяцев уже не попадают в историю (retention_window с тем же keep_months),
+        а просмотренные локации остаются исключёнными из колоды через location_swipe_users.
+
+        Args:
+            archive_path: директория для файлов архива
+            keep_months: сколько последних месяцев оставить в горячей таблице
+            drop: удалить отключённую партицию после успешной выгрузки
+        """
+        if not self.is_supported:
+            return []
+
+        cutoff = add_months(month_start(today or date.today()), -keep_months)
+        archived = []
+
+        for name in await self.list_partitions():
+            if partition_month(name) >= cutoff:
+                continue
+
+            path, rows = await self._export_partition(name, Path(archive_path))
+            await self.session.execute(text(f"ALTER TABLE swipes DETACH PARTITION {name}"))
+            if drop:
+                await self.session.execute(text(f"DROP TABLE {name}"))
+            await self.session.commit()
+
+            logger.info(f"Партиция {name} выгружена в {path} ({rows} строк)")
+            archived.append(ArchivedPartition(name=name, path=path, rows=rows))
+
+        return archived
+
+    async def _export_partition(self, name: str, archive_dir: Path) -> tuple[Path, int]:
+        """Потоково выгружает партицию через серверный курсор, не держа её целиком в памяти"""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Для архивации swipes нужен pyarrow: poetry install --extras archive") from e
+
+        schema = pa.schema(
+            [
+                ("id", pa.string()),
+                ("user_id", pa.string()),
+                ("location_id", pa.string()),
+                ("action", pa.string()),
+                ("created_at", pa.timestamp("us")),
+                ("updated_at", pa.timestamp("us")),
+            ]
+        )
+
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        path = archive_dir / f"{name}.parquet"
+        tmp_path = path.with_suffix(".parquet.tmp")
+        rows = 0
+
+        result = await self.session.stream(
+            text(
+                f"SELECT id::text, user_id::text, location_id::text, action::text, created_at, updated_at "
+                f"FROM {name} ORDER BY created_at, id"
+            ).execution_options(yield_per=ARCHIVE_BATCH_SIZE)
+        )
+        with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+            async for batch in result.partitions(ARCHIVE_BATCH_SIZE):
+                columns = zip(*batch, strict=True)
+                arrays = [pa.array(column, type=field.type) for column, field in zip(columns, schema, strict=True)]
+                writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+                rows += len(batch)
+
+        # Публикуем файл атомарно, только после полной записи
+        os.replace(tmp_path, path)
+        return path, rows
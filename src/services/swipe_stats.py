@@ -0,0 +1,27 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.swipe import DailySwipeStats, LocationSwipeStats
+from src.repositories.swipe_stats import SwipeStatsRepository
+
+
+class SwipeStatsService:
+    def __init__(self, session: AsyncSession) -> None:
+        self.stats_repo = SwipeStatsRepository(session)
+
+    async def get_location_stats(self, location_id: UUID) -> LocationSwipeStats:
+        stats = await self.stats_repo.get_location_stats(location_id)
+        if stats is None:
+            # По локации ещё не было свайпов
+            return LocationSwipeStats(location_id=location_id, likes=0, dislikes=0, hides=0, unique_users=0)
+        return stats
+
+    async def get_top_locations(
+        self, order_by: str = "likes", limit: int = 50, offset: int = 0
+    ) -> list[LocationSwipeStats]:
+        return await self.stats_repo.get_top_locations(order_by=order_by, limit=limit, offset=offset)
+
+    async def get_daily(self, date_from: date | None = None, date_to: date | None = None) -> list[DailySwipeStats]:
+        return await self.stats_repo.get_daily(date_from=date_from, date_to=date_to)
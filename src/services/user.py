@@ -2,11 +2,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import User
 from src.repositories.user import UserRepository
+from src.services.user_cache import UserCache
 
 
 class UserService:
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, user_cache: UserCache | None = None) -> None:
         self.user_repo = UserRepository(session)
+        self.user_cache = user_cache
 
     async def update_user(
         self,
@@ -22,4 +24,8 @@ class UserService:
         if preferences is not None:
             user.preferences = preferences
 
-        return await self.user_repo.update(user)
\ No newline at end of file
+        user = await self.user_repo.update(user)
+        if self.user_cache is not None:
+            # Сразу новое состояние, а не инвалидация: см. LocationCache.replace
+            await self.user_cache.replace(user)
+        return user
\ No newline at end of file
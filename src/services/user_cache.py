@@ -0,0 +1,57 @@
+import json
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from src.core.cache import TwoTierCache
+from src.models import User
+
+USER_FIELDS = ("phone_number", "email", "city", "is_phone_verified", "full_name", "preferences")
+
+
+class UserCache:
+    """Кеш аутентифицированных пользователей по id поверх двухуровневого кеша"""
+
+    def __init__(self, cache: TwoTierCache) -> None:
+        self.cache = cache
+
+    async def get(self, user_id: UUID) -> User | None:
+        payload = await self.cache.get(str(user_id))
+        if payload is None:
+            return None
+        return self._load(user_id, json.loads(payload))
+
+    async def set(self, user: User) -> None:
+        # Условная запись: пользователь, прочитанный до правки, не заменит более новую версию
+        await self.cache.set(str(user.id), self._dump(user), version=user.version)
+
+    async def invalidate(self, user_id: UUID) -> None:
+        await self.cache.invalidate(str(user_id))
+
+    async def replace(self, user: User) -> None:
+        """Кладёт новое состояние после записи и сбрасывает локальные копии в остальных воркерах"""
+        await self.set(user)
+        await self.cache.broadcast_invalidation(str(user.id))
+
+    @staticmethod
+    def _dump(user: User) -> bytes:
+        data = {field: getattr(user, field) for field in USER_FIELDS}
+        data["created_at"] = user.created_at.isoformat() if user.created_at else None
+        data["updated_at"] = user.updated_at.isoformat() if user.updated_at else None
+        data["version"] = user.version
+        return json.dumps(data).encode()
+
+    @staticmethod
+    def _load(user_id: UUID, data: dict) -> User:
+        user = User(
+            id=user_id,
+            created_at=datetime.fromisoformat(data["created_at"]) if data["created_at"] else None,
+            updated_at=datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None,
+            # Записи, сделанные до появления версии, доживают свой TTL
+            version=data.get("version", 1),
+            **{field: data[field] for field in USER_FIELDS},
+        )
+        # Объект считается загруженным из БД: session.add() обновит его, а не вставит заново
+        make_transient_to_detached(user)
+        return user
@@ -0,0 +1,114 @@
+import time
+from typing import Protocol
+
+from redis.asyncio import Redis
+
+# Атомарная проверка кода: совпал — удаляем код и счётчик (код одноразовый),
+# не совпал — считаем попытку. Счётчик живёт в отдельном ключе со своим TTL и не сбрасывается
+# повторной отправкой кода: иначе каждый новый код давал бы ещё max_attempts попыток угадать.
+# KEYS: код, счётчик попыток; ARGV: проверяемый код, max_attempts, TTL счётчика в секундах
+CHECK_AND_CONSUME_SCRIPT = """
+local attempts = tonumber(redis.call('GET', KEYS[2]) or '0')
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+    return 0
+end
+local stored = redis.call('HGET', KEYS[1], 'code')
+if not stored then
+    return 0
+end
+if stored == ARGV[1] then
+    redis.call('DEL', KEYS[1], KEYS[2])
+    return 1
+end
+attempts = redis.call('INCR', KEYS[2])
+if attempts == 1 then
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+end
+if attempts >= tonumber(ARGV[2]) then
+    redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class VerificationStore(Protocol):
+    async def save(self, phone_number: str, code: str, ttl_seconds: int) -> None: ...
+
+    async def check_and_consume(self, phone_number: str, code: str) -> bool: ...
+
+
+class RedisVerificationStore:
+    """Коды верификации в Redis: TTL на стороне Redis, проверка и погашение одним Lua-скриптом"""
+
+    def __init__(self, redis: Redis, max_attempts: int = 5, attempts_ttl_seconds: int = 3600) -> None:
+        self.redis = redis
+        self.max_attempts = max_attempts
+        self.attempts_ttl_seconds = attempts_ttl_seconds
+        self._check_and_consume = redis.register_script(CHECK_AND_CONSUME_SCRIPT)
+
+    @staticmethod
+    def _key(phone_number: str) -> str:
+        return f"verification:{phone_number}"
+
+    @staticmethod
+    def _attempts_key(phone_number: str) -> str:
+        return f"verification:attempts:{phone_number}"
+
+    async def save(self, phone_number: str, code: str, ttl_seconds: int) -> None:
+        # Новый код заменяет предыдущий; счётчик неудачных попыток не трогаем
+        key = self._key(phone_number)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.hset(key, mapping={"code": code})
+            pipe.expire(key, ttl_seconds)
+            await pipe.execute()
+
+    async def check_and_consume(self, phone_number: str, code: str) -> bool:
+        result = await self._check_and_consume(
+            keys=[self._key(phone_number), self._attempts_key(phone_number)],
+            args=[code, self.max_attempts, self.attempts_ttl_seconds],
+        )
+        return bool(result)
+
+
+class InMemoryVerificationStore:
+    """Процессная замена RedisVerificationStore для тестов и локального запуска"""
+
+    def __init__(self, max_attempts: int = 5, attempts_ttl_seconds: int = 3600) -> None:
+        self.max_attempts = max_attempts
+        self.attempts_ttl_seconds = attempts_ttl_seconds
+        self._codes: dict[str, tuple[str, float]] = {}
+        self._attempts: dict[str, tuple[int, float]] = {}
+
+    async def save(self, phone_number: str, code: str, ttl_seconds: int) -> None:
+        self._codes[phone_number] = (code, time.monotonic() + ttl_seconds)
+
+    async def check_and_consume(self, phone_number: str, code: str) -> bool:
+        now = time.monotonic()
+        attempts, attempts_expire_at = self._attempts.get(phone_number, (0, now + self.attempts_ttl_seconds))
+        if attempts_expire_at <= now:
+            attempts, attempts_expire_at = 0, now + self.attempts_ttl_seconds
+        if attempts >= self.max_attempts:
+            self._codes.pop(phone_number, None)
+            return False
+
+        entry = self._codes.get(phone_number)
+        if entry is None:
+            return False
+
+        stored_code, expires_at = entry
+        if expires_at <= now:
+            del self._codes[phone_number]
+            return False
+
+        if stored_code == code:
+            del self._codes[phone_number]
+            self._attempts.pop(phone_number, None)
+            return True
+
+        attempts += 1
+        self._attempts[phone_number] = (attempts, attempts_expire_at)
+        if attempts >= self.max_attempts:
+            del self._codes[phone_number]
+        return False
@@ -0,0 +1,47 @@
+import pytest
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from src.api.deps import get_auth_service
+from src.api.middleware import ProxyHeadersMiddleware
+from src.api.v1.endpoints.auth import router
+from src.api.v1.errors import exception_handlers
+from src.core.proxies import TrustedProxies
+from src.core.rate_limit import RateLimiter
+
+
+class StubAuthService:
+    async def send_verification_code(self, phone_number: str) -> None:
+        pass
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI(exception_handlers=exception_handlers)
+    app.include_router(router)
+    app.state.rate_limiter = RateLimiter({"auth_request_code:ip": "2/60", "auth_request_code:phone": "10/60"})
+    app.dependency_overrides[get_auth_service] = StubAuthService
+    app.add_middleware(ProxyHeadersMiddleware, trusted_proxies=TrustedProxies(["10.0.0.0/8"]))
+
+    async def behind_balancer(scope, receive, send):  # noqa: ANN001, ANN202
+        # Все запросы приходят с адреса балансировщика
+        await app({**scope, "client": ("10.0.0.2", 40000)}, receive, send)
+
+    return TestClient(behind_balancer)
+
+
+def _request_code(client: TestClient, phone: str, client_ip: str):  # noqa: ANN202
+    return client.post("/auth/request-code", json={"phone": phone}, headers={"X-Forwarded-For": client_ip})
+
+
+def test_request_code_rate_limited_per_client_ip(client):
+    responses = [_request_code(client, f"7999000000{i}", "203.0.113.7") for i in range(3)]
+
+    assert [r.status_code for r in responses] == [
+        status.HTTP_200_OK,
+        status.HTTP_200_OK,
+        status.HTTP_429_TOO_MANY_REQUESTS,
+    ]
+    assert 0 < int(responses[-1].headers["Retry-After"]) <= 30
+    # Другой клиент за тем же балансировщиком не делит с ним лимит
+    assert _request_code(client, "79990000009", "198.51.100.4").status_code == status.HTTP_200_OK
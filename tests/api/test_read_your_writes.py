@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.api.middleware import ReadYourWritesMiddleware
+from src.core.read_routing import ReadSessionRouter, RecentWritesTracker, client_key
+
+
+def primary() -> None:
+    pass
+
+
+def replica() -> None:
+    pass
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.state.read_router = ReadSessionRouter(
+        primary=primary, replica=replica, tracker=RecentWritesTracker(window_seconds=0.2)
+    )
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.post("/slow-write")
+    async def slow_write() -> None:
+        # Запрос дольше окна отставания реплики: коммит после окончания первой отметки
+        await asyncio.sleep(0.3)
+
+    @app.get("/read-source")
+    async def read_source(request: Request) -> str:
+        factory = await request.app.state.read_router.session_factory(client_key(None, request.client.host))
+        return "primary" if factory is primary else "replica"
+
+    return TestClient(app)
+
+
+def test_window_starts_at_response(client):
+    assert client.get("/read-source").json() == "replica"
+
+    client.post("/slow-write")
+
+    assert client.get("/read-source").json() == "primary"
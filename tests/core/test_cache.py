@@ -0,0 +1,107 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from src.core.cache import LRUCache, TwoTierCache
+
+
+class TestLRUCache:
+    def test_get_set(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("missing") is None
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_expired_entry(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1, ttl=0)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+class TestTwoTierCache:
+    async def test_local_only(self):
+        cache = TwoTierCache("test")
+        await cache.set("key", b"value")
+        assert await cache.get("key") == b"value"
+
+        await cache.invalidate("key")
+        assert await cache.get("key") is None
+
+    async def test_get_many_local_only(self):
+        cache = TwoTierCache("test")
+        await cache.set_many({"a": b"1", "b": b"2"})
+
+        assert await cache.get_many(["a", "missing", "b"]) == {"a": b"1", "b": b"2"}
+
+    async def test_versioned_set_keeps_newer_local_only(self):
+        cache = TwoTierCache("test")
+        await cache.set("key", b"v2", version=2)
+        await cache.set("key", b"v1", version=1)
+        assert await cache.get("key") == b"v2"
+
+        await cache.set_many({"key": b"v3", "other": b"v1"}, versions={"key": 3, "other": 1})
+        assert await cache.get_many(["key", "other"]) == {"key": b"v3", "other": b"v1"}
+
+        await cache.delete("key", version=4)
+        await cache.set("key", b"v3", version=3)
+        assert await cache.get("key") is None
+
+
+@pytest.mark.asyncio
+class TestTwoTierCacheRedis:
+    async def test_stale_fill_from_other_worker_is_rejected(self):
+        redis = FakeAsyncRedis()
+        writer, filler = TwoTierCache("test", redis), TwoTierCache("test", redis)
+
+        await writer.set("key", b"v2", version=2)
+        await filler.set("key", b"v1", version=1)
+
+        assert await redis.get("cache:test:key") == b"v2"
+        # Отвергнутое значение не остаётся и в локальном уровне заполнявшего воркера
+        assert await filler.get("key") == b"v2"
+        assert await writer.get("key") == b"v2"
+
+    async def test_newer_version_overwrites(self):
+        redis = FakeAsyncRedis()
+        cache = TwoTierCache("test", redis)
+
+        await cache.set_many({"a": b"a1", "b": b"b1"}, versions={"a": 1, "b": 1})
+        await cache.set_many({"a": b"a2", "b": b"b0"}, versions={"a": 2, "b": 0})
+
+        assert await redis.mget(["cache:test:a", "cache:test:b"]) == [b"a2", b"b1"]
+        assert await cache.get_many(["a", "b"]) == {"a": b"a2", "b": b"b1"}
+
+    async def test_delete_leaves_tombstone(self):
+        redis = FakeAsyncRedis()
+        writer, filler = TwoTierCache("test", redis), TwoTierCache("test", redis)
+        await writer.set("key", b"v3", version=3)
+
+        await writer.delete("key", version=4)
+        await filler.set("key", b"v2-stale", version=2)
+        await filler.set("key", b"v3-stale", version=3)
+
+        assert await redis.get("cache:test:key") is None
+        assert await filler.get("key") is None
+        assert await writer.get("key") is None
+
+    async def test_invalidate_drops_version(self):
+        redis = FakeAsyncRedis()
+        cache = TwoTierCache("test", redis)
+        await cache.set("key", b"v2", version=2)
+
+        await cache.invalidate("key")
+        await cache.set("key", b"v1", version=1)
+
+        assert await cache.get("key") == b"v1"
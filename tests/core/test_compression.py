@@ -0,0 +1,108 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from src.api.middleware import CompressionMiddleware
+from src.core.compression import CompressedBodyCache, _GzipCompressor, is_compressible, negotiate_encoding
+
+PAYLOAD = b'[{"description": "' + b"cozy place " * 500 + b'"}]'
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip", "gzip"),
+        ("gzip, br", "br"),
+        ("gzip, deflate, br, zstd", "br"),
+        ("br;q=0.5, zstd", "zstd"),
+        ("*", "br"),
+        ("br;q=0, *;q=0.1", "zstd"),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, ["br", "zstd", "gzip"]) == expected
+
+
+def test_is_compressible():
+    assert is_compressible("application/json")
+    assert is_compressible("text/html; charset=utf-8")
+    assert is_compressible("application/problem+json")
+    assert not is_compressible("image/jpeg")
+    assert not is_compressible(None)
+
+
+def test_body_cache_evicts_by_size():
+    cache = CompressedBodyCache(max_bytes=10)
+    cache.set(("/a", '"1"', "gzip"), b"123456")
+    cache.set(("/b", '"1"', "gzip"), b"123456")
+
+    assert cache.get(("/a", '"1"', "gzip")) is None
+    assert cache.get(("/b", '"1"', "gzip")) == b"123456"
+    assert cache.size == 6
+
+
+def _client(minimum_size: int = 1024) -> TestClient:
+    async def page(request):
+        return Response(PAYLOAD, media_type="application/json", headers={"ETag": '"v1"'})
+
+    async def small(request):
+        return Response(b"[]", media_type="application/json")
+
+    async def image(request):
+        return Response(PAYLOAD, media_type="image/jpeg")
+
+    async def stream(request):
+        return StreamingResponse(iter([PAYLOAD, PAYLOAD]), media_type="application/x-ndjson")
+
+    routes = [Route(f"/{endpoint.__name__}", endpoint) for endpoint in (page, small, image, stream)]
+    app = Starlette(routes=routes)
+    app.add_middleware(CompressionMiddleware, minimum_size=minimum_size)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(("encoding", "module"), [("gzip", "gzip"), ("br", "brotli"), ("zstd", "zstandard")])
+def test_compresses_json(encoding, module):
+    codec = pytest.importorskip(module)
+    with _client().stream("GET", "/page", headers={"Accept-Encoding": encoding}) as response:
+        raw = b"".join(response.iter_raw())
+
+    assert response.headers["Content-Encoding"] == encoding
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.headers["ETag"] == 'W/"v1"'
+    assert int(response.headers["Content-Length"]) == len(raw) < len(PAYLOAD)
+    if encoding == "zstd":
+        # Потоковый кадр без размера содержимого в заголовке
+        assert codec.ZstdDecompressor().decompressobj().decompress(raw) == PAYLOAD
+    else:
+        assert codec.decompress(raw) == PAYLOAD
+
+
+def test_skips_small_images_and_identity():
+    client = _client()
+
+    assert "Content-Encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in client.get("/image", headers={"Accept-Encoding": "gzip"}).headers
+    assert "Content-Encoding" not in client.get("/page", headers={"Accept-Encoding": "identity"}).headers
+
+
+def test_streaming_response():
+    response = _client().get("/stream", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Content-Length" not in response.headers
+    assert response.content == PAYLOAD * 2
+
+
+def test_compressed_body_cached(mocker):
+    compress = mocker.spy(_GzipCompressor, "compress")
+    client = _client()
+
+    responses = [client.get(url, headers={"Accept-Encoding": "gzip"}) for url in ("/page", "/page", "/page?skip=100")]
+
+    assert all(response.content == PAYLOAD for response in responses)
+    # Повторный запрос той же страницы берёт сжатое тело из кэша, другой URL сжимается заново
+    assert compress.call_count == 2
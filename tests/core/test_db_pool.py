@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.core.db_pool import InstrumentedAsyncPool, PoolMetrics, engine_options, pool_status
+
+
+def _settings(pgbouncer: bool) -> SimpleNamespace:
+    return SimpleNamespace(
+        db_pgbouncer=pgbouncer,
+        db_pool_size=3,
+        db_max_overflow=2,
+        db_pool_timeout=5,
+        db_pool_recycle=600,
+        db_pool_pre_ping=True,
+        db_prepared_statement_cache_size=50,
+    )
+
+
+def test_engine_options_pool():
+    options = engine_options(_settings(pgbouncer=False))
+
+    assert options["poolclass"] is InstrumentedAsyncPool
+    assert options["pool_size"] == 3
+    assert options["pool_pre_ping"] is True
+    assert options["connect_args"] == {"prepared_statement_cache_size": 50}
+
+
+def test_engine_options_pgbouncer():
+    options = engine_options(_settings(pgbouncer=True))
+
+    assert options["poolclass"] is NullPool
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert options["connect_args"]["prepared_statement_cache_size"] == 0
+    assert "pool_size" not in options
+
+
+def test_pool_metrics_histogram():
+    metrics = PoolMetrics()
+    metrics.observe(0.0005)
+    metrics.observe(0.02)
+    metrics.observe(10)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 3
+    assert snapshot["wait_max_ms"] == 10_000
+    assert snapshot["wait_histogram"]["le_1ms"] == 1
+    assert snapshot["wait_histogram"]["le_50ms"] == 1
+    assert snapshot["wait_histogram"]["inf"] == 1
+
+
+@pytest.mark.asyncio
+async def test_instrumented_pool_records_checkouts():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:", poolclass=InstrumentedAsyncPool, pool_size=2)
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            status = pool_status(engine.pool)
+            assert status["checked_out"] == 1
+            assert status["utilization"] == round(1 / 12, 3)
+
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+        status = pool_status(engine.pool)
+        assert status["checkouts"] == 2
+        assert status["checked_out"] == 0
+    finally:
+        await engine.dispose()
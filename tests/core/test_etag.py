@@ -0,0 +1,37 @@
+import pytest
+from fastapi import Request, status
+
+from src.core.etag import etag_matches, make_etag, not_modified
+
+
+def test_make_etag():
+    assert make_etag("application/json", 1) == make_etag("application/json", 1)
+    assert make_etag("application/json", 1) != make_etag("application/json", 2)
+    assert make_etag("application/json", 1) != make_etag("application/msgpack", 1)
+    assert make_etag("a").startswith('"') and make_etag("a").endswith('"')
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "expected"),
+    [
+        (None, False),
+        ('"other"', False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"other", "abc"', True),
+        ("*", True),
+    ],
+)
+def test_etag_matches(if_none_match, expected):
+    assert etag_matches(if_none_match, '"abc"') is expected
+
+
+def test_not_modified():
+    request = Request({"type": "http", "headers": [(b"if-none-match", b'"abc"')]})
+
+    response = not_modified(request, '"abc"', vary="Accept")
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.headers["ETag"] == '"abc"'
+    assert response.headers["Vary"] == "Accept"
+    assert not_modified(request, '"other"') is None
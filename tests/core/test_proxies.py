@@ -0,0 +1,18 @@
+from src.core.proxies import TrustedProxies
+
+PROXIES = TrustedProxies(["10.0.0.0/8", "192.168.1.1"])
+
+
+def test_untrusted_peer_header_ignored():
+    assert PROXIES.client_ip("203.0.113.7", "1.2.3.4") == "203.0.113.7"
+
+
+def test_client_from_forwarded_chain():
+    # Клиент подделал левую часть цепочки, но правый недоверенный адрес дописал наш балансировщик
+    assert PROXIES.client_ip("10.0.0.2", "6.6.6.6, 203.0.113.7, 192.168.1.1") == "203.0.113.7"
+
+
+def test_without_header_or_proxies():
+    assert PROXIES.client_ip("10.0.0.2", None) == "10.0.0.2"
+    assert TrustedProxies().client_ip("10.0.0.2", "203.0.113.7") == "10.0.0.2"
+    assert not PROXIES.is_trusted("testclient")
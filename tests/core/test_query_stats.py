@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.core.query_stats import QueryStats, track_queries
+
+
+def test_repeated_statements():
+    stats = QueryStats()
+    for _ in range(3):
+        stats.record("SELECT photos WHERE location_id = ?", 0.001)
+    stats.record("SELECT locations", 0.002)
+
+    assert stats.count == 4
+    assert stats.repeated(3) == {"SELECT photos WHERE location_id = ?": 3}
+    assert stats.repeated(4) == {}
+
+
+@pytest.mark.asyncio
+class TestTrackQueries:
+    async def test_counts_queries_inside_block(self, session, assert_max_queries):
+        await session.execute(text("SELECT 1"))
+
+        with track_queries() as stats:
+            for value in range(3):
+                await session.execute(text("SELECT :value"), {"value": value})
+
+        assert stats.count == 3
+        assert stats.total_seconds > 0
+        assert stats.repeated(3) == {"SELECT ?": 3}
+
+    async def test_failed_query_is_not_recorded(self, session, assert_max_queries):
+        with track_queries() as stats:
+            with pytest.raises(OperationalError):
+                await session.execute(text("SELECT * FROM missing_table"))
+            await session.rollback()
+            await session.execute(text("SELECT 1"))
+
+        assert stats.count == 1
+
+    async def test_assert_max_queries_fails_over_limit(self, session, assert_max_queries):
+        with pytest.raises(AssertionError, match="не больше 1 запросов"):
+            with assert_max_queries(1):
+                await session.execute(text("SELECT 1"))
+                await session.execute(text("SELECT 2"))
@@ -0,0 +1,41 @@
+import pytest
+
+from src.core.exceptions import RateLimitExceededError
+from src.core.rate_limit import InMemoryTokenBucket, RateLimit, RateLimiter
+
+
+class TestRateLimit:
+    def test_parse(self):
+        limit = RateLimit.parse("5/60")
+        assert limit.capacity == 5
+        assert limit.period_seconds == 60
+        assert limit.refill_rate == pytest.approx(5 / 60)
+
+
+@pytest.mark.asyncio
+class TestInMemoryTokenBucket:
+    async def test_allows_up_to_capacity(self):
+        bucket = InMemoryTokenBucket()
+        limit = RateLimit.parse("3/60")
+
+        assert [await bucket.hit("key", limit) for _ in range(3)] == [None, None, None]
+        retry_after = await bucket.hit("key", limit)
+        assert retry_after == pytest.approx(20, rel=0.01)
+
+
+@pytest.mark.asyncio
+class TestRateLimiter:
+    async def test_limits_each_identifier_separately(self):
+        limiter = RateLimiter({"auth_verify:phone": "1/60", "auth_verify:ip": "10/60"})
+
+        await limiter.check("auth_verify", {"ip": "1.1.1.1", "phone": "79990000000"})
+        await limiter.check("auth_verify", {"ip": "1.1.1.1", "phone": "79990000001"})
+        with pytest.raises(RateLimitExceededError) as exc_info:
+            await limiter.check("auth_verify", {"ip": "1.1.1.1", "phone": "79990000000"})
+        assert exc_info.value.retry_after > 0
+
+    async def test_unconfigured_route_is_not_limited(self):
+        limiter = RateLimiter({"auth_verify:phone": "1/60"})
+
+        for _ in range(5):
+            await limiter.check("other", {"phone": "79990000000"})
@@ -0,0 +1,63 @@
+from collections.abc import AsyncGenerator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.core.read_routing import ReadSessionRouter, RecentWritesTracker, client_key
+from src.models import Base, Location
+from src.repositories.location import LocationRepository
+
+
+@pytest.fixture
+async def session_factories(tmp_path) -> AsyncGenerator[tuple, None]:
+    # Два файла SQLite вместо primary и отстающей реплики
+    engines = [create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db") for name in ("primary", "replica")]
+    for engine in engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    yield tuple(async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False) for engine in engines)
+
+    for engine in engines:
+        await engine.dispose()
+
+
+def test_client_key():
+    assert client_key("Bearer a", "1.2.3.4") == client_key("Bearer a", "5.6.7.8")
+    assert client_key("Bearer a", None) != client_key("Bearer b", None)
+    assert client_key(None, "1.2.3.4") == "ip:1.2.3.4"
+
+
+@pytest.mark.asyncio
+class TestReadSessionRouter:
+    async def test_reads_own_writes_from_primary(self, session_factories, location):
+        primary, replica = session_factories
+        router = ReadSessionRouter(primary=primary, replica=replica, tracker=RecentWritesTracker(window_seconds=60))
+        writer, reader = client_key("Bearer writer", None), client_key("Bearer reader", None)
+
+        await router.mark_write(writer)
+        async with primary() as session:
+            await LocationRepository(session).save(location)
+            await session.commit()
+
+        async with (await router.session_factory(writer))() as session:
+            assert await LocationRepository(session).get_by_id(location.id) is not None
+        # Реплика ещё не догнала primary
+        async with (await router.session_factory(reader))() as session:
+            assert await LocationRepository(session).get_by_id(location.id) is None
+
+    async def test_window_expires(self, session_factories):
+        primary, replica = session_factories
+        router = ReadSessionRouter(primary=primary, replica=replica, tracker=RecentWritesTracker(window_seconds=0))
+        client = client_key(None, "1.2.3.4")
+
+        await router.mark_write(client)
+
+        assert await router.session_factory(client) is replica
+
+    async def test_without_replica_reads_primary(self, session_factories):
+        primary, _ = session_factories
+        router = ReadSessionRouter(primary=primary)
+
+        assert router.enabled is False
+        assert await router.session_factory(client_key(None, "1.2.3.4")) is primary
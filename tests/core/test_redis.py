@@ -0,0 +1,35 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.redis import create_redis
+
+
+def _settings(**overrides: object) -> SimpleNamespace:
+    values = {
+        "redis_host": "localhost",
+        "redis_port": 6379,
+        "redis_pass": None,
+        "redis_max_connections": 7,
+        "redis_pool_timeout": 1.5,
+        "redis_health_check_interval": 15,
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_create_redis_disabled_without_host():
+    assert create_redis(_settings(redis_host="")) is None
+
+
+@pytest.mark.asyncio
+async def test_create_redis_uses_configured_pool():
+    redis = create_redis(_settings())
+    pool = redis.connection_pool
+
+    assert pool.max_connections == 7
+    assert pool.timeout == 1.5
+    assert pool.connection_kwargs["health_check_interval"] == 15
+    assert redis.auto_close_connection_pool
+
+    await redis.aclose()
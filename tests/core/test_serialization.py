@@ -0,0 +1,91 @@
+import json
+
+import msgpack
+import pytest
+from fastapi import FastAPI, Request, status
+from fastapi.testclient import TestClient
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.api.routing import MsgPackRoute
+from src.core.serialization import ResponseSerializer, prefers_msgpack
+from src.schemas.location import LocationResponse
+from src.schemas.swipe import LocationCandidate, SwipeActionRequest
+
+
+@pytest.mark.asyncio
+async def test_matches_fastapi_serialization(location, photo):
+    location.photos = [photo]
+    serializer = ResponseSerializer(list[LocationResponse])
+
+    # Прежний путь: model_dump в эндпоинте + повторная валидация FastAPI по response_model
+    field = create_model_field(name="Response", type_=list[LocationResponse], mode="serialization")
+    expected = await serialize_response(field=field, response_content=[LocationResponse.model_validate(location)])
+
+    payload = json.loads(serializer.to_json([location]))
+    assert payload == json.loads(json.dumps(expected))
+    assert payload[0]["photos"][0]["photo_url"] == photo.photo_url
+
+
+def test_response(location):
+    serializer = ResponseSerializer(list[LocationCandidate])
+    row = {key: getattr(location, key) for key in ("id", "name", "tags", "latitude", "longitude")}
+
+    cards = [{**row, "distance_km": 1.26}]
+
+    response = serializer.response(_request("application/json"), cards, headers={"X-Next-Cursor": "abc"})
+    packed = serializer.response(_request("application/msgpack"), cards)
+
+    assert response.media_type == "application/json"
+    assert response.headers["X-Next-Cursor"] == "abc"
+    assert response.headers["Vary"] == "Accept"
+    card = json.loads(response.body)[0]
+    assert card["distance_km"] == 1.3
+    assert card["coordinates"] == {"lat": location.latitude, "lng": location.longitude}
+    assert "latitude" not in card
+    assert packed.media_type == "application/msgpack"
+    assert msgpack.unpackb(packed.body) == json.loads(response.body)
+
+
+@pytest.mark.parametrize(
+    ("accept", "expected"),
+    [
+        (None, False),
+        ("*/*", False),
+        ("application/json", False),
+        ("application/msgpack", True),
+        ("application/x-msgpack", True),
+        ("application/json;q=0.5, application/msgpack", True),
+        ("application/msgpack;q=0.5, application/json", False),
+        ("application/msgpack;q=0", False),
+    ],
+)
+def test_prefers_msgpack(accept, expected):
+    assert prefers_msgpack(accept) is expected
+
+
+def test_msgpack_request_body():
+    app = FastAPI()
+    app.router.route_class = MsgPackRoute
+
+    @app.post("/action")
+    async def action(data: SwipeActionRequest) -> dict:
+        return data.model_dump(mode="json")
+
+    body = {"location_id": "123e4567-e89b-12d3-a456-426614174000", "action": "like"}
+    client = TestClient(app)
+
+    packed = client.post("/action", content=msgpack.packb(body), headers={"Content-Type": "application/msgpack"})
+    plain = client.post("/action", json=body)
+    broken = client.post("/action", content=b"\xc1", headers={"Content-Type": "application/msgpack"})
+    invalid = client.post(
+        "/action", content=msgpack.packb({"action": "like"}), headers={"Content-Type": "application/msgpack"}
+    )
+
+    assert packed.json() == plain.json() == body
+    assert broken.status_code == status.HTTP_400_BAD_REQUEST
+    assert invalid.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def _request(accept: str) -> Request:
+    return Request({"type": "http", "headers": [(b"accept", accept.encode())]})
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+from fastapi import status
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from src.api.static_files import ImmutableStaticFiles
+
+
+@pytest.fixture
+def photos_dir(tmp_path):
+    location_dir = tmp_path / "location-id"
+    location_dir.mkdir()
+    (location_dir / "photo-id.jpg").write_bytes(b"jpeg-bytes")
+    return tmp_path
+
+
+def _client(photos_dir, **kwargs) -> TestClient:
+    static = ImmutableStaticFiles(directory=photos_dir, max_age=600, **kwargs)
+    return TestClient(Starlette(routes=[Mount("/static/locations", static)]))
+
+
+def test_immutable_cache_headers(photos_dir):
+    client = _client(photos_dir)
+
+    response = client.get("/static/locations/location-id/photo-id.jpg")
+    revalidated = client.get(
+        "/static/locations/location-id/photo-id.jpg", headers={"If-None-Match": response.headers["ETag"]}
+    )
+
+    assert response.content == b"jpeg-bytes"
+    assert response.headers["Cache-Control"] == "public, max-age=600, immutable"
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+    assert revalidated.headers["ETag"] == response.headers["ETag"]
+
+
+def test_etag_ignores_mtime(photos_dir):
+    client = _client(photos_dir)
+    etag = client.get("/static/locations/location-id/photo-id.jpg").headers["ETag"]
+
+    # Например, файл скопирован на другой инстанс или восстановлен из бэкапа
+    os.utime(photos_dir / "location-id" / "photo-id.jpg", (0, 0))
+
+    assert client.get("/static/locations/location-id/photo-id.jpg").headers["ETag"] == etag
+
+
+def test_accel_redirect(photos_dir):
+    client = _client(photos_dir, sendfile="x-accel-redirect", accel_redirect_prefix="/internal/photos")
+
+    response = client.get("/static/locations/location-id/photo-id.jpg")
+
+    assert response.content == b""
+    assert response.headers["X-Accel-Redirect"] == "/internal/photos/location-id/photo-id.jpg"
+    assert response.headers["Content-Type"] == "image/jpeg"
+    assert "immutable" in response.headers["Cache-Control"]
+
+
+def test_x_sendfile(photos_dir):
+    response = _client(photos_dir, sendfile="x-sendfile").get("/static/locations/location-id/photo-id.jpg")
+
+    assert response.headers["X-Sendfile"].endswith("location-id/photo-id.jpg")
+    assert response.content == b""
+
+
+def test_unknown_sendfile_mode(photos_dir):
+    with pytest.raises(ValueError):
+        ImmutableStaticFiles(directory=photos_dir, sendfile="nginx")
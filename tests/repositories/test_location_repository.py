@@ -1,8 +1,10 @@
 from uuid import uuid4
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
 from src.models.location import Location
+from src.models.swipe import LocationSwipeUser
 from src.repositories.location import LocationRepository
 
 
@@ -85,59 +87,26 @@ class TestLocationRepository:
         assert len(result) == 1
         assert result[0].id == location.id
 
-    async def test_get_filtered_no_filters(self, session, location):
-        session.add(location)
+    async def test_get_candidates(self, session, location, user_id, coordinates, assert_max_queries):
+        far = Location(id=uuid4(), name="Far", latitude=59.93, longitude=30.31, tags=["cozy"])
+        swiped = Location(id=uuid4(), name="Swiped", latitude=55.7558, longitude=37.6173, tags=["cozy"])
+        session.add_all([location, far, swiped])
+        # Строки в swipes нет (месяц архивирован), но пара пользователь–локация осталась
+        session.add(LocationSwipeUser(user_id=user_id, location_id=swiped.id))
         await session.commit()
 
         repo = LocationRepository(session)
-        result = await repo.get_filtered()
-        assert len(result) == 1
-        assert result[0][0].id == location.id
-
-    async def test_get_filtered_with_exclude_ids(self, session, location):
-        location2 = Location(
-            id=uuid4(),
-            name="Location 2",
-            latitude=55.7558,
-            longitude=37.6173,
-            categories=["cafe"],
-        )
-        session.add(location)
-        session.add(location2)
-        await session.commit()
+        with assert_max_queries(1):
+            nearby = await repo.get_candidates(user_id, coordinates=coordinates, radius_km=10.0)
+        everywhere = await repo.get_candidates(user_id, tags=["cozy"], limit=10)
+        limited = await repo.get_candidates(user_id, limit=1)
 
-        repo = LocationRepository(session)
-        result = await repo.get_filtered(exclude_ids=[location.id])
-        assert len(result) == 1
-        assert result[0][0].id == location2.id
-
-    async def test_get_filtered_with_tags(self, session, location):
-        location2 = Location(
-            id=uuid4(),
-            name="Location 2",
-            latitude=55.7558,
-            longitude=37.6173,
-            categories=["cafe"],
-            tags=["indoor"],
-        )
-        session.add(location)
-        session.add(location2)
-        await session.commit()
-
-        repo = LocationRepository(session)
-        result = await repo.get_filtered(tags=["cozy"])
-        assert len(result) == 1
-        assert result[0][0].id == location.id
-
-    async def test_get_filtered_with_coordinates(self, session, location, coordinates):
-        session.add(location)
-        await session.commit()
-
-        repo = LocationRepository(session)
-        result = await repo.get_filtered(coordinates=coordinates, radius_km=10.0)
-        assert len(result) == 1
-        assert result[0][0].id == location.id
-        assert result[0][1] is not None
+        assert [row.id for row in nearby] == [location.id]
+        assert nearby[0].distance_km == pytest.approx(0, abs=0.01)
+        assert nearby[0].name == location.name
+        assert {row.id for row in everywhere} == {location.id, far.id}
+        assert everywhere[0].distance_km is None
+        assert len(limited) == 1
 
     async def test_update(self, session, location):
         session.add(location)
@@ -192,3 +161,31 @@ class TestLocationRepository:
         repo = LocationRepository(session)
         await repo.refresh(location)
         assert location.name != "Changed Name"
+
+    async def test_get_candidates_postgis_query(self, session, user_id, coordinates, mocker):
+        repo = LocationRepository(session, use_postgis=True)
+        mocker.patch.object(type(session.bind.dialect), "name", "postgresql")
+        execute = mocker.patch.object(session, "execute", mocker.AsyncMock(return_value=mocker.Mock(all=lambda: [])))
+
+        assert await repo.get_candidates(user_id, coordinates=coordinates, radius_km=2.0) == []
+
+        sql = str(execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "ST_DWithin(locations.geog" in sql
+        assert "ORDER BY locations.geog <->" in sql
+        assert "radians" not in sql
+
+    async def test_jsonb_filters_query(self, session, user_id, mocker):
+        repo = LocationRepository(session)
+        mocker.patch.object(type(session.bind.dialect), "name", "postgresql")
+        result = mocker.Mock(all=lambda: [], scalars=lambda: mocker.Mock(all=lambda: []))
+        execute = mocker.patch.object(session, "execute", mocker.AsyncMock(return_value=result))
+
+        await repo.get_candidates(user_id, tags=["cozy", "quiet"])
+        await repo.get_many(category="cafe")
+
+        tags_sql, category_sql = (
+            str(call.args[0].compile(dialect=postgresql.dialect())) for call in execute.call_args_list
+        )
+        assert "locations.tags ?| %(param_1)s::VARCHAR[]" in tags_sql
+        assert "locations.categories @> " in category_sql
+        assert "LIKE" not in tags_sql + category_sql
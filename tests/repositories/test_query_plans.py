@@ -0,0 +1,242 @@
+"""
+Регрессии планов запросов репозиториев
+
+Каждый запрос прогоняется через EXPLAIN QUERY PLAN (SQLite) на наполненной базе.
+Тест падает, если план полностью сканирует таблицу, в которой не меньше SEQ_SCAN_ROW_THRESHOLD строк:
+значит, запросу не хватает индекса.
+"""
+
+import re
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from datetime import date, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.types import SwipeAction
+from src.models import Base, Location, PhoneVerification, Photo, User
+from src.models.route import Route, RouteLocation
+from src.models.swipe import DailySwipeStats, LocationSwipeUser, Swipe
+from src.repositories.location import LocationRepository
+from src.repositories.swipe import SwipeRepository
+from src.repositories.swipe_stats import SwipeStatsRepository
+from src.repositories.user import UserRepository
+
+SEQ_SCAN_ROW_THRESHOLD = 500
+
+LOCATIONS = 600
+PHOTOS_PER_LOCATION = 2
+USERS = 40
+SWIPES_PER_USER = 25
+VERIFICATIONS = 1000
+DAYS = 600
+
+# "SCAN swipes", "SCAN photos USING INDEX ..." — полный проход по таблице или индексу
+SCAN_RE = re.compile(r"^SCAN (\w+)")
+
+
+class QueryPlanRecorder:
+    """Собирает SQL, выполненный в сессии, и возвращает полные сканы больших таблиц"""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+        self.statements: list[tuple[str, tuple]] = []
+        self.table_sizes: dict[str, int] = {}
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:  # noqa: ANN001
+        if statement.lstrip().upper().startswith(("SELECT", "DELETE", "UPDATE", "WITH")):
+            self.statements.append((statement, parameters))
+
+    async def load_table_sizes(self) -> None:
+        for table in Base.metadata.sorted_tables:
+            self.table_sizes[table.name] = await self.session.scalar(select(func.count()).select_from(table))
+
+    async def large_table_scans(
+        self, call: Callable[[], Awaitable[object]], allowed: tuple[str, ...] = ()
+    ) -> list[str]:
+        """allowed — таблицы, полный проход по которым для запроса ожидаем (например, колода по всем локациям)"""
+        if not self.table_sizes:
+            await self.load_table_sizes()
+
+        sync_engine = self.session.bind.sync_engine
+        self.statements = []
+        event.listen(sync_engine, "before_cursor_execute", self._on_execute)
+        try:
+            await call()
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", self._on_execute)
+
+        conn = await self.session.connection()
+        scans = []
+        for statement, parameters in self.statements:
+            plan = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)).all()
+            # Проход по индексу в порядке ORDER BY (без сортировки) останавливается на LIMIT
+            ordered_limit = " LIMIT " in statement and not any("TEMP B-TREE" in row.detail for row in plan)
+            for row in plan:
+                match = SCAN_RE.match(row.detail)
+                if not match or (ordered_limit and " USING " in row.detail):
+                    continue
+                table = re.sub(r"_\d+$", "", match.group(1))
+                if table not in allowed and self.table_sizes.get(table, 0) >= SEQ_SCAN_ROW_THRESHOLD:
+                    scans.append(f"{row.detail} ({self.table_sizes[table]} строк) в запросе:\n{statement}")
+        return scans
+
+
+@pytest.fixture
+async def seeded(session: AsyncSession) -> AsyncGenerator[dict[str, object], None]:
+    now = datetime.now()
+    location_ids = [uuid4() for _ in range(LOCATIONS)]
+    user_ids = [uuid4() for _ in range(USERS)]
+    route_ids = [uuid4() for _ in range(USERS)]
+
+    await session.execute(
+        insert(Location),
+        [
+            {"id": id_, "name": f"loc {i}", "latitude": 55.75, "longitude": 37.61, "tags": ["cozy"]}
+            for i, id_ in enumerate(location_ids)
+        ],
+    )
+    await session.execute(
+        insert(Photo),
+        [
+            {"id": uuid4(), "location_id": location_id, "photo_url": f"{location_id}/{i}.jpg", "order": i}
+            for location_id in location_ids
+            for i in range(PHOTOS_PER_LOCATION)
+        ],
+    )
+    await session.execute(
+        insert(User),
+        [{"id": id_, "phone_number": f"7999{i:07d}", "city": "moscow"} for i, id_ in enumerate(user_ids)],
+    )
+    await session.execute(
+        insert(Swipe),
+        [
+            {
+                "id": uuid4(),
+                "user_id": user_id,
+                "location_id": location_ids[i % LOCATIONS],
+                "action": SwipeAction.LIKE,
+                "created_at": now - timedelta(minutes=i),
+            }
+            for user_id in user_ids
+            for i in range(SWIPES_PER_USER)
+        ],
+    )
+    await session.execute(
+        insert(LocationSwipeUser),
+        [
+            {"location_id": location_ids[i % LOCATIONS], "user_id": user_id}
+            for user_id in user_ids
+            for i in range(SWIPES_PER_USER)
+        ],
+    )
+    await session.execute(
+        insert(DailySwipeStats),
+        [{"day": date(2024, 1, 1) + timedelta(days=i), "likes": 1} for i in range(DAYS)],
+    )
+    await session.execute(
+        insert(PhoneVerification),
+        [
+            {
+                "id": uuid4(),
+                "phone_number": f"7999{i % 300:07d}",
+                "code": "1234",
+                "expires_at": now + timedelta(minutes=i % 10 - 5),
+            }
+            for i in range(VERIFICATIONS)
+        ],
+    )
+    await session.execute(insert(Route), [{"id": id_, "user_id": user_ids[0]} for id_ in route_ids])
+    await session.execute(
+        insert(RouteLocation),
+        [
+            {"id": uuid4(), "route_id": route_id, "location_id": location_ids[i], "order": i}
+            for route_id in route_ids
+            for i in range(15)
+        ],
+    )
+    await session.commit()
+    await session.execute(text("ANALYZE"))
+
+    yield {"location_id": location_ids[0], "user_id": user_ids[0], "route_id": route_ids[0], "now": now}
+
+
+@pytest.fixture
+def recorder(session: AsyncSession) -> QueryPlanRecorder:
+    return QueryPlanRecorder(session)
+
+
+@pytest.mark.asyncio
+class TestQueryPlans:
+    async def test_seed_is_above_threshold(self, seeded, recorder):
+        await recorder.load_table_sizes()
+        for table in (
+            "locations",
+            "photos",
+            "swipes",
+            "location_swipe_users",
+            "daily_swipe_stats",
+            "phone_verifications",
+            "route_locations",
+        ):
+            assert recorder.table_sizes[table] >= SEQ_SCAN_ROW_THRESHOLD
+
+    async def test_user_repository(self, session, seeded, recorder):
+        repo = UserRepository(session)
+        assert await recorder.large_table_scans(lambda: repo.get_verifications("79990000001")) == []
+        assert await recorder.large_table_scans(lambda: repo.get_by_phone("79990000001")) == []
+        assert await recorder.large_table_scans(lambda: repo.get_by_id(seeded["user_id"])) == []
+        assert (
+            await recorder.large_table_scans(lambda: repo.delete_expired_verifications(before=seeded["now"], limit=100))
+            == []
+        )
+
+    async def test_location_repository(self, session, seeded, recorder):
+        repo = LocationRepository(session)
+        location_id = seeded["location_id"]
+        assert await recorder.large_table_scans(lambda: repo.get_by_id(location_id)) == []
+        assert await recorder.large_table_scans(lambda: repo.get_by_ids([location_id])) == []
+        assert await recorder.large_table_scans(lambda: repo.get_photo_ids(location_id)) == []
+        assert await recorder.large_table_scans(lambda: repo.get_many(limit=10)) == []
+        assert await recorder.large_table_scans(lambda: repo.get_page_versions(limit=10)) == []
+        assert await recorder.large_table_scans(lambda: repo.get_version(location_id)) == []
+
+    async def test_location_candidates(self, session, seeded, recorder):
+        repo = LocationRepository(session)
+        user_id = seeded["user_id"]
+        # Колода перебирает локации (фильтр по тегам и радиусу), но просмотренное отсекается по индексу
+        for call in (
+            lambda: repo.get_candidates(user_id, limit=10),
+            lambda: repo.get_candidates(user_id, tags=["cozy"], coordinates=(55.75, 37.61), limit=10),
+        ):
+            assert await recorder.large_table_scans(call, allowed=("locations",)) == []
+
+    async def test_swipe_repository(self, session, seeded, recorder):
+        repo = SwipeRepository(session)
+        user_id = seeded["user_id"]
+        cursor = (seeded["now"] - timedelta(minutes=5), uuid4())
+        assert await recorder.large_table_scans(lambda: repo.get_user_history(user_id, limit=10)) == []
+        assert await recorder.large_table_scans(lambda: repo.get_user_history(user_id, cursor=cursor)) == []
+        assert await recorder.large_table_scans(lambda: repo.get_user_swipes(user_id, limit=10)) == []
+
+        async def stream_since() -> None:
+            async for _ in repo.stream_all(since=seeded["now"] - timedelta(minutes=5), since_id=uuid4()):
+                pass
+
+        assert await recorder.large_table_scans(stream_since) == []
+
+    async def test_swipe_stats_repository(self, session, seeded, recorder):
+        repo = SwipeStatsRepository(session)
+        assert await recorder.large_table_scans(lambda: repo.get_location_stats(seeded["location_id"])) == []
+        assert await recorder.large_table_scans(lambda: repo.get_daily(date(2025, 1, 1), date(2025, 1, 31))) == []
+
+    async def test_route_locations_by_route(self, session, seeded, recorder):
+        query = select(RouteLocation).where(RouteLocation.route_id == seeded["route_id"])
+        assert await recorder.large_table_scans(lambda: session.execute(query)) == []
+
+    async def test_detects_sequential_scan(self, session, seeded, recorder):
+        query = select(Photo).where(Photo.caption == "missing")
+        scans = await recorder.large_table_scans(lambda: session.execute(query))
+        assert scans and scans[0].startswith("SCAN photos")
@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta
 from uuid import uuid4
 
 import pytest
@@ -62,25 +63,86 @@ class TestSwipeRepository:
         result = await repo.get_user_swipes(user_id, limit=3, offset=0)
         assert len(result) == 3
 
-    async def test_get_swiped_location_ids(self, session, swipe, user_id, location_id):
-        location_id2 = uuid4()
-        swipe2 = Swipe(
+    async def test_get_user_swipes_with_cursor(self, session, user_id):
+        base_time = datetime(2025, 6, 1, 12, 0, 0)
+        for i in range(5):
+            session.add(
+                Swipe(
+                    id=uuid4(),
+                    user_id=user_id,
+                    location_id=uuid4(),
+                    action=SwipeAction.LIKE,
+                    created_at=base_time + timedelta(minutes=i),
+                )
+            )
+        await session.commit()
+
+        repo = SwipeRepository(session)
+        first_page = await repo.get_user_swipes(user_id, limit=2)
+        cursor = (first_page[-1].created_at, first_page[-1].id)
+        second_page = await repo.get_user_swipes(user_id, limit=2, cursor=cursor)
+        third_page = await repo.get_user_swipes(
+            user_id, limit=2, cursor=(second_page[-1].created_at, second_page[-1].id)
+        )
+
+        assert [s.created_at for s in first_page] == [base_time + timedelta(minutes=m) for m in (4, 3)]
+        assert [s.created_at for s in second_page] == [base_time + timedelta(minutes=m) for m in (2, 1)]
+        assert [s.created_at for s in third_page] == [base_time]
+
+    async def test_get_user_swipes_cursor_breaks_ties_by_id(self, session, user_id):
+        created_at = datetime(2025, 6, 1, 12, 0, 0)
+        for _ in range(4):
+            session.add(
+                Swipe(
+                    id=uuid4(),
+                    user_id=user_id,
+                    location_id=uuid4(),
+                    action=SwipeAction.LIKE,
+                    created_at=created_at,
+                )
+            )
+        await session.commit()
+
+        repo = SwipeRepository(session)
+        first_page = await repo.get_user_swipes(user_id, limit=2)
+        second_page = await repo.get_user_swipes(user_id, limit=2, cursor=(created_at, first_page[-1].id))
+
+        seen = {s.id for s in first_page} | {s.id for s in second_page}
+        assert len(seen) == 4
+
+    async def test_get_user_history_window(self, session, user_id):
+        for created_at in (datetime(2025, 4, 30, 23, 59), datetime(2025, 5, 1), datetime(2025, 6, 15)):
+            session.add(
+                Swipe(id=uuid4(), user_id=user_id, location_id=uuid4(), action=SwipeAction.LIKE, created_at=created_at)
+            )
+        await session.commit()
+
+        repo = SwipeRepository(session)
+        window = (datetime(2025, 5, 1), datetime(2025, 6, 1))
+        result = await repo.get_user_history(user_id, limit=10, window=window)
+
+        assert [row.created_at for row in result] == [datetime(2025, 5, 1)]
+
+    async def test_get_user_history_projects_location_card(self, session, swipe, user_id, location):
+        orphan_swipe = Swipe(
             id=uuid4(),
             user_id=user_id,
-            location_id=location_id2,
-            action=SwipeAction.DISLIKE,
+            location_id=uuid4(),
+            action=SwipeAction.HIDE,
+            created_at=datetime(2020, 1, 1),
         )
+        session.add(location)
         session.add(swipe)
-        session.add(swipe2)
+        session.add(orphan_swipe)
         await session.commit()
 
         repo = SwipeRepository(session)
-        result = await repo.get_swiped_location_ids(user_id)
-        assert len(result) == 2
-        assert location_id in result
-        assert location_id2 in result
+        result = await repo.get_user_history(user_id, limit=10)
 
-    async def test_get_swiped_location_ids_empty(self, session, user_id):
-        repo = SwipeRepository(session)
-        result = await repo.get_swiped_location_ids(user_id)
-        assert result == []
+        assert len(result) == 2
+        assert result[0].id == swipe.id
+        assert result[0].location.id == location.id
+        assert result[0].location.name == location.name
+        assert result[0].location.tags == location.tags
+        assert not hasattr(result[0].location, "categories")
+        assert result[1].location is None
@@ -0,0 +1,74 @@
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from src.core.types import SwipeAction
+from src.repositories.swipe_stats import SwipeStatsRepository
+
+
+@pytest.mark.asyncio
+class TestSwipeStatsRepository:
+    async def test_record_swipe_creates_counters(self, session, location_id, user_id):
+        repo = SwipeStatsRepository(session)
+        await repo.record_swipe(location_id, user_id, SwipeAction.LIKE, date(2025, 6, 1))
+        await session.commit()
+
+        stats = await repo.get_location_stats(location_id)
+        assert (stats.likes, stats.dislikes, stats.hides, stats.unique_users) == (1, 0, 0, 1)
+
+        daily = await repo.get_daily()
+        assert len(daily) == 1
+        assert daily[0].day == date(2025, 6, 1)
+        assert daily[0].likes == 1
+
+    async def test_record_swipe_increments_existing_counters(self, session, location_id, user_id):
+        repo = SwipeStatsRepository(session)
+        await repo.record_swipe(location_id, user_id, SwipeAction.LIKE, date(2025, 6, 1))
+        await repo.record_swipe(location_id, user_id, SwipeAction.HIDE, date(2025, 6, 1))
+        await repo.record_swipe(location_id, user_id, SwipeAction.DISLIKE, date(2025, 6, 2))
+        await repo.record_swipe(location_id, uuid4(), SwipeAction.DISLIKE, date(2025, 6, 2))
+        await session.commit()
+        session.expire_all()
+
+        stats = await repo.get_location_stats(location_id)
+        assert (stats.likes, stats.dislikes, stats.hides, stats.unique_users) == (1, 2, 1, 2)
+
+        daily = await repo.get_daily()
+        assert [(d.day, d.likes, d.hides, d.dislikes, d.unique_users) for d in daily] == [
+            (date(2025, 6, 1), 1, 1, 0, 1),
+            (date(2025, 6, 2), 0, 0, 2, 2),
+        ]
+
+    async def test_record_swipe_uses_database_date(self, session, location_id, user_id):
+        repo = SwipeStatsRepository(session)
+        await repo.record_swipe(location_id, user_id, SwipeAction.LIKE)
+        await session.commit()
+
+        db_today = await session.scalar(select(func.current_date()))
+        daily = await repo.get_daily()
+        assert [d.day.isoformat() for d in daily] == [str(db_today)]
+
+    async def test_prune_daily_users(self, session, location_id, user_id):
+        repo = SwipeStatsRepository(session)
+        await repo.record_swipe(location_id, user_id, SwipeAction.LIKE, date(2025, 6, 1))
+        await repo.record_swipe(location_id, user_id, SwipeAction.LIKE, date(2025, 6, 3))
+
+        assert await repo.prune_daily_users(before=date(2025, 6, 2)) == 1
+        # Отметка дня удалена, отметка локации осталась: повторный свайп по ней не уникален
+        await repo.record_swipe(location_id, user_id, SwipeAction.LIKE, date(2025, 6, 3))
+        await session.commit()
+        session.expire_all()
+        assert (await repo.get_location_stats(location_id)).unique_users == 1
+
+    async def test_get_top_locations(self, session, location_id, user_id):
+        other_location_id = uuid4()
+        repo = SwipeStatsRepository(session)
+        await repo.record_swipe(location_id, user_id, SwipeAction.LIKE, date(2025, 6, 1))
+        await repo.record_swipe(other_location_id, user_id, SwipeAction.LIKE, date(2025, 6, 1))
+        await repo.record_swipe(other_location_id, uuid4(), SwipeAction.LIKE, date(2025, 6, 1))
+        await session.commit()
+
+        result = await repo.get_top_locations(order_by="likes", limit=10)
+        assert [s.location_id for s in result] == [other_location_id, location_id]
@@ -1,10 +1,13 @@
 from uuid import UUID
 
+import jwt
 import pytest
-from jose import jwt
+from fakeredis import FakeAsyncRedis, FakeServer
 
 from src.core.exceptions import InvalidVerificationCodeError, UserNotFoundError
+from src.core.jwt import VerifiedTokenCache
 from src.services.auth import AuthService
+from src.services.verification_store import InMemoryVerificationStore, RedisVerificationStore
 
 
 @pytest.mark.asyncio
@@ -144,3 +147,123 @@ class TestAuthService:
 
         with pytest.raises(UserNotFoundError):
             await service.get_current_user(token)
+
+    async def test_get_current_user_served_from_cache(self, session, user, user_id, settings, user_cache):
+        session.add(user)
+        await session.commit()
+
+        service = AuthService(
+            session=session,
+            secret_key=settings.secret_key,
+            algorithm=settings.algorithm,
+            token_expire_days=settings.access_token_expire_days,
+            user_cache=user_cache,
+        )
+        token = service.create_access_token({"sub": str(user_id)})
+        await service.get_current_user(token)
+
+        # Второй запрос не должен обращаться к БД
+        await session.delete(user)
+        await session.commit()
+        cached = await service.get_current_user(token)
+
+        assert cached.id == user_id
+        assert cached.phone_number == user.phone_number
+        assert cached.preferences == user.preferences
+
+    async def test_verify_code_with_store(self, session, phone_number, settings, mocker):
+        store = InMemoryVerificationStore()
+        service = AuthService(
+            session=session,
+            secret_key=settings.secret_key,
+            algorithm=settings.algorithm,
+            token_expire_days=settings.access_token_expire_days,
+            verification_store=store,
+        )
+        mocker.patch("src.services.auth.random.randint", return_value=7)
+        await service.send_verification_code(phone_number)
+        code = "7777"
+
+        token = await service.verify_code(phone_number, code)
+        assert token is not None
+
+        with pytest.raises(InvalidVerificationCodeError):
+            await service.verify_code(phone_number, code)
+
+        from src.repositories.user import UserRepository
+
+        assert await UserRepository(session).get_verifications(phone_number) == []
+
+    async def test_send_verification_code_with_store_audit(self, session, phone_number, settings):
+        service = AuthService(
+            session=session,
+            secret_key=settings.secret_key,
+            algorithm=settings.algorithm,
+            token_expire_days=settings.access_token_expire_days,
+            verification_store=InMemoryVerificationStore(),
+            audit_verifications=True,
+        )
+        await service.send_verification_code(phone_number)
+
+        from src.repositories.user import UserRepository
+
+        verifications = await UserRepository(session).get_verifications(phone_number)
+        assert len(verifications) == 1
+
+    async def test_verification_falls_back_to_table_when_redis_is_down(self, session, phone_number, settings, mocker):
+        server = FakeServer()
+        server.connected = False
+        service = AuthService(
+            session=session,
+            secret_key=settings.secret_key,
+            algorithm=settings.algorithm,
+            token_expire_days=settings.access_token_expire_days,
+            verification_store=RedisVerificationStore(FakeAsyncRedis(server=server)),
+        )
+        mocker.patch("src.services.auth.random.randint", return_value=7)
+
+        await service.send_verification_code(phone_number)
+        assert await service.verify_code(phone_number, "7777") is not None
+
+        # Код из таблицы тоже одноразовый
+        with pytest.raises(InvalidVerificationCodeError):
+            await service.verify_code(phone_number, "7777")
+
+    async def test_get_current_user_uses_token_cache(self, session, user, user_id, settings, mocker):
+        session.add(user)
+        await session.commit()
+
+        token_cache = VerifiedTokenCache()
+        service = AuthService(
+            session=session,
+            secret_key=settings.secret_key,
+            algorithm=settings.algorithm,
+            token_expire_days=settings.access_token_expire_days,
+            token_cache=token_cache,
+        )
+        token = service.create_access_token({"sub": str(user_id)})
+        decode = mocker.spy(service.jwt_backend, "decode")
+
+        await service.get_current_user(token)
+        await service.get_current_user(token)
+
+        assert decode.call_count == 1
+        assert len(token_cache) == 1
+
+    async def test_expired_token_not_cached(self, session, user, user_id, settings):
+        session.add(user)
+        await session.commit()
+
+        token_cache = VerifiedTokenCache()
+        service = AuthService(
+            session=session,
+            secret_key=settings.secret_key,
+            algorithm=settings.algorithm,
+            token_expire_days=-1,
+            token_cache=token_cache,
+        )
+        token = service.create_access_token({"sub": str(user_id)})
+
+        with pytest.raises(UserNotFoundError):
+            await service.get_current_user(token)
+        assert len(token_cache) == 0
@@ -1,11 +1,14 @@
 from uuid import uuid4
 
 import pytest
+from fakeredis import FakeAsyncRedis
 from pydantic import HttpUrl
 
+from src.core.cache import TwoTierCache
 from src.core.exceptions import InvalidLocationDataError, LocationNotFoundError, PhotoNotFoundError
 from src.models.location import Location, Photo
 from src.services.location import LocationService
+from src.services.location_cache import LocationCache
 
 
 @pytest.mark.asyncio
@@ -58,7 +61,7 @@ class TestLocationService:
         result = await service.get_location(str(location_id))
         assert result.id == location_id
 
-    async def test_get_locations(self, session, base_url, location):
+    async def test_get_locations(self, session, base_url, location, assert_max_queries):
         location2 = Location(
             id=uuid4(),
             name="Location 2",
@@ -71,7 +74,9 @@ class TestLocationService:
         await session.commit()
 
         service = LocationService(session, base_url)
-        result = await service.get_locations()
+        # Локации и фотографии всех локаций страницы (selectinload), без N+1
+        with assert_max_queries(2):
+            result = await service.get_locations()
         assert len(result) == 2
 
     async def test_get_locations_with_category(self, session, base_url, location):
@@ -207,6 +212,39 @@ class TestLocationService:
         with pytest.raises(InvalidLocationDataError):
             await service.reorder_photos(str(location_id), [])
 
+    async def test_version_bumped_on_every_mutation(self, session, base_url, location, location_id, photo):
+        location.photos.append(photo)
+        session.add(location)
+        await session.commit()
+
+        service = LocationService(session, base_url)
+        assert await service.get_location_version(str(location_id)) == 1
+
+        await service.update_location(str(location_id), name="Renamed")
+        await service.update_photo_caption(str(location_id), str(photo.id), "New Caption")
+        await service.reorder_photos(str(location_id), [str(photo.id)])
+        await service.delete_location_photo(str(location_id), str(photo.id))
+
+        assert await service.get_location_version(str(location_id)) == 5
+
+    async def test_get_location_version_not_found(self, session, base_url, location_id):
+        service = LocationService(session, base_url)
+        with pytest.raises(LocationNotFoundError):
+            await service.get_location_version(str(location_id))
+
+    async def test_get_locations_versions(self, session, base_url, location):
+        location2 = Location(id=uuid4(), name="Location 2", latitude=55.7, longitude=37.6, categories=["cafe"])
+        session.add_all([location, location2])
+        await session.commit()
+
+        service = LocationService(session, base_url)
+        page = await service.get_locations(skip=0, limit=10)
+        versions = await service.get_locations_versions(skip=0, limit=10)
+        filtered = await service.get_locations_versions(skip=0, limit=10, category="restaurant")
+
+        assert versions == [(loc.id, loc.version) for loc in page]
+        assert filtered == [(location.id, 1)]
+
     async def test_get_location_by_id(self, session, base_url, location, location_id):
         session.add(location)
         await session.commit()
@@ -216,6 +254,88 @@ class TestLocationService:
         assert result is not None
         assert result.id == location_id
 
+    async def test_get_location_from_cache(
+        self, session, base_url, location, location_id, photo, location_cache, assert_max_queries
+    ):
+        session.add_all([location, photo])
+        await session.commit()
+
+        service = LocationService(session, base_url, location_cache=location_cache)
+        await service.get_location(str(location_id))
+        with assert_max_queries(0):
+            cached = await service.get_location(str(location_id))
+            version = await service.get_location_version(str(location_id))
+        # Существование перед записью проверяется по БД, не по кешу
+        with assert_max_queries(1):
+            exists = await service.location_exists(location_id)
+
+        assert cached.name == location.name
+        assert cached.categories == ["restaurant", "cafe"]
+        assert [(p.id, p.photo_url, p.caption) for p in cached.photos] == [(photo.id, photo.photo_url, photo.caption)]
+        assert version == 1
+        assert exists
+
+    async def test_mutations_refresh_cache(self, session, base_url, location, location_id, photo, location_cache):
+        session.add_all([location, photo])
+        await session.commit()
+
+        service = LocationService(session, base_url, location_cache=location_cache)
+        await service.get_location(str(location_id))
+
+        await service.update_location(str(location_id), name="Renamed")
+        await service.update_photo_caption(str(location_id), str(photo.id), "New caption")
+        cached = await location_cache.get(location_id)
+        assert cached.name == "Renamed"
+        assert cached.photos[0].caption == "New caption"
+        assert cached.version == 3
+
+        await service.delete_location(str(location_id))
+        assert await location_cache.get(location_id) is None
+        assert not await service.location_exists(location_id)
+        with pytest.raises(LocationNotFoundError):
+            await service.get_location(str(location_id))
+
+    @pytest.mark.parametrize("shared_redis", [False, True])
+    async def test_stale_fill_does_not_overwrite_replaced(self, session, base_url, location, location_id, shared_redis):
+        session.add(location)
+        await session.commit()
+        redis = FakeAsyncRedis() if shared_redis else None
+        writer_cache = LocationCache(TwoTierCache("locations", redis))
+        # Без Redis оба «воркера» делят один процессный кеш
+        filler_cache = LocationCache(TwoTierCache("locations", redis)) if shared_redis else writer_cache
+
+        service = LocationService(session, base_url, location_cache=writer_cache)
+        await service.get_location(str(location_id))
+        # Заполнение, прочитавшее версию 1 (например, с отстающей реплики) до правки
+        stale = await writer_cache.get(location_id)
+
+        await service.update_location(str(location_id), name="Renamed")
+        await filler_cache.set(stale)
+
+        for cache in (writer_cache, filler_cache):
+            cached = await cache.get(location_id)
+            assert (cached.name, cached.version) == ("Renamed", 2)
+
+    @pytest.mark.parametrize("shared_redis", [False, True])
+    async def test_stale_fill_after_delete_is_rejected(self, session, base_url, location, location_id, shared_redis):
+        session.add(location)
+        await session.commit()
+        redis = FakeAsyncRedis() if shared_redis else None
+        writer_cache = LocationCache(TwoTierCache("locations", redis))
+        filler_cache = LocationCache(TwoTierCache("locations", redis)) if shared_redis else writer_cache
+
+        service = LocationService(session, base_url, location_cache=writer_cache)
+        await service.get_location(str(location_id))
+        # Чтение с отстающей реплики, которое ещё видит локацию
+        stale = await writer_cache.get(location_id)
+
+        await service.delete_location(str(location_id))
+        await filler_cache.set(stale)
+
+        for cache in (writer_cache, filler_cache):
+            assert await cache.get(location_id) is None
+        assert not await service.location_exists(location_id)
+
     async def test_get_locations_by_ids(self, session, base_url, location):
         location2 = Location(
             id=uuid4(),
@@ -232,20 +352,31 @@ class TestLocationService:
         result = await service.get_locations_by_ids([location.id, location2.id])
         assert len(result) == 2
 
+    async def test_get_locations_by_ids_ordered_and_cached(
+        self, session, base_url, location, photo, location_cache, assert_max_queries
+    ):
+        locations = [location] + [
+            Location(id=uuid4(), name=f"Location {i}", latitude=55.0, longitude=37.0, categories=["cafe"])
+            for i in range(3)
+        ]
+        session.add_all([*locations, photo])
+        await session.commit()
+        ids = [locations[2].id, uuid4(), location.id, locations[3].id, locations[1].id]
+
+        service = LocationService(session, base_url, location_cache=location_cache)
+        await service.get_location_by_id(locations[2].id)
+        with assert_max_queries(2):
+            result = await service.get_locations_by_ids(ids)
+        # Из БД запрашивается только несуществующий ID; фотографии для пустого результата не грузятся
+        with assert_max_queries(1):
+            cached = await service.get_locations_by_ids(ids)
+
+        expected = [locations[2].id, location.id, locations[3].id, locations[1].id]
+        assert [loc.id for loc in result] == expected
+        assert [loc.id for loc in cached] == expected
+        assert [p.id for p in cached[1].photos] == [photo.id]
+
     async def test_get_locations_by_ids_empty(self, session, base_url):
         service = LocationService(session, base_url)
         result = await service.get_locations_by_ids([])
         assert result == []
-
-    async def test_get_filtered_locations(self, session, base_url, location, coordinates):
-        session.add(location)
-        await session.commit()
-
-        service = LocationService(session, base_url)
-        result = await service.get_filtered_locations(
-            exclude_ids=None,
-            tags=["cozy"],
-            coordinates=coordinates,
-            radius_km=10.0,
-        )
-        assert len(result) == 1
@@ -0,0 +1,69 @@
+import os
+import time
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from src.models import PhoneVerification
+from src.services.maintenance import MaintenanceService
+
+
+def _write_old(path, content: bytes) -> None:
+    path.write_bytes(content)
+    old = time.time() - 7200
+    os.utime(path, (old, old))
+
+
+@pytest.mark.asyncio
+class TestMaintenanceService:
+    async def test_purge_expired_verifications_in_batches(self, session, phone_number):
+        now = datetime.now()
+        for minutes in range(1, 6):
+            session.add(
+                PhoneVerification(phone_number=phone_number, code="1", expires_at=now - timedelta(minutes=minutes))
+            )
+        session.add(PhoneVerification(phone_number=phone_number, code="2", expires_at=now + timedelta(minutes=5)))
+        await session.commit()
+
+        deleted = await MaintenanceService(session).purge_expired_verifications(batch_size=2)
+
+        assert deleted == 5
+        remaining = await session.scalar(select(func.count()).select_from(PhoneVerification))
+        assert remaining == 1
+
+    async def test_sweep_orphaned_photos(self, session, location, photo, tmp_path):
+        session.add_all([location, photo])
+        await session.commit()
+
+        location_dir = tmp_path / str(location.id)
+        location_dir.mkdir()
+        _write_old(location_dir / f"{photo.id}.jpg", b"keep")
+        _write_old(location_dir / f"{uuid4()}.jpg", b"orphan")
+        (location_dir / f"{uuid4()}.jpg").write_bytes(b"uploading")
+        _write_old(location_dir / "notes.txt", b"foreign")
+
+        deleted_dir = tmp_path / str(uuid4())
+        deleted_dir.mkdir()
+        _write_old(deleted_dir / f"{uuid4()}.png", b"gone")
+
+        files, reclaimed = await MaintenanceService(session, storage_path=str(tmp_path)).sweep_orphaned_photos()
+
+        assert files == 2
+        assert reclaimed == len(b"orphan") + len(b"gone")
+        assert (location_dir / f"{photo.id}.jpg").exists()
+        assert (location_dir / "notes.txt").exists()
+        assert len(list(location_dir.iterdir())) == 3
+        assert not deleted_dir.exists()
+
+    async def test_run_reports_metrics(self, session, expired_phone_verification, tmp_path):
+        session.add(expired_phone_verification)
+        await session.commit()
+
+        report = await MaintenanceService(session, storage_path=str(tmp_path / "missing")).run()
+
+        assert report.expired_verifications_deleted == 1
+        assert report.orphaned_files_deleted == 0
+        assert report.swipe_partitions_created == 0
+        assert report.daily_swipe_users_deleted == 0
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.types import SwipeAction
+from src.models.swipe import Swipe
+from src.services.swipe_export import SwipeExportService
+
+
+async def collect(stream) -> str:
+    return b"".join([chunk async for chunk in stream]).decode()
+
+
+@pytest.mark.asyncio
+class TestSwipeExportService:
+    @pytest.fixture
+    async def swipes(self, session, location, user_id):
+        base_time = datetime(2025, 6, 1, 12, 0, 0)
+        swipes = [
+            Swipe(
+                id=uuid4(),
+                user_id=user_id,
+                location_id=location.id,
+                action=SwipeAction.LIKE,
+                created_at=base_time + timedelta(minutes=i),
+            )
+            for i in range(3)
+        ]
+        session.add(location)
+        session.add_all(swipes)
+        await session.commit()
+        return swipes
+
+    @pytest.fixture
+    def service(self, engine):
+        return SwipeExportService(async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False))
+
+    async def test_stream_ndjson(self, service, swipes, location):
+        body = await collect(service.stream_ndjson(include_tags=True))
+
+        records = [json.loads(line) for line in body.splitlines()]
+        assert [r["id"] for r in records] == [str(s.id) for s in swipes]
+        assert records[0]["action"] == "like"
+        assert records[0]["tags"] == location.tags
+
+    async def test_stream_ndjson_since_watermark(self, service, swipes):
+        body = await collect(service.stream_ndjson(since=swipes[0].created_at))
+
+        records = [json.loads(line) for line in body.splitlines()]
+        assert [r["id"] for r in records] == [str(s.id) for s in swipes[1:]]
+
+    async def test_stream_csv(self, service, swipes):
+        body = await collect(service.stream_csv())
+
+        rows = list(csv.DictReader(io.StringIO(body)))
+        assert len(rows) == 3
+        assert "tags" not in rows[0]
+
+    async def test_stream_csv_empty(self, service):
+        body = await collect(service.stream_csv())
+
+        assert body.strip() == "id,user_id,location_id,action,created_at"
@@ -0,0 +1,119 @@
+from datetime import date, datetime
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+
+from src.services.swipe_partitions import (
+    SwipePartitionService,
+    add_months,
+    month_start,
+    partition_month,
+    partition_name,
+    retention_window,
+)
+
+
+class TestPartitionHelpers:
+    def test_add_months_across_year(self):
+        assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+        assert add_months(date(2025, 1, 1), -1) == date(2024, 12, 1)
+
+    def test_partition_name_roundtrip(self):
+        month = month_start(date(2025, 6, 17))
+        assert partition_name(month) == "swipes_p2025_06"
+        assert partition_month("swipes_p2025_06") == month
+
+    def test_partition_month_ignores_other_tables(self):
+        assert partition_month("swipes_default") is None
+
+    def test_retention_window_matches_archive_cutoff(self):
+        since, until = retention_window(keep_months=12, today=date(2025, 6, 17))
+        assert since == datetime(2024, 6, 1)
+        assert until == datetime(2025, 8, 1)
+
+
+@pytest.mark.asyncio
+class TestSwipePartitionService:
+    async def test_noop_on_sqlite(self, session, tmp_path):
+        service = SwipePartitionService(session)
+        assert service.is_supported is False
+        assert await service.ensure_partitions() == []
+        assert await service.archive_partitions(str(tmp_path)) == []
+
+
+@pytest.mark.postgres
+@pytest.mark.asyncio
+class TestSwipePartitionServicePostgres:
+    async def _create_swipes(self, session) -> None:
+        await session.execute(
+            text(
+                """
+                CREATE TABLE swipes (
+                    user_id UUID NOT NULL,
+                    location_id UUID NOT NULL,
+                    action TEXT NOT NULL,
+                    id UUID NOT NULL,
+                    created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now(),
+                    updated_at TIMESTAMP WITHOUT TIME ZONE,
+                    PRIMARY KEY (id, created_at)
+                ) PARTITION BY RANGE (created_at)
+                """
+            )
+        )
+        await session.execute(
+            text("CREATE TABLE swipes_p2025_05 PARTITION OF swipes FOR VALUES FROM ('2025-05-01') TO ('2025-06-01')")
+        )
+        await session.execute(text("CREATE TABLE swipes_default PARTITION OF swipes DEFAULT"))
+
+    async def _insert_swipe(self, session, created_at: str) -> None:
+        await session.execute(
+            text(
+                "INSERT INTO swipes (user_id, location_id, action, id, created_at) "
+                "VALUES (:user_id, :location_id, 'LIKE', :id, CAST(:created_at AS TIMESTAMP))"
+            ),
+            {"user_id": uuid4(), "location_id": uuid4(), "id": uuid4(), "created_at": created_at},
+        )
+
+    async def test_moves_rows_out_of_default_partition(self, pg_session):
+        await self._create_swipes(pg_session)
+        # Обслуживание опоздало: июньские и июльские свайпы легли в DEFAULT
+        for created_at in ("2025-05-20 10:00", "2025-06-10 12:00", "2025-07-02 08:30", "2025-07-14 23:59"):
+            await self._insert_swipe(pg_session, created_at)
+        await pg_session.commit()
+        service = SwipePartitionService(pg_session)
+
+        created = await service.ensure_partitions(months_ahead=1, today=date(2025, 7, 15))
+
+        assert created == ["swipes_p2025_06", "swipes_p2025_07", "swipes_p2025_08"]
+        assert await service.default_partition() == "swipes_default"
+        rows = await pg_session.execute(text("SELECT tableoid::regclass::text, count(*) FROM swipes GROUP BY 1"))
+        assert dict(rows.all()) == {"swipes_p2025_05": 1, "swipes_p2025_06": 1, "swipes_p2025_07": 2}
+        assert await service.ensure_partitions(months_ahead=1, today=date(2025, 7, 15)) == []
+
+    async def test_retention_window_prunes_archived_and_default(self, pg_session):
+        await self._create_swipes(pg_session)
+        await pg_session.commit()
+        service = SwipePartitionService(pg_session)
+        await service.ensure_partitions(months_ahead=1, today=date(2025, 7, 15))
+
+        since, until = retention_window(keep_months=1, today=date(2025, 7, 15))
+        plan = await pg_session.execute(
+            text("EXPLAIN SELECT id FROM swipes WHERE created_at >= :since AND created_at < :until"),
+            {"since": since, "until": until},
+        )
+        scanned = " ".join(line for (line,) in plan)
+
+        assert "swipes_p2025_06" in scanned
+        assert "swipes_p2025_05" not in scanned
+        assert "swipes_default" not in scanned
+
+    async def test_creates_partitions_without_default_rows(self, pg_session):
+        await self._create_swipes(pg_session)
+        await pg_session.commit()
+        service = SwipePartitionService(pg_session)
+
+        created = await service.ensure_partitions(months_ahead=0, today=date(2025, 6, 1))
+
+        assert created == ["swipes_p2025_06"]
+        assert await service.list_partitions() == ["swipes_p2025_05", "swipes_p2025_06"]
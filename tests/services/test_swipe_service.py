@@ -1,90 +1,19 @@
+from datetime import datetime
 from uuid import uuid4
 
 import pytest
 
 from src.core.exceptions import LocationNotFoundError
 from src.core.types import SwipeAction
-from src.models.location import Location
 from src.models.swipe import Swipe
+from src.schemas.swipe import LocationCandidate
 from src.services.location import LocationService
 from src.services.swipe import SwipeService
+from src.services.swipe_stats import SwipeStatsService
 
 
 @pytest.mark.asyncio
 class TestSwipeService:
-    async def test_get_candidates(self, session, user_id, location, base_url):
-        location2 = Location(
-            id=uuid4(),
-            name="Location 2",
-            latitude=55.7558,
-            longitude=37.6173,
-            categories=["cafe"],
-            tags=["cozy"],
-        )
-        session.add(location)
-        session.add(location2)
-        await session.commit()
-
-        location_service = LocationService(session, base_url)
-        service = SwipeService(session, location_service)
-        result = await service.get_candidates(user_id, interests=["cozy"], limit=10)
-
-        assert len(result) == 2
-
-    async def test_get_candidates_excludes_swiped(self, session, user_id, location, base_url):
-        location2 = Location(
-            id=uuid4(),
-            name="Location 2",
-            latitude=55.7558,
-            longitude=37.6173,
-            categories=["cafe"],
-        )
-        swipe = Swipe(
-            id=uuid4(),
-            user_id=user_id,
-            location_id=location.id,
-            action=SwipeAction.LIKE,
-        )
-        session.add(location)
-        session.add(location2)
-        session.add(swipe)
-        await session.commit()
-
-        location_service = LocationService(session, base_url)
-        service = SwipeService(session, location_service)
-        result = await service.get_candidates(user_id, limit=10)
-
-        assert len(result) == 1
-        assert result[0][0].id == location2.id
-
-    async def test_get_candidates_with_coordinates(self, session, user_id, location, base_url, coordinates):
-        session.add(location)
-        await session.commit()
-
-        location_service = LocationService(session, base_url)
-        service = SwipeService(session, location_service)
-        result = await service.get_candidates(user_id, coordinates=coordinates, limit=10)
-
-        assert len(result) == 1
-
-    async def test_get_candidates_with_limit(self, session, user_id, base_url):
-        for i in range(5):
-            location = Location(
-                id=uuid4(),
-                name=f"Location {i}",
-                latitude=55.7558,
-                longitude=37.6173,
-                categories=["cafe"],
-            )
-            session.add(location)
-        await session.commit()
-
-        location_service = LocationService(session, base_url)
-        service = SwipeService(session, location_service)
-        result = await service.get_candidates(user_id, limit=3)
-
-        assert len(result) == 3
-
     async def test_create_swipe(self, session, user_id, location, location_id, base_url):
         session.add(location)
         await session.commit()
@@ -96,8 +25,8 @@ class TestSwipeService:
         from src.repositories.swipe import SwipeRepository
 
         repo = SwipeRepository(session)
-        swiped_ids = await repo.get_swiped_location_ids(user_id)
-        assert location_id in swiped_ids
+        swipes = await repo.get_user_swipes(user_id)
+        assert [swipe.location_id for swipe in swipes] == [location_id]
 
     async def test_create_swipe_location_not_found(self, session, user_id, base_url):
         location_service = LocationService(session, base_url)
@@ -106,7 +35,7 @@ class TestSwipeService:
         with pytest.raises(LocationNotFoundError):
             await service.create_swipe(user_id, uuid4(), SwipeAction.LIKE)
 
-    async def test_get_history(self, session, user_id, location, base_url):
+    async def test_get_history(self, session, user_id, location, base_url, assert_max_queries):
         swipe1 = Swipe(
             id=uuid4(),
             user_id=user_id,
@@ -126,10 +55,29 @@ class TestSwipeService:
 
         location_service = LocationService(session, base_url)
         service = SwipeService(session, location_service)
-        result = await service.get_history(user_id)
+        # Свайпы и карточки локаций одним запросом
+        with assert_max_queries(1):
+            result = await service.get_history(user_id)
 
         assert len(result) == 2
 
+    async def test_get_history_limited_to_retention_window(self, session, user_id, location, base_url):
+        recent = Swipe(id=uuid4(), user_id=user_id, location_id=location.id, action=SwipeAction.LIKE)
+        archived = Swipe(
+            id=uuid4(),
+            user_id=user_id,
+            location_id=location.id,
+            action=SwipeAction.DISLIKE,
+            created_at=datetime(2020, 1, 1),
+        )
+        session.add_all([location, recent, archived])
+        await session.commit()
+
+        service = SwipeService(session, LocationService(session, base_url), history_months=12)
+        result = await service.get_history(user_id)
+
+        assert [row.id for row in result] == [recent.id]
+
     async def test_get_history_with_filter(self, session, user_id, location, base_url):
         swipe1 = Swipe(
             id=uuid4(),
@@ -172,3 +120,33 @@ class TestSwipeService:
         result = await service.get_history(user_id, limit=3)
 
         assert len(result) == 3
+
+    async def test_create_swipe_updates_rollups(self, session, user_id, location, location_id, base_url):
+        session.add(location)
+        await session.commit()
+
+        location_service = LocationService(session, base_url)
+        service = SwipeService(session, location_service)
+        await service.create_swipe(user_id, location_id, SwipeAction.LIKE)
+        await service.create_swipe(user_id, location_id, SwipeAction.HIDE)
+        await service.create_swipe(uuid4(), location_id, SwipeAction.DISLIKE)
+        session.expire_all()
+
+        stats = await SwipeStatsService(session).get_location_stats(location_id)
+        assert (stats.likes, stats.dislikes, stats.hides, stats.unique_users) == (1, 1, 1, 2)
+
+        daily = await SwipeStatsService(session).get_daily()
+        assert len(daily) == 1
+        assert daily[0].unique_users == 2
+
+    async def test_get_candidate_cards(self, session, user_id, location, base_url, coordinates):
+        session.add(location)
+        await session.commit()
+
+        service = SwipeService(session, LocationService(session, base_url))
+        cards = await service.get_candidate_cards(user_id, coordinates=coordinates, limit=10)
+        candidate = LocationCandidate.model_validate(cards[0]._asdict())
+
+        assert candidate.id == location.id
+        assert candidate.distance_km == 0.0
+        assert candidate.coordinates.lat == location.latitude
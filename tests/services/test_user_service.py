@@ -63,3 +63,30 @@ class TestUserService:
 
         assert updated.email == original_email
         assert updated.full_name == original_name
+
+    async def test_update_user_refreshes_cache(self, session, user, user_cache):
+        session.add(user)
+        await session.commit()
+        await user_cache.set(user)
+
+        cached_user = await user_cache.get(user.id)
+        service = UserService(session, user_cache=user_cache)
+        updated = await service.update_user(cached_user, full_name="New Name")
+
+        assert updated.full_name == "New Name"
+        assert updated.version == 2
+        cached = await user_cache.get(user.id)
+        assert (cached.full_name, cached.version) == ("New Name", 2)
+
+    async def test_stale_fill_does_not_overwrite_updated_user(self, session, user, user_cache):
+        session.add(user)
+        await session.commit()
+        await user_cache.set(user)
+        # Запрос A прочитал пользователя до правки, запрос B его изменил, затем A кладёт прочитанное в кеш
+        stale = await user_cache.get(user.id)
+
+        await UserService(session, user_cache=user_cache).update_user(await user_cache.get(user.id), full_name="New")
+        await user_cache.set(stale)
+
+        cached = await user_cache.get(user.id)
+        assert (cached.full_name, cached.version) == ("New", 2)
@@ -0,0 +1,71 @@
+import pytest
+from fakeredis import FakeAsyncRedis
+
+from src.services.verification_store import InMemoryVerificationStore, RedisVerificationStore
+
+
+@pytest.fixture(params=["memory", "redis"])
+def make_store(request):
+    def make(max_attempts: int = 5):
+        if request.param == "memory":
+            return InMemoryVerificationStore(max_attempts=max_attempts)
+        return RedisVerificationStore(FakeAsyncRedis(), max_attempts=max_attempts)
+
+    return make
+
+
+@pytest.mark.asyncio
+class TestVerificationStore:
+    async def test_code_is_single_use(self, make_store, phone_number):
+        store = make_store()
+        await store.save(phone_number, "1234", ttl_seconds=300)
+
+        assert await store.check_and_consume(phone_number, "1234") is True
+        assert await store.check_and_consume(phone_number, "1234") is False
+
+    async def test_expired_code(self, phone_number):
+        store = InMemoryVerificationStore()
+        await store.save(phone_number, "1234", ttl_seconds=0)
+
+        assert await store.check_and_consume(phone_number, "1234") is False
+
+    async def test_attempts_are_capped(self, make_store, phone_number):
+        store = make_store(max_attempts=3)
+        await store.save(phone_number, "1234", ttl_seconds=300)
+
+        for _ in range(3):
+            assert await store.check_and_consume(phone_number, "0000") is False
+        assert await store.check_and_consume(phone_number, "1234") is False
+
+    async def test_resend_does_not_reset_attempts(self, make_store, phone_number):
+        store = make_store(max_attempts=3)
+        await store.save(phone_number, "1234", ttl_seconds=300)
+        for _ in range(2):
+            assert await store.check_and_consume(phone_number, "0000") is False
+
+        await store.save(phone_number, "5678", ttl_seconds=300)
+        assert await store.check_and_consume(phone_number, "0000") is False
+
+        # Лимит исчерпан: даже верный новый код не принимается до конца окна попыток
+        await store.save(phone_number, "9012", ttl_seconds=300)
+        assert await store.check_and_consume(phone_number, "9012") is False
+
+    async def test_success_resets_attempts(self, make_store, phone_number):
+        store = make_store(max_attempts=3)
+        await store.save(phone_number, "1234", ttl_seconds=300)
+        for _ in range(2):
+            await store.check_and_consume(phone_number, "0000")
+        assert await store.check_and_consume(phone_number, "1234") is True
+
+        await store.save(phone_number, "5678", ttl_seconds=300)
+        for _ in range(2):
+            assert await store.check_and_consume(phone_number, "0000") is False
+        assert await store.check_and_consume(phone_number, "5678") is True
+
+    async def test_new_code_replaces_previous(self, make_store, phone_number):
+        store = make_store()
+        await store.save(phone_number, "1234", ttl_seconds=300)
+        await store.save(phone_number, "5678", ttl_seconds=300)
+
+        assert await store.check_and_consume(phone_number, "1234") is False
+        assert await store.check_and_consume(phone_number, "5678") is True